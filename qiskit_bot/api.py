@@ -12,31 +12,77 @@
 
 """API server for listening to events from github."""
 
+import collections
+import functools
 import logging
 import os
 import sys
 from urllib import parse
 
-import fasteners
 import flask
 import github_webhook
 
+from qiskit_bot import changelog_index
 from qiskit_bot import config
+from qiskit_bot import deliveries
+from qiskit_bot import event_queue
+from qiskit_bot import executor
 from qiskit_bot import git
+from qiskit_bot import github_client
 from qiskit_bot import community
+from qiskit_bot import labels
+from qiskit_bot import locks
+from qiskit_bot import metrics
+from qiskit_bot import mirror
 from qiskit_bot import notifications
+from qiskit_bot import pr_store
 from qiskit_bot import release_process
 from qiskit_bot import repos
+from qiskit_bot import tags
 
 
 LOG = logging.getLogger(__name__)
 
+
+class QueuedWebhook(github_webhook.Webhook):
+    """Webhook which defers running hooks to the event queue.
+
+    The registered hooks are not run while handling the request, instead the
+    validated payload is persisted to the event queue and the request is
+    acknowledged with a 202 right away. The hooks are run later by the event
+    workers via :func:`_dispatch_event`.
+    """
+
+    def init_app(self, app, endpoint="/postreceive", secret=None):
+        self.handlers = collections.defaultdict(list)
+        super().init_app(app, endpoint=endpoint, secret=secret)
+
+    def hook(self, event_type="push"):
+        def decorator(func):
+            if not self.handlers[event_type]:
+                self._hooks[event_type].append(
+                    functools.partial(_enqueue_event, event_type))
+            self.handlers[event_type].append(func)
+            return func
+
+        return decorator
+
+    def _postreceive(self):
+        super()._postreceive()
+        return "", 202
+
+
 APP = flask.Flask(__name__)
-WEBHOOK = github_webhook.Webhook(APP)
+WEBHOOK = QueuedWebhook(APP)
 
 REPOS = {}
 META_REPO = None
 CONFIG = None
+EVENT_QUEUE = None
+EVENT_WORKERS = None
+DELIVERIES = None
+REFRESHER = None
+WATCHDOG = None
 
 
 @APP.before_first_request
@@ -52,7 +98,11 @@ def setup():
     """Setup config."""
     global CONFIG
     global META_REPO
-    global WEBHOOK
+    global EVENT_QUEUE
+    global EVENT_WORKERS
+    global DELIVERIES
+    global REFRESHER
+    global WATCHDOG
     if not CONFIG:
         CONFIG = config.load_config('/etc/qiskit_bot.yaml')
     log_level = CONFIG.get('log_level', 'INFO')
@@ -63,24 +113,41 @@ def setup():
     logging.basicConfig(level=log_level, format=log_format)
     if not os.path.isdir(CONFIG['working_dir']):
         os.mkdir(CONFIG['working_dir'])
-    if not os.path.isdir(os.path.join(CONFIG['working_dir'], 'lock')):
-        os.mkdir(os.path.join(CONFIG['working_dir'], 'lock'))
+    lock_dir = os.path.join(CONFIG['working_dir'], 'lock')
+    if not os.path.isdir(lock_dir):
+        os.mkdir(lock_dir)
+    git.configure(CONFIG)
+    locks.configure(CONFIG)
+    WATCHDOG = locks.Watchdog(lock_dir, CONFIG['locks']['watchdog_interval'])
+    WATCHDOG.check()
+    WATCHDOG.start()
+    executor.configure(CONFIG)
+    release_process.configure(CONFIG)
+    github_client.install()
+    github_client.configure(CONFIG)
+    labels.configure(CONFIG)
+    pr_store.configure(CONFIG)
     for repo in CONFIG['repos']:
 
-        with fasteners.InterProcessLock(
-                os.path.join(os.path.join(CONFIG['working_dir'], 'lock'),
-                             repo['name'])):
+        with locks.repo_lock(lock_dir, repo['name']):
             REPOS[repo['name']] = repos.Repo(CONFIG['working_dir'],
                                              repo['name'],
                                              CONFIG['api_key'],
                                              repo_config=repo)
     # Load the meta repo
-    with fasteners.InterProcessLock(
-            os.path.join(os.path.join(CONFIG['working_dir'], 'lock'),
-                         CONFIG['meta_repo'])):
-        repo_config = {'default_branch': CONFIG['meta_repo_default_branch']}
+    with locks.repo_lock(lock_dir, CONFIG['meta_repo']):
+        repo_config = {
+            'default_branch': CONFIG['meta_repo_default_branch'],
+            'clone_strategy': CONFIG['meta_repo_clone_strategy'],
+            'sparse_paths': CONFIG['meta_repo_sparse_paths'],
+        }
         META_REPO = repos.Repo(CONFIG['working_dir'], CONFIG['meta_repo'],
                                CONFIG['api_key'], repo_config=repo_config)
+    # Tag lookups only read git objects so they don't need the repo locks
+    for repo in list(REPOS.values()) + [META_REPO]:
+        tags.load(repo)
+    # Pick up releases which were interrupted by a restart
+    release_process.resume(CONFIG, REPOS, META_REPO)
     # NOTE(mtreinish): This is a workaround until there is a supported method
     # to set a secret post-init. See:
     # https://github.com/bloomberg/python-github-webhook/pull/19
@@ -89,6 +156,43 @@ def setup():
         if not isinstance(secret, bytes):
             secret = secret.encode("utf-8")
         WEBHOOK._secret = secret
+    REFRESHER = mirror.Refresher(lock_dir, CONFIG['push_fetch_delay'])
+    REFRESHER.start()
+    DELIVERIES = deliveries.DeliveryJournal(
+        os.path.join(CONFIG['working_dir'], 'deliveries.sqlite'),
+        max_size=CONFIG['delivery_journal_size'])
+    # Start processing queued events, including any that were received but
+    # not finished before a restart.
+    EVENT_QUEUE = event_queue.EventQueue(
+        os.path.join(CONFIG['working_dir'], 'events.sqlite'),
+        deliveries=DELIVERIES, max_attempts=CONFIG['event_max_attempts'])
+    EVENT_QUEUE.recover()
+    EVENT_WORKERS = event_queue.EventWorkers(
+        EVENT_QUEUE, _dispatch_event, CONFIG['event_workers'])
+    EVENT_WORKERS.start()
+
+
+def _enqueue_event(event_type, data):
+    delivery_id = flask.request.headers.get('X-GitHub-Delivery')
+    if delivery_id:
+        if not DELIVERIES.record(delivery_id):
+            LOG.info('Ignoring duplicate delivery %s of %s event' % (
+                delivery_id, event_type))
+            return
+        try:
+            EVENT_QUEUE.put(event_type, data, delivery_id)
+        except Exception:
+            DELIVERIES.discard(delivery_id)
+            raise
+    else:
+        EVENT_QUEUE.put(event_type, data)
+
+
+def _dispatch_event(event_type, data):
+    timer = metrics.HANDLER_LATENCY.labels(event_type, data.get('action', ''))
+    with timer.time():
+        for handler in WEBHOOK.handlers.get(event_type, []):
+            handler(data)
 
 
 @APP.route("/", methods=['GET'])
@@ -109,12 +213,41 @@ def list_routes():
     return flask.jsonify({'routes': output})
 
 
+@APP.route("/metrics", methods=['GET'])
+def get_metrics():
+    """Export prometheus metrics."""
+    if EVENT_QUEUE is not None:
+        metrics.EVENT_QUEUE_DEPTH.set(EVENT_QUEUE.depth())
+    body, content_type = metrics.generate_latest()
+    return flask.Response(body, content_type=content_type)
+
+
 @WEBHOOK.hook(event_type='push')
 def on_push(data):
     """Handle github pushes."""
     LOG.debug('Received push event for repo: %s sha1: %s' % (
         data['repository']['full_name'], data['after']))
     global REPOS
+    repo_name = data['repository']['full_name']
+    branches = ()
+    if repo_name in REPOS:
+        repo = REPOS[repo_name]
+    elif META_REPO is not None and repo_name == META_REPO.repo_name:
+        repo = META_REPO
+        branches = ('bump_meta',)
+    else:
+        return
+    # Feature and merge queue branches are never read, don't fetch them
+    if not mirror.is_mirrored(repo, data['ref'], branches):
+        return
+    if data.get('deleted'):
+        REFRESHER.schedule(repo, data['ref'], None)
+        if data['ref'].startswith('refs/tags/'):
+            tags.remove_tag(repo, data['ref'][len('refs/tags/'):])
+        return
+    REFRESHER.schedule(repo, data['ref'], data['after'])
+    if data['ref'].startswith('refs/tags/'):
+        tags.add_tag(repo, data['ref'][len('refs/tags/'):])
 
 
 @WEBHOOK.hook(event_type='create')
@@ -123,7 +256,10 @@ def on_create(data):
     if data['ref_type'] == 'tag':
         tag_name = data['ref']
         repo_name = data['repository']['full_name']
+        if META_REPO is not None and repo_name == META_REPO.repo_name:
+            tags.add_tag(META_REPO, tag_name)
         if repo_name in REPOS:
+            tags.add_tag(REPOS[repo_name], tag_name)
             release_process.finish_release(tag_name, REPOS[repo_name],
                                            CONFIG, META_REPO)
         else:
@@ -135,18 +271,31 @@ def on_create(data):
 def on_pull_event(data):
     global META_REPO
     global CONFIG
+    if data['repository']['full_name'] in REPOS:
+        # Every pull_request payload carries the full pull request state,
+        # keep the local copy current for changelog and notification lookups
+        pr_store.record_payload(data['repository']['full_name'],
+                                data['pull_request'])
+        changelog_index.record_pull(REPOS[data['repository']['full_name']],
+                                    data['pull_request'])
     if data['action'] == 'closed':
         if data['repository']['full_name'] == META_REPO.repo_name:
             if data['pull_request']['title'] == 'Bump Meta':
-                with fasteners.InterProcessLock(
-                    os.path.join(os.path.join(CONFIG['working_dir'], 'lock'),
-                                 META_REPO.name)):
+                lock_dir = os.path.join(CONFIG['working_dir'], 'lock')
+                # Don't delete bump_meta while a bump job is building on it
+                with locks.repo_lock(
+                        lock_dir,
+                        release_process.meta_bump_lock_name(META_REPO)), \
+                        locks.repo_lock(lock_dir, META_REPO.name):
                     # Delete github branch:
                     META_REPO.gh_repo.get_git_ref(
                         "heads/" 'bump_meta').delete()
                     # Delete local branch
                     git.checkout_default_branch(META_REPO)
                     git.delete_local_branch('bump_meta', META_REPO)
+                    # A new bump_meta doesn't descend from the deleted one,
+                    # which would make fast-forward fetches of it fail
+                    git.delete_tracking_branch('bump_meta', META_REPO)
 
     if data['action'] in ('opened', 'ready_for_review'):
         repo_name = data['repository']['full_name']
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Render changelogs as Markdown, JSON or reStructuredText."""
+
+import json
+import re
+
+MISSING_TITLE = 'Missing changelog entry'
+
+
+class Changelog(object):
+    """Changelog entries collected per category.
+
+    :param categories: an ordered dict of label to section title, the
+        sections are rendered in this order.
+    """
+
+    def __init__(self, categories):
+        self.categories = categories
+        self.entries = {label: [] for label in categories}
+        self.missing = []
+
+    def add(self, label, summary, pr_number=None):
+        self.entries[label].append((summary, pr_number))
+
+    def add_missing(self, summary, pr_number=None):
+        self.missing.append((summary, pr_number))
+
+    def sections(self):
+        """Yield ``(label, title, entries)`` for the non-empty categories."""
+        for label, title in self.categories.items():
+            if self.entries[label]:
+                yield label, title, self.entries[label]
+
+    def render(self, fmt='markdown', show_missing=False):
+        try:
+            renderer = RENDERERS[fmt]
+        except KeyError:
+            raise ValueError('Unknown changelog format %s, expected one of '
+                             '%s' % (fmt, ', '.join(FORMATS)))
+        return renderer(self, show_missing)
+
+
+def _render_markdown(changelog, show_missing):
+    out = ['# Changelog\n']
+    for _, title, entries in changelog.sections():
+        out.append('## %s\n' % title)
+        out.extend('-   %s\n' % summary for summary, _ in entries)
+        out.append('\n')
+    if show_missing and changelog.missing:
+        out.append('\n## %s\n' % MISSING_TITLE)
+        out.extend('-   %s\n' % summary for summary, _ in changelog.missing)
+    return ''.join(out)
+
+
+def _json_entries(entries):
+    return [{'summary': summary, 'pr_number': pr_number}
+            for summary, pr_number in entries]
+
+
+def _render_json(changelog, show_missing):
+    doc = {'sections': [{'label': label, 'title': title,
+                         'entries': _json_entries(entries)}
+                        for label, title, entries in changelog.sections()]}
+    if show_missing:
+        doc['missing'] = _json_entries(changelog.missing)
+    return json.dumps(doc, indent=2) + '\n'
+
+
+# Characters which start or end inline markup in reStructuredText
+_RST_SPECIAL = re.compile(r'([\\*`_|])')
+
+
+def _rst_escape(text):
+    return _RST_SPECIAL.sub(r'\\\1', text)
+
+
+def _rst_heading(title, char):
+    return '%s\n%s\n\n' % (title, char * len(title))
+
+
+def _render_rst(changelog, show_missing):
+    out = [_rst_heading('Changelog', '=')]
+    for _, title, entries in changelog.sections():
+        out.append(_rst_heading(title, '-'))
+        out.extend('- %s\n' % _rst_escape(summary) for summary, _ in entries)
+        out.append('\n')
+    if show_missing and changelog.missing:
+        out.append(_rst_heading(MISSING_TITLE, '-'))
+        out.extend('- %s\n' % _rst_escape(summary)
+                   for summary, _ in changelog.missing)
+        out.append('\n')
+    return ''.join(out)
+
+
+RENDERERS = {
+    'markdown': _render_markdown,
+    'json': _render_json,
+    'rst': _render_rst,
+}
+
+FORMATS = sorted(RENDERERS)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Changelog labels of merged pull requests indexed by merge commit."""
+
+import logging
+
+from qiskit_bot import config
+from qiskit_bot import pr_store
+
+LOG = logging.getLogger(__name__)
+
+
+def classify(pr_labels, categories):
+    """Return the labels of a pull request which decide its changelog entry.
+
+    These are the labels which are changelog categories, in order, up to and
+    including the first one for a category that excludes the pull request.
+    An empty list means the pull request has no changelog label.
+    """
+    changelog_labels = []
+    for label in pr_labels:
+        if label in categories:
+            changelog_labels.append(label)
+            if categories[label] is None:
+                break
+    return changelog_labels
+
+
+def record_pull(repo, pr_data):
+    """Index a merged pull request from a ``pull_request`` webhook payload.
+
+    Payloads of pull requests which aren't merged are ignored. Label changes
+    after the merge replace the indexed entry.
+    """
+    store = pr_store.get_store()
+    merge_sha = pr_data.get('merge_commit_sha')
+    if store is None or not pr_data.get('merged') or not merge_sha:
+        return
+    categories = repo.get_local_config().get(
+        'categories', config.default_changelog_categories)
+    changelog_labels = classify([x['name'] for x in pr_data['labels']],
+                                categories)
+    LOG.debug('Indexing %s#%s as %s' % (
+        repo.repo_name, pr_data['number'], changelog_labels))
+    store.set_changelog_labels(repo.repo_name, merge_sha, pr_data['number'],
+                               changelog_labels, pr_data.get('updated_at'))
+
+
+def lookup(repo, merge_shas):
+    """Return a dict of merge sha to changelog labels for indexed commits."""
+    store = pr_store.get_store()
+    if store is None:
+        return {}
+    return store.get_changelog_labels(repo.repo_name, merge_shas)
@@ -12,6 +12,8 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
+from qiskit_bot import pr_store
+
 EXCLUDED_USER_TYPES = ['Bot', 'Organization']
 
 
@@ -26,6 +28,15 @@ def add_community_label(pr_data, repo):
     # We need to use the bot's API key rather than public data to know if the
     # user is a private member of the organisation.  PyGitHub doesn't expose
     # the 'author_association' attribute as part of the typed interface.
-    pr = repo.gh_repo.get_pull(pr_data["number"])
-    if pr.raw_data["author_association"] not in ("MEMBER", "OWNER"):
+    association = pr_store.get_author_association(
+        repo.repo_name, pr_data["number"])
+    pr = None
+    if association is None:
+        pr = repo.gh_repo.get_pull(pr_data["number"])
+        association = pr.raw_data["author_association"]
+        pr_store.set_author_association(
+            repo.repo_name, pr_data["number"], association)
+    if association not in ("MEMBER", "OWNER"):
+        if pr is None:
+            pr = repo.gh_repo.get_pull(pr_data["number"])
         pr.add_to_labels("Community PR")
@@ -13,15 +13,17 @@
 # that they have been altered from the originals.
 
 import logging
-import os
 
 import voluptuous as vol
 import yaml
 
+from qiskit_bot import git
 
 LOG = logging.getLogger(__name__)
 
 
+CLONE_STRATEGIES = ['full', 'blobless', 'treeless', 'shallow']
+
 default_changelog_categories = {
     'Changelog: Deprecation': 'Deprecated',
     'Changelog: New Feature': 'Added',
@@ -37,15 +39,52 @@ schema = vol.Schema({
     vol.Required('working_dir'): str,
     vol.Required('meta_repo'): str,
     vol.Optional('meta_repo_default_branch', default='master'): str,
+    vol.Optional('meta_repo_clone_strategy', default='full'): vol.In(
+        CLONE_STRATEGIES),
+    vol.Optional('meta_repo_sparse_paths', default=[]): [str],
     vol.Optional('github_webhook_secret'): str,
     vol.Optional('log_level', default='INFO'): str,
     vol.Optional('log_format'): str,
+    vol.Optional('event_workers', default=2): int,
+    vol.Optional('event_max_attempts', default=3): int,
+    vol.Optional('delivery_journal_size', default=10000): int,
+    vol.Optional('push_fetch_delay', default=2.0): vol.Coerce(float),
+    vol.Optional('meta_bump_window', default=30.0): vol.Coerce(float),
+    vol.Optional('github', default={}): {
+        vol.Optional('pool_size'): int,
+        vol.Optional('timeout'): int,
+        vol.Optional('retries'): int,
+        vol.Optional('cache_size', default=100 * 1024 * 1024): int,
+    },
+    vol.Optional('executor', default={}): {
+        vol.Optional('type', default='thread'): vol.In(['thread', 'process']),
+        vol.Optional('max_workers', default=4): int,
+    },
+    vol.Optional('git', default={}): {
+        vol.Optional('timeout', default=600): vol.Coerce(float),
+        vol.Optional('command_timeouts', default={}): {
+            str: vol.Coerce(float)},
+    },
+    vol.Optional('ssh', default={}): {
+        vol.Optional('control_persist', default=600): int,
+    },
+    vol.Optional('locks', default={}): {
+        vol.Optional('timeout', default=1800): vol.Coerce(float),
+        vol.Optional('lease', default=900): vol.Coerce(float),
+        vol.Optional('watchdog_interval', default=60): vol.Coerce(float),
+    },
+    vol.Optional('changelog', default={}): {
+        vol.Optional('graphql', default=True): bool,
+        vol.Optional('max_in_flight', default=8): int,
+    },
     vol.Required('repos'): vol.All([{
         vol.Required('name'): str,
         vol.Optional('default_branch', default='master'): str,
         vol.Optional('branch_on_release', default=False): bool,
         vol.Optional('optional_package', default=False): bool,
-        vol.Optional('uses_community_label', default=False): bool
+        vol.Optional('uses_community_label', default=False): bool,
+        vol.Optional('clone_strategy', default='full'): vol.In(
+            CLONE_STRATEGIES),
     }]),
 })
 
@@ -70,15 +109,19 @@ local_config_schema = vol.Schema({
 })
 
 
-def load_repo_config(repo):
-    config_path = os.path.join(repo.local_path, 'qiskit_bot.yaml')
-    if not os.path.isfile(config_path):
-        return {
-            'categories': default_changelog_categories,
-            'notifications': {}
-        }
-    with open(config_path, 'r') as fd:
-        raw_config = yaml.safe_load(fd.read())
+# Parsed repo configs keyed by the sha1 of the qiskit_bot.yaml blob
+_REPO_CONFIG_CACHE = {}
+
+
+def _default_repo_config():
+    return {
+        'categories': default_changelog_categories,
+        'notifications': {}
+    }
+
+
+def _parse_repo_config(repo, config_text):
+    raw_config = yaml.safe_load(config_text)
     try:
         local_config_schema(raw_config)
     except vol.MultipleInvalid:
@@ -86,3 +129,24 @@ def load_repo_config(repo):
         return {}
     LOG.info('Loaded local repo config for %s' % repo.repo_name)
     return raw_config
+
+
+def load_repo_config_from_git(repo, commit):
+    """Load a repo's qiskit_bot.yaml at a commit without touching the worktree.
+
+    The file is read from the object database, and the parsed config is
+    cached by the sha1 of its blob so an unchanged file is only parsed once.
+
+    :param commit: The sha1 of the commit to read from, resolved by the caller
+        under the repo lock, or ``None`` for the default config.
+    """
+    if commit is None:
+        return _default_repo_config()
+    blob_sha = git.get_blob_sha(repo, commit, 'qiskit_bot.yaml')
+    if blob_sha is None:
+        return _default_repo_config()
+    repo_config = _REPO_CONFIG_CACHE.get(blob_sha)
+    if repo_config is None:
+        repo_config = _parse_repo_config(repo, git.read_blob(repo, blob_sha))
+        _REPO_CONFIG_CACHE[blob_sha] = repo_config
+    return repo_config
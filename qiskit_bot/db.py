@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Connections to the sqlite databases in the working directory."""
+
+import contextlib
+import sqlite3
+
+
+def connect(path):
+    """Open a connection in autocommit mode.
+
+    The databases are shared between processes, so a connection waits up to
+    30 seconds for another writer to finish.
+    """
+    return sqlite3.connect(path, timeout=30, isolation_level=None)
+
+
+def init(path, *schemas):
+    """Create the tables of a database and switch it to WAL mode."""
+    conn = connect(path)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        for schema in schemas:
+            conn.execute(schema)
+    finally:
+        conn.close()
+
+
+@contextlib.contextmanager
+def transaction(path):
+    """Run statements in a write transaction, rolled back on an error."""
+    conn = connect(path)
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+
+def add_columns(path, table, columns):
+    """Add the columns missing from a table created by an older version.
+
+    :param dict columns: A mapping of column name to its definition.
+    """
+    with transaction(path) as conn:
+        existing = {row[1] for row in conn.execute(
+            'PRAGMA table_info(%s)' % table)}
+        for name, definition in columns.items():
+            if name not in existing:
+                conn.execute('ALTER TABLE %s ADD COLUMN %s %s' % (
+                    table, name, definition))
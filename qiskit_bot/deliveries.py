@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Journal of received webhook deliveries used to drop duplicates."""
+
+import collections
+import logging
+import threading
+import time
+
+from qiskit_bot import db
+
+LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    delivery_id TEXT PRIMARY KEY,
+    received_at REAL NOT NULL
+)
+"""
+
+
+class DeliveryJournal(object):
+    """A bounded record of the ``X-GitHub-Delivery`` ids already received.
+
+    Lookups are served from an in-memory LRU first and fall back to a sqlite
+    table, which is shared between processes and survives restarts. Both
+    keep at most ``max_size`` of the most recent deliveries.
+    """
+
+    def __init__(self, path, max_size=10000):
+        self.path = path
+        self.max_size = max_size
+        self._recent = collections.OrderedDict()
+        self._lock = threading.Lock()
+        db.init(self.path, _SCHEMA)
+
+    def _remember(self, delivery_id):
+        self._recent[delivery_id] = None
+        self._recent.move_to_end(delivery_id)
+        while len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+
+    def record(self, delivery_id):
+        """Record a delivery.
+
+        :returns: ``True`` if this is the first time the delivery was seen
+            and ``False`` if it is a duplicate.
+        """
+        with self._lock:
+            if delivery_id in self._recent:
+                self._remember(delivery_id)
+                return False
+            conn = db.connect(self.path)
+            try:
+                cur = conn.execute(
+                    'INSERT OR IGNORE INTO deliveries '
+                    '(delivery_id, received_at) VALUES (?, ?)',
+                    (delivery_id, time.time()))
+                new = cur.rowcount == 1
+                if new:
+                    conn.execute(
+                        'DELETE FROM deliveries WHERE rowid <= '
+                        '(SELECT MAX(rowid) FROM deliveries) - ?',
+                        (self.max_size,))
+            finally:
+                conn.close()
+            self._remember(delivery_id)
+        return new
+
+    def discard(self, delivery_id):
+        """Forget a delivery so a redelivery of it is processed again."""
+        with self._lock:
+            self._recent.pop(delivery_id, None)
+            conn = db.connect(self.path)
+            try:
+                conn.execute('DELETE FROM deliveries WHERE delivery_id = ?',
+                             (delivery_id,))
+            finally:
+                conn.close()
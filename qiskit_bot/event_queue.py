@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Durable on-disk queue of received webhook events."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import traceback
+
+from qiskit_bot import db
+from qiskit_bot import locks
+
+LOG = logging.getLogger(__name__)
+
+# How long an idle worker sleeps before polling the database again. Events
+# enqueued by this process wake the workers immediately, this only bounds the
+# latency for events enqueued by another process sharing the same queue.
+POLL_INTERVAL = 1.0
+
+# How long to wait before the first retry of an event which failed. The delay
+# doubles with every further attempt.
+RETRY_DELAY = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner_pid INTEGER,
+    received_at REAL NOT NULL,
+    error TEXT,
+    delivery_id TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0
+)
+"""
+
+# Columns added after the first release of the queue
+_COLUMNS = {
+    'delivery_id': 'TEXT',
+    'attempts': 'INTEGER NOT NULL DEFAULT 0',
+    'not_before': 'REAL NOT NULL DEFAULT 0',
+}
+
+
+class EventQueue(object):
+    """A FIFO queue of webhook events persisted in a sqlite database.
+
+    Events are stored as soon as they're received and only removed once they
+    have been processed, so a restart never loses an acknowledged delivery.
+    The database can be shared by multiple processes (e.g. several wsgi
+    workers) and every event is handed out to exactly one consumer.
+
+    An event which fails is retried after a delay until it has been tried
+    ``max_attempts`` times. It's then kept as ``failed`` and its delivery is
+    discarded from ``deliveries``, so a redelivery from GitHub is processed
+    again.
+
+    :param path: The path of the sqlite database.
+    :param deliveries: The :class:`~qiskit_bot.deliveries.DeliveryJournal`
+        the deliveries of the events were recorded in.
+    :param int max_attempts: How many times an event is processed before
+        giving up on it.
+    """
+
+    def __init__(self, path, deliveries=None, max_attempts=3):
+        self.path = path
+        self.deliveries = deliveries
+        self.max_attempts = max_attempts
+        self._new_event = threading.Condition()
+        db.init(self.path, _SCHEMA)
+        db.add_columns(self.path, 'events', _COLUMNS)
+
+    def put(self, event_type, payload, delivery_id=None):
+        """Persist an event and wake up any waiting consumer."""
+        with db.transaction(self.path) as conn:
+            cur = conn.execute(
+                'INSERT INTO events (event_type, payload, received_at, '
+                'delivery_id) VALUES (?, ?, ?, ?)',
+                (event_type, json.dumps(payload), time.time(), delivery_id))
+            event_id = cur.lastrowid
+        LOG.debug('Queued %s event %s' % (event_type, event_id))
+        with self._new_event:
+            self._new_event.notify()
+        return event_id
+
+    def get(self):
+        """Claim the oldest pending event which isn't waiting for a retry.
+
+        :returns: A tuple of ``(event_id, event_type, payload)`` or ``None``
+            if there are no pending events.
+        """
+        with db.transaction(self.path) as conn:
+            row = conn.execute(
+                "SELECT id, event_type, payload FROM events "
+                "WHERE state = 'pending' AND not_before <= ? "
+                "ORDER BY id LIMIT 1", (time.time(),)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE events SET state = 'running', owner_pid = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (os.getpid(), row[0]))
+        return row[0], row[1], json.loads(row[2])
+
+    def complete(self, event_id):
+        with db.transaction(self.path) as conn:
+            conn.execute('DELETE FROM events WHERE id = ?', (event_id,))
+
+    def fail(self, event_id, error):
+        """Schedule a retry of a failed event or give up on it.
+
+        :returns: ``True`` if the event will be retried.
+        """
+        with db.transaction(self.path) as conn:
+            attempts, delivery_id = conn.execute(
+                'SELECT attempts, delivery_id FROM events WHERE id = ?',
+                (event_id,)).fetchone()
+            retry = attempts < self.max_attempts
+            if retry:
+                conn.execute(
+                    "UPDATE events SET state = 'pending', owner_pid = NULL, "
+                    "error = ?, not_before = ? WHERE id = ?",
+                    (error, time.time() + RETRY_DELAY * 2 ** (attempts - 1),
+                     event_id))
+            else:
+                conn.execute(
+                    "UPDATE events SET state = 'failed', error = ? "
+                    "WHERE id = ?", (error, event_id))
+        if not retry and delivery_id and self.deliveries is not None:
+            self.deliveries.discard(delivery_id)
+        return retry
+
+    def depth(self):
+        """Return the number of events waiting to be processed."""
+        with db.transaction(self.path) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM events WHERE state = 'pending'"
+            ).fetchone()[0]
+
+    def recover(self):
+        """Requeue events claimed by a process which no longer exists.
+
+        This runs on startup, before this process starts its workers, so
+        events owned by its own pid were left behind by an earlier process.
+        """
+        recovered = 0
+        with db.transaction(self.path) as conn:
+            rows = conn.execute(
+                "SELECT id, owner_pid FROM events WHERE state = 'running'"
+            ).fetchall()
+            for event_id, owner_pid in rows:
+                if owner_pid is not None and owner_pid != os.getpid() and \
+                        locks.pid_alive(owner_pid):
+                    continue
+                conn.execute(
+                    "UPDATE events SET state = 'pending', owner_pid = NULL "
+                    "WHERE id = ?", (event_id,))
+                recovered += 1
+        if recovered:
+            LOG.warning('Requeued %s interrupted events from %s' % (
+                recovered, self.path))
+        return recovered
+
+    def wait(self, timeout):
+        with self._new_event:
+            self._new_event.wait(timeout)
+
+
+class EventWorkers(object):
+    """A pool of threads draining an :class:`EventQueue`.
+
+    :param event_queue: The queue to consume events from.
+    :param dispatch: A callable taking ``(event_type, payload)`` which is run
+        for every event.
+    :param count: The number of worker threads.
+    """
+
+    def __init__(self, event_queue, dispatch, count=1):
+        self.event_queue = event_queue
+        self.dispatch = dispatch
+        self.count = count
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.count):
+            thread = threading.Thread(target=self._run,
+                                      name='event-worker-%s' % i,
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        with self.event_queue._new_event:
+            self.event_queue._new_event.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                event = self.event_queue.get()
+            except sqlite3.Error:
+                LOG.exception('Failed to read from event queue %s' %
+                              self.event_queue.path)
+                event = None
+            if event is None:
+                self.event_queue.wait(POLL_INTERVAL)
+                continue
+            event_id, event_type, payload = event
+            try:
+                self.dispatch(event_type, payload)
+            except Exception:
+                LOG.exception('Failed to process %s event %s' % (
+                    event_type, event_id))
+                if not self.event_queue.fail(event_id,
+                                             traceback.format_exc()):
+                    LOG.error('Giving up on %s event %s' % (
+                        event_type, event_id))
+            else:
+                self.event_queue.complete(event_id)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Bounded pool for running background jobs."""
+
+import collections
+from concurrent import futures
+import logging
+import threading
+import time
+
+from qiskit_bot import metrics
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+_EXECUTOR = None
+_LOCK = threading.Lock()
+_IN_FLIGHT = 0
+
+#: The most recent failed jobs as ``(timestamp, job name, exception)``
+FAILURES = collections.deque(maxlen=100)
+
+
+def configure(conf):
+    """Create the job pool from the ``executor`` section of the bot config.
+
+    Jobs submitted to a ``process`` pool, and their arguments, need to be
+    picklable. ``thread`` pools don't have that restriction.
+    """
+    global _EXECUTOR
+    executor_conf = conf.get('executor', {})
+    pool_type = executor_conf.get('type', 'thread')
+    max_workers = executor_conf.get('max_workers', DEFAULT_MAX_WORKERS)
+    if pool_type == 'process':
+        new_executor = futures.ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        new_executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='job')
+    with _LOCK:
+        old_executor = _EXECUTOR
+        _EXECUTOR = new_executor
+    if old_executor is not None:
+        old_executor.shutdown(wait=False)
+    LOG.info('Started %s pool for background jobs with %s workers' % (
+        pool_type, max_workers))
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = futures.ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix='job')
+        return _EXECUTOR
+
+
+def _job_name(fn):
+    return getattr(fn, '__qualname__', repr(fn))
+
+
+def _reap(name, future):
+    global _IN_FLIGHT
+    with _LOCK:
+        _IN_FLIGHT -= 1
+        metrics.EXECUTOR_QUEUE_DEPTH.set(_IN_FLIGHT)
+    if future.cancelled():
+        return
+    exc = future.exception()
+    if exc is not None:
+        LOG.error('Background job %s failed' % name,
+                  exc_info=(type(exc), exc, exc.__traceback__))
+        FAILURES.append((time.time(), name, exc))
+
+
+def submit(fn, *args, **kwargs):
+    """Run ``fn(*args, **kwargs)`` on the job pool.
+
+    :returns: The :class:`concurrent.futures.Future` for the job. Failures
+        are logged and recorded in :data:`FAILURES` so callers don't need to
+        wait on it.
+    """
+    global _IN_FLIGHT
+    name = _job_name(fn)
+    with _LOCK:
+        _IN_FLIGHT += 1
+        metrics.EXECUTOR_QUEUE_DEPTH.set(_IN_FLIGHT)
+    try:
+        future = _get_executor().submit(fn, *args, **kwargs)
+    except Exception:
+        with _LOCK:
+            _IN_FLIGHT -= 1
+            metrics.EXECUTOR_QUEUE_DEPTH.set(_IN_FLIGHT)
+        raise
+    future.add_done_callback(lambda f: _reap(name, f))
+    return future
+
+
+def queue_depth():
+    """Return the number of submitted jobs which haven't finished yet."""
+    return _IN_FLIGHT
+
+
+def shutdown(wait=True):
+    global _EXECUTOR
+    with _LOCK:
+        old_executor = _EXECUTOR
+        _EXECUTOR = None
+    if old_executor is not None:
+        old_executor.shutdown(wait=wait)
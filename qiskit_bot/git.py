@@ -14,37 +14,177 @@
 
 """Handle git operations."""
 
+import collections
+import functools
 import logging
+import os
+import re
+import select
+import shlex
+import shutil
+import signal
 import subprocess
+import time
+
+from qiskit_bot import git_objects
+from qiskit_bot import metrics
 
 LOG = logging.getLogger(__name__)
 
+# A commit listed by iter_log(). pr_number is None when the subject doesn't
+# end with a pull request reference.
+LogEntry = collections.namedtuple('LogEntry',
+                                  ['sha', 'subject', 'pr_number', 'refs'])
 
-def push_ref_to_github(repo, ref):
+_PR_REGEX = re.compile(r'^.*\((.*)\)')
+# Commits are separated by NUL with -z and the fields by the ASCII unit
+# separator, neither can appear in a subject line.
+_LOG_FORMAT = '--format=%H%x1f%D%x1f%s'
+_CHUNK_SIZE = 64 * 1024
+
+# Number of commits a shallow clone is first deepened by when a command
+# needs more history, doubled on every further attempt.
+DEEPEN_STEP = 100
+
+
+# Seconds a git command may run before it's killed, by subcommand
+DEFAULT_TIMEOUT = 600
+_TIMEOUTS = {}
+
+
+# Extra environment for git commands talking to GitHub over ssh
+_SSH_ENV = {}
+_SSH_CONFIG = """# Written by qiskit-bot, local changes will be overwritten
+Host *
+    ControlMaster auto
+    ControlPath "%s"
+    ControlPersist %s
+    Include ~/.ssh/config
+    Include /etc/ssh/ssh_config
+"""
+
+
+def _configure_ssh(working_dir, control_persist):
+    _SSH_ENV.clear()
+    if not control_persist:
+        return
+    ssh_dir = os.path.join(working_dir, 'ssh')
+    os.makedirs(ssh_dir, mode=0o700, exist_ok=True)
+    config_path = os.path.join(ssh_dir, 'config')
+    # %C is a hash of the connection, keeping the socket path short
+    control_path = os.path.join(ssh_dir, 'cm-%C')
+    with open(config_path, 'w') as fd:
+        fd.write(_SSH_CONFIG % (control_path, control_persist))
+    os.chmod(config_path, 0o600)
+    _SSH_ENV['GIT_SSH_COMMAND'] = 'ssh -F %s' % shlex.quote(config_path)
+
+
+def configure(conf):
+    """Set the git options from the ``git`` and ``ssh`` config sections.
+
+    Unless ``ssh.control_persist`` is 0 an ssh config is written to the
+    working directory which keeps a master connection to each host open
+    for that many seconds, so pushes in quick succession skip the ssh
+    handshake.
+    """
+    global DEFAULT_TIMEOUT
+    git_conf = conf.get('git', {})
+    DEFAULT_TIMEOUT = git_conf.get('timeout', 600)
+    _TIMEOUTS.clear()
+    _TIMEOUTS.update(git_conf.get('command_timeouts', {}))
+    git_objects.TIMEOUT = _TIMEOUTS.get('cat-file', DEFAULT_TIMEOUT)
+    if 'working_dir' in conf:
+        _configure_ssh(conf['working_dir'],
+                       conf.get('ssh', {}).get('control_persist', 600))
+
+
+def _run(cmd, check=False, capture_output=False, timeout=None, input=None,
+         **kwargs):
+    """Run a git command with a timeout, like :func:`subprocess.run`.
+
+    The command runs in a new session without a terminal, and without stdin
+    unless ``input`` is passed, so it can't block on a prompt. If it runs
+    past its timeout the whole process group, including any ssh or helper
+    processes git started, is killed and the command is treated as failed
+    with the kill signal as its return code.
+    """
+    if timeout is None:
+        timeout = _TIMEOUTS.get(cmd[1], DEFAULT_TIMEOUT)
+    if capture_output:
+        kwargs['stdout'] = subprocess.PIPE
+        kwargs['stderr'] = subprocess.PIPE
+    if input is not None:
+        kwargs['stdin'] = subprocess.PIPE
+    kwargs.setdefault('stdin', subprocess.DEVNULL)
+    with metrics.GIT_COMMAND_LATENCY.labels(cmd[1]).time():
+        with subprocess.Popen(cmd, start_new_session=True, **kwargs) as proc:
+            try:
+                stdout, stderr = proc.communicate(input, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                LOG.error('%s timed out after %ss, killing it' % (
+                    ' '.join(cmd), timeout))
+                os.killpg(proc.pid, signal.SIGKILL)
+                stdout, stderr = proc.communicate()
+    res = subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    if check:
+        res.check_returncode()
+    return res
+
+
+def clone(url, local_path, args=()):
+    """Clone a repository, removing the partial clone if it fails."""
+    cmd = ['git', 'clone'] + list(args) + [url, local_path]
     try:
-        LOG.info('Pushing ref %s for %s to github' % (ref,
-                                                      repo.local_path))
-        res = subprocess.run(['git', 'push', repo.ssh_remote, ref],
-                             capture_output=True, check=True,
-                             cwd=repo.local_path)
-        LOG.debug('Branch ref %s for %s, stdout:\n%s\nstderr:\n%s' % (
-            ref, repo.local_path, res.stdout, res.stderr))
+        return _run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError:
+        shutil.rmtree(local_path, ignore_errors=True)
+        raise
+
+
+def add_remote(local_path, name, url):
+    return _run(['git', 'remote', 'add', name, url], capture_output=True,
+                check=True, cwd=local_path)
+
+
+def push_refs_to_github(repo, refs):
+    """Push several refs to GitHub with a single git push."""
+    env = dict(os.environ, **_SSH_ENV) if _SSH_ENV else None
+    try:
+        LOG.info('Pushing refs %s for %s to github' % (', '.join(refs),
+                                                       repo.local_path))
+        res = _run(['git', 'push', repo.ssh_remote] + list(refs),
+                   capture_output=True, check=True,
+                   cwd=repo.local_path, env=env)
+        LOG.debug('Branch refs %s for %s, stdout:\n%s\nstderr:\n%s' % (
+            ', '.join(refs), repo.local_path, res.stdout, res.stderr))
     except subprocess.CalledProcessError as e:
         LOG.exception(
             'Failed to push branch to github\nstdout:\n%s\nstderr:\n%s'
             % (e.stdout, e.stderr))
         return False
+    return True
+
+
+def push_ref_to_github(repo, ref):
+    return push_refs_to_github(repo, [ref])
 
 
-def pull_remote_ref_to_local(repo, ref):
-    cmd = ['git', 'pull', 'origin', ref]
+def pull_remote_ref_to_local(repo, ref, fetch=True):
+    """Fast-forward the checked out branch to ``origin/<ref>``.
+
+    Only ``ref`` is fetched, and not at all if ``fetch`` is unset because
+    the caller already fetched it.
+    """
+    if fetch and not fetch_refs(repo, ['refs/heads/%s' % ref], force=False):
+        return False
+    cmd = ['git', 'merge', '--ff-only', 'origin/%s' % ref]
     LOG.info('Pulling remote ref %s to local branch' %
              ref)
     try:
-        subprocess.run(cmd, capture_output=True, check=True,
-                       cwd=repo.local_path)
+        _run(cmd, capture_output=True, check=True,
+             cwd=repo.local_path)
     except subprocess.CalledProcessError as e:
-        LOG.exception('git pull failed\nstdout:\n%s\nstderr:\n%s'
+        LOG.exception('git merge failed\nstdout:\n%s\nstderr:\n%s'
                       % (e.stdout, e.stderr))
 
         return False
@@ -56,9 +196,9 @@ def create_branch(branch_name, sha1, repo, push=False):
 
     LOG.info('Creating branch %s for %s' % (branch_name, repo.local_path))
     try:
-        res = subprocess.run(['git', 'branch', branch_name, sha1],
-                             capture_output=True, check=True,
-                             cwd=repo.local_path)
+        res = _run(['git', 'branch', branch_name, sha1],
+                   capture_output=True, check=True,
+                   cwd=repo.local_path)
         LOG.debug('Branch create %s for %s, stdout:\n%s\nstderr:\n%s' % (
             branch_name, repo.local_path, res.stdout, res.stderr))
     except subprocess.CalledProcessError as e:
@@ -71,26 +211,126 @@ def create_branch(branch_name, sha1, repo, push=False):
     return push_ref_to_github(repo, branch_name)
 
 
-def get_git_log(repo, sha1):
-    LOG.info('Querying git log of %s for %s' % (sha1, repo.local_path))
+def is_shallow(repo):
+    return os.path.isfile(os.path.join(repo.local_path, '.git', 'shallow'))
+
+
+def deepen(repo, depth):
+    """Fetch depth more commits of history into a shallow clone."""
+    cmd = ['git', 'fetch', '--deepen=%s' % depth, 'origin']
+    LOG.info('Deepening %s by %s commits' % (repo.local_path, depth))
     try:
-        res = subprocess.run(['git', 'log', '--oneline', sha1],
-                             capture_output=True, check=True,
-                             cwd=repo.local_path)
-        return res.stdout
+        _run(cmd, capture_output=True, check=True,
+             cwd=repo.local_path)
     except subprocess.CalledProcessError as e:
-        LOG.exception('Failed to get git log\nstdout:\n%s\nstderr:\n%s'
+        LOG.exception('Git fetch failed\nstdout:\n%s\nstderr:\n%s\n'
                       % (e.stdout, e.stderr))
-        return ''
+        return False
+    return True
+
+
+def _deepen_until(repo, check):
+    """Deepen a shallow clone until check() passes or it's a full clone."""
+    depth = DEEPEN_STEP
+    while not check():
+        if not is_shallow(repo) or not deepen(repo, depth):
+            return False
+        depth *= 2
+    return True
+
+
+def _succeeds(repo, cmd):
+    return _run(cmd, capture_output=True, cwd=repo.local_path).returncode == 0
+
+
+def _ensure_range_history(repo, rev_range):
+    revs = re.split(r'\.\.\.?', rev_range)
+    if len(revs) == 2 and is_shallow(repo):
+        # The range needs the history back to where both ends meet
+        cmd = ['git', 'merge-base'] + [x or 'HEAD' for x in revs]
+        _deepen_until(repo, functools.partial(_succeeds, repo, cmd))
+
+
+def _log_entry(sha, refs, subject):
+    pr_number = None
+    match = _PR_REGEX.match(subject)
+    if match:
+        try:
+            pr_number = int(match[1][1:])
+        except ValueError:
+            # Not a pull request reference, like (Qiskit/qiskit-aqua#1440)
+            pass
+    return LogEntry(sha, subject, pr_number, [x for x in refs.split(', ')
+                                              if x])
+
+
+def _parse_log_record(record):
+    sha, refs, subject = record.decode('utf8', 'replace').split('\x1f', 2)
+    return _log_entry(sha.strip(), refs, subject)
+
+
+def iter_log(repo, rev_range):
+    """Stream the commits of a revision range as :class:`LogEntry` tuples.
+
+    Commits are parsed as git writes them out, so memory use doesn't grow
+    with the size of the range. Like :func:`_run` the command is killed if
+    it runs past its timeout.
+
+    :raises subprocess.CalledProcessError: If git log fails or times out,
+        after the commits read until then were yielded.
+    """
+    LOG.info('Streaming git log of %s for %s' % (rev_range, repo.local_path))
+    _ensure_range_history(repo, rev_range)
+    cmd = ['git', 'log', '-z', _LOG_FORMAT, rev_range]
+    timeout = _TIMEOUTS.get('log', DEFAULT_TIMEOUT)
+    start = time.monotonic()
+    proc = subprocess.Popen(cmd, cwd=repo.local_path,
+                            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, bufsize=0,
+                            start_new_session=True)
+    try:
+        buf = b''
+        while True:
+            remaining = start + timeout - time.monotonic()
+            if remaining <= 0 or \
+                    not select.select([proc.stdout], [], [], remaining)[0]:
+                LOG.error('%s timed out after %ss, killing it' % (
+                    ' '.join(cmd), timeout))
+                os.killpg(proc.pid, signal.SIGKILL)
+                # Don't parse a partially written commit
+                buf = b''
+                break
+            chunk = os.read(proc.stdout.fileno(), _CHUNK_SIZE)
+            if not chunk:
+                break
+            *records, buf = (buf + chunk).split(b'\0')
+            for record in records:
+                if record:
+                    yield _parse_log_record(record)
+        if buf.strip():
+            yield _parse_log_record(buf)
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            LOG.error('Failed to get git log\nstderr:\n%s' % stderr)
+            raise subprocess.CalledProcessError(proc.returncode, cmd,
+                                                stderr=stderr)
+    finally:
+        if proc.poll() is None:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+        metrics.GIT_COMMAND_LATENCY.labels('log').observe(
+            time.monotonic() - start)
 
 
 def get_tags(repo):
     """Get a list of tags in creation order separated by newlines."""
     LOG.info('Querying git tags for %s' % repo.local_path)
     try:
-        res = subprocess.run(['git', 'tag', '--sort=-creatordate'],
-                             capture_output=True, check=True, encoding="UTF8",
-                             cwd=repo.local_path)
+        res = _run(['git', 'tag', '--sort=-creatordate'],
+                   capture_output=True, check=True, encoding="UTF8",
+                   cwd=repo.local_path)
         return res.stdout
     except subprocess.CalledProcessError as e:
         LOG.exception('Failed to get git log\nstdout:\n%s\nstderr:\n%s'
@@ -101,8 +341,8 @@ def get_tags(repo):
 def clean_repo(repo):
     cmd = ['git', 'clean', '-fdX']
     try:
-        subprocess.run(cmd, capture_output=True, check=True,
-                       cwd=repo.local_path)
+        _run(cmd, capture_output=True, check=True,
+             cwd=repo.local_path)
     except subprocess.CompletedProcess as e:
         LOG.exception('git clean failed\nstdout:\n%s\nstderr:\n%s'
                       % (e.stdout, e.stderr))
@@ -114,8 +354,8 @@ def checkout_ref(repo, ref):
     cmd = ['git', 'checkout', ref]
     LOG.info('Checking out %s of %s' % (ref, repo.local_path))
     try:
-        res = subprocess.run(cmd, capture_output=True, check=True,
-                             cwd=repo.local_path)
+        res = _run(cmd, capture_output=True, check=True,
+                   cwd=repo.local_path)
         LOG.debug('Git checkout for %s, stdout:\n%s\nstderr:\n%s' % (
             repo.local_path, res.stdout, res.stderr))
     except subprocess.CompletedProcess as e:
@@ -124,15 +364,22 @@ def checkout_ref(repo, ref):
         return False
 
 
-def create_git_commit_for_all(repo, commit_msg):
-    cmd = ['git', 'commit', '-a', '-m', commit_msg]
-    LOG.info('Creating git commit for all local changes in %s' %
-             repo.local_path)
+def sparse_checkout(repo, paths):
+    """Limit the worktree of a repository to a list of files.
+
+    Files outside of ``paths`` are removed from the worktree and skipped by
+    checkouts and status, but are still part of every commit.
+    """
+    # Patterns are matched like .gitignore entries, anchor them to the root
+    patterns = ['/' + path.lstrip('/') for path in paths]
+    cmd = ['git', 'sparse-checkout', 'set', '--no-cone'] + patterns
+    LOG.info('Setting sparse checkout of %s to %s' % (repo.local_path,
+                                                      ', '.join(paths)))
     try:
-        subprocess.run(cmd, capture_output=True, check=True,
-                       cwd=repo.local_path)
+        _run(cmd, capture_output=True, check=True,
+             cwd=repo.local_path)
     except subprocess.CalledProcessError as e:
-        LOG.exception('git commit failed\nstdout:\n%s\nstderr:\n%s'
+        LOG.exception('git sparse-checkout failed\nstdout:\n%s\nstderr:\n%s'
                       % (e.stdout, e.stderr))
         return False
     return True
@@ -143,8 +390,8 @@ def checkout_default_branch(repo, pull=True):
     cmd = ['git', 'checkout', default_branch]
     LOG.info('Checking out branch of %s' % repo.local_path)
     try:
-        res = subprocess.run(cmd, capture_output=True, check=True,
-                             cwd=repo.local_path)
+        res = _run(cmd, capture_output=True, check=True,
+                   cwd=repo.local_path)
         LOG.debug('Git checkout for %s, stdout:\n%s\nstderr:\n%s' % (
             repo.local_path, res.stdout, res.stderr))
     except subprocess.CompletedProcess as e:
@@ -153,23 +400,190 @@ def checkout_default_branch(repo, pull=True):
         return False
     if not pull:
         return True
-    cmd = ['git', 'pull']
     LOG.info('Pulling the latest default branch for %s' % repo.local_path)
+    return pull_remote_ref_to_local(repo, default_branch)
+
+
+def fetch_default_branch(repo):
+    """Fast-forward the remote tracking ref of the default branch."""
+    default_branch = repo.repo_config.get('default_branch', 'master')
+    return fetch_refs(repo, ['refs/heads/%s' % default_branch], force=False)
+
+
+def tracking_ref(ref):
+    """Map a ref on GitHub to the local ref it is fetched into."""
+    if ref.startswith('refs/heads/'):
+        return 'refs/remotes/origin/' + ref[len('refs/heads/'):]
+    return ref
+
+
+def fetch_refs(repo, refs, force=True):
+    """Fetch a list of branch and tag refs into their local refs.
+
+    Unless ``force`` is set only fast-forward updates of the local refs are
+    accepted, and an existing tag is never moved.
+    """
+    prefix = '+' if force else ''
+    cmd = ['git', 'fetch', 'origin']
+    cmd += ['%s%s:%s' % (prefix, ref, tracking_ref(ref)) for ref in refs]
+    LOG.info('Fetching %s for %s' % (', '.join(refs), repo.local_path))
     try:
-        subprocess.run(cmd, capture_output=True, check=True,
-                       cwd=repo.local_path)
-    except subprocess.CompletedProcess as e:
-        LOG.exception('Git pull failed\nstdout:\n%s\nstderr:\n%s\n'
+        _run(cmd, capture_output=True, check=True,
+             cwd=repo.local_path)
+    except subprocess.CalledProcessError as e:
+        LOG.exception('Git fetch failed\nstdout:\n%s\nstderr:\n%s\n'
                       % (e.stdout, e.stderr))
         return False
+    return True
+
+
+def _remote_tags(repo):
+    """Map the tag refs on GitHub to the sha1 of the commit they point to."""
+    res = _run(['git', 'ls-remote', '--tags', 'origin'], capture_output=True,
+               check=True, encoding='utf8', cwd=repo.local_path)
+    tags = {}
+    for line in res.stdout.splitlines():
+        sha, ref = line.split('\t', 1)
+        # Annotated tags are followed by the commit they peel to
+        if ref.endswith('^{}'):
+            tags[ref[:-3]] = sha
+        else:
+            tags.setdefault(ref, sha)
+    return tags
+
+
+def fetch_tags(repo):
+    """Fetch the tags missing from a shallow clone.
+
+    A shallow clone only has the tags pointing into its history. Tags whose
+    commit is already local are fetched as is, the others with one commit
+    of history each, which is deepened on demand like the rest of the
+    clone. Tags which exist locally aren't fetched again, a depth limited
+    fetch of their commit would cut the history deepened below it.
+    """
+    LOG.info('Fetching tags for %s' % repo.local_path)
+    try:
+        remote = _remote_tags(repo)
+        local = set('refs/tags/%s' % tag
+                    for tag in get_tags(repo).splitlines())
+        reader = git_objects.get_reader(repo.local_path)
+        have, need = [], []
+        for ref, sha in sorted(remote.items()):
+            if ref in local:
+                continue
+            if reader.info(sha) is not None:
+                have.append('%s:%s' % (ref, ref))
+            else:
+                need.append('%s:%s' % (ref, ref))
+        if have:
+            _run(['git', 'fetch', 'origin'] + have, capture_output=True,
+                 check=True, cwd=repo.local_path)
+        if need:
+            _run(['git', 'fetch', '--depth=1', 'origin'] + need,
+                 capture_output=True, check=True, cwd=repo.local_path)
+    except subprocess.CalledProcessError as e:
+        LOG.exception('Git fetch failed\nstdout:\n%s\nstderr:\n%s\n'
+                      % (e.stdout, e.stderr))
+        return False
+    return True
+
+
+def resolve_ref(repo, ref):
+    """Get the sha1 a local ref points to or ``None`` if it doesn't exist."""
+    return git_objects.get_reader(repo.local_path).resolve(ref)
+
+
+def get_blob_sha(repo, ref, path):
+    """Get the sha1 of the blob for a file at a ref.
+
+    :returns: The blob's sha1 or ``None`` if the file doesn't exist at ref.
+    """
+    reader = git_objects.get_reader(repo.local_path)
+    return reader.resolve('%s:%s' % (ref, path))
+
+
+def read_blob(repo, sha1):
+    """Read the contents of a blob from the object database."""
+    return git_objects.get_reader(repo.local_path).read_blob(sha1)
+
+
+def hash_object(repo, data):
+    """Write ``data`` as a blob to the object database and return its sha1."""
+    res = _run(['git', 'hash-object', '-w', '--stdin'], input=data,
+               capture_output=True, check=True, cwd=repo.local_path)
+    return res.stdout.decode('utf8').strip()
+
+
+def write_tree(repo, base_tree, files):
+    """Write a copy of a tree with some files replaced.
+
+    :param base_tree: The tree, or a commit or ref pointing to it, to start
+        from or ``None`` to start from an empty tree.
+    :param dict files: A mapping of paths in the tree to the sha1 of the blob
+        to store there. Existing files keep their mode.
+    :returns: The sha1 of the new tree.
+    """
+    entries = {}
+    if base_tree is not None:
+        reader = git_objects.get_reader(repo.local_path)
+        entries = {entry.name: entry for entry in reader.read_tree(base_tree)}
+    subtrees = {}
+    for path, sha in files.items():
+        name, _, rest = path.partition('/')
+        if rest:
+            subtrees.setdefault(name, {})[rest] = sha
+        else:
+            mode = entries[name].mode if name in entries else '100644'
+            entries[name] = git_objects.TreeEntry(mode, 'blob', sha, name)
+    for name, subtree_files in subtrees.items():
+        subtree = entries[name].sha if name in entries else None
+        sha = write_tree(repo, subtree, subtree_files)
+        entries[name] = git_objects.TreeEntry('040000', 'tree', sha, name)
+    tree_input = b''.join(
+        ('%s %s %s\t%s\0' % entry).encode('utf8')
+        for entry in entries.values())
+    res = _run(['git', 'mktree', '-z'], input=tree_input,
+               capture_output=True, check=True, cwd=repo.local_path)
+    return res.stdout.decode('utf8').strip()
+
+
+def commit_tree(repo, tree, parents, commit_msg):
+    """Write a commit of a tree and return its sha1."""
+    cmd = ['git', 'commit-tree', tree]
+    for parent in parents:
+        cmd += ['-p', parent]
+    res = _run(cmd, input=commit_msg, capture_output=True, check=True,
+               cwd=repo.local_path)
+    return res.stdout.decode('utf8').strip()
+
+
+def update_ref(repo, ref, sha1, old_sha1=None):
+    """Point a local ref at sha1.
+
+    If ``old_sha1`` is set the update fails unless the ref still points to
+    it.
+    """
+    cmd = ['git', 'update-ref', ref, sha1]
+    if old_sha1 is not None:
+        cmd.append(old_sha1)
+    LOG.info('Updating %s of %s to %s' % (ref, repo.local_path, sha1))
+    try:
+        _run(cmd, capture_output=True, check=True, cwd=repo.local_path)
+    except subprocess.CalledProcessError as e:
+        LOG.exception('git update-ref failed\nstdout:\n%s\nstderr:\n%s'
+                      % (e.stdout, e.stderr))
+        return False
+    return True
 
 
 def get_latest_tag(repo):
     cmd = ['git', 'describe', '--abbrev=0']
     LOG.info('Getting latest tag for %s' % repo.local_path)
+    if is_shallow(repo):
+        _deepen_until(repo, functools.partial(_succeeds, repo, cmd))
     try:
-        res = subprocess.run(cmd, capture_output=True, check=True,
-                             cwd=repo.local_path)
+        res = _run(cmd, capture_output=True, check=True,
+                   cwd=repo.local_path)
     except subprocess.CompletedProcess as e:
         LOG.exception('Git get latest tag failed\nstdout:\n%s\nstderr:\n%s\n'
                       % (e.stdout, e.stderr))
@@ -177,14 +591,34 @@ def get_latest_tag(repo):
     return res.stdout
 
 
+def delete_tracking_ref(repo, ref):
+    """Delete the local ref a ref deleted on GitHub was fetched into."""
+    local_ref = tracking_ref(ref)
+    LOG.info('Deleting %s for %s' % (local_ref, repo.local_path))
+    try:
+        _run(['git', 'update-ref', '-d', local_ref],
+             capture_output=True, check=True, cwd=repo.local_path)
+    except subprocess.CalledProcessError as e:
+        LOG.exception(
+            'Failed to delete a tracking ref\nstdout:\n%s\nstderr:\n%s\n'
+            % (e.stdout, e.stderr))
+        return False
+    return True
+
+
+def delete_tracking_branch(branch_name, repo):
+    """Delete the remote tracking branch of a branch deleted on GitHub."""
+    return delete_tracking_ref(repo, 'refs/heads/%s' % branch_name)
+
+
 def delete_local_branch(branch_name, repo):
     """Deleting a local branch."""
 
     LOG.info('Deleting branch %s for %s' % (branch_name, repo.local_path))
     try:
-        res = subprocess.run(['git', 'branch', '-D', branch_name],
-                             capture_output=True, check=True,
-                             cwd=repo.local_path)
+        res = _run(['git', 'branch', '-D', branch_name],
+                   capture_output=True, check=True,
+                   cwd=repo.local_path)
         LOG.debug('Branch delete %s for %s, stdout:\n%s\nstderr:\n%s' % (
             branch_name, repo.local_path, res.stdout, res.stderr))
     except subprocess.CalledProcessError as e:
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Read git objects through long running ``git cat-file`` processes."""
+
+import atexit
+import collections
+import logging
+import os
+import select
+import signal
+import subprocess
+import threading
+import time
+
+from qiskit_bot import metrics
+
+LOG = logging.getLogger(__name__)
+
+TreeEntry = collections.namedtuple('TreeEntry',
+                                   ['mode', 'type', 'sha', 'name'])
+
+_TREE_ENTRY_TYPES = {'040000': 'tree', '160000': 'commit'}
+_CHUNK_SIZE = 64 * 1024
+
+# Seconds a single request may take before its git cat-file process is
+# killed, set from the git command timeouts by git.configure()
+TIMEOUT = 600
+
+_READERS = {}
+_READERS_GUARD = threading.Lock()
+
+
+class ObjectReader(object):
+    """Resolve revisions and read objects of one repository over a pipe.
+
+    A ``git cat-file --batch`` process (and a ``--batch-check`` one for
+    lookups which don't need the object's contents) is started on first use
+    and kept running, so each read costs a round trip over a pipe instead of
+    forking a new git process. A process which has exited is restarted and
+    the request retried once. A request which doesn't finish within
+    :data:`TIMEOUT`, like a partial clone stuck fetching a missing object,
+    kills the process group and raises :class:`TimeoutError`.
+
+    Git objects are immutable, so reads by sha1 don't need to hold the
+    repository lock, but a ref can be moved by a forced fetch while it's
+    being read. Callers resolve refs to a sha1 with :meth:`resolve` while
+    holding the repository lock and only pass sha1s to the other methods.
+    Requests are serialized on a per-reader thread lock.
+    """
+
+    def __init__(self, local_path):
+        self.local_path = local_path
+        self._procs = {}
+        self._buffers = {}
+        self._lock = threading.Lock()
+
+    def _get_proc(self, mode):
+        proc = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            LOG.debug('Starting git cat-file %s for %s' % (mode,
+                                                           self.local_path))
+            # stdout is unbuffered so select() sees all pending output, and
+            # the process gets its own group so a kill reaches any fetch it
+            # started for a missing object
+            proc = subprocess.Popen(['git', 'cat-file', mode],
+                                    cwd=self.local_path,
+                                    stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL,
+                                    bufsize=0, start_new_session=True)
+            self._procs[mode] = proc
+            self._buffers[mode] = bytearray()
+        return proc
+
+    def _stop_proc(self, mode):
+        proc = self._procs.pop(mode, None)
+        self._buffers.pop(mode, None)
+        if proc is not None and proc.poll() is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            proc.wait()
+
+    def _fill(self, proc, mode, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or \
+                not select.select([proc.stdout], [], [], remaining)[0]:
+            raise TimeoutError('git cat-file %s for %s timed out after %ss' %
+                               (mode, self.local_path, TIMEOUT))
+        chunk = os.read(proc.stdout.fileno(), _CHUNK_SIZE)
+        if not chunk:
+            raise BrokenPipeError('git cat-file exited')
+        self._buffers[mode] += chunk
+
+    def _read_bytes(self, proc, mode, size, deadline):
+        buf = self._buffers[mode]
+        while len(buf) < size:
+            self._fill(proc, mode, deadline)
+        data = bytes(buf[:size])
+        del buf[:size]
+        return data
+
+    def _read_line(self, proc, mode, deadline):
+        buf = self._buffers[mode]
+        while b'\n' not in buf:
+            self._fill(proc, mode, deadline)
+        return self._read_bytes(proc, mode, buf.index(b'\n') + 1, deadline)
+
+    def _exchange(self, proc, mode, rev):
+        deadline = time.monotonic() + TIMEOUT
+        proc.stdin.write(rev.encode('utf8') + b'\n')
+        proc.stdin.flush()
+        header = self._read_line(proc, mode, deadline)
+        if header.endswith((b' missing\n', b' ambiguous\n')):
+            return None
+        sha, obj_type, size = header.decode('utf8').split()
+        size = int(size)
+        body = None
+        if mode == '--batch':
+            # The contents are followed by a newline
+            body = self._read_bytes(proc, mode, size + 1, deadline)[:-1]
+        return sha, obj_type, size, body
+
+    def _request(self, mode, rev):
+        if '\n' in rev:
+            raise ValueError('Invalid revision %r' % rev)
+        with self._lock:
+            with metrics.GIT_COMMAND_LATENCY.labels('cat-file').time():
+                try:
+                    return self._exchange(self._get_proc(mode), mode, rev)
+                except TimeoutError:
+                    LOG.error('git cat-file %s for %s timed out, killing it' %
+                              (mode, self.local_path))
+                    self._stop_proc(mode)
+                    raise
+                except OSError:
+                    LOG.warning('git cat-file %s for %s failed, restarting' %
+                                (mode, self.local_path))
+                    self._stop_proc(mode)
+                return self._exchange(self._get_proc(mode), mode, rev)
+
+    def info(self, rev):
+        """Return the ``(sha, type, size)`` of an object or ``None``."""
+        res = self._request('--batch-check', rev)
+        if res is None:
+            return None
+        return res[:3]
+
+    def resolve(self, rev):
+        """Return the sha1 a revision points to or ``None``."""
+        res = self.info(rev)
+        return res[0] if res else None
+
+    def read(self, rev):
+        """Return the ``(sha, type, contents)`` of an object or ``None``."""
+        res = self._request('--batch', rev)
+        if res is None:
+            return None
+        return res[0], res[1], res[3]
+
+    def read_blob(self, rev):
+        """Return the decoded contents of a blob or ``None``."""
+        res = self.read(rev)
+        if res is None:
+            return None
+        return res[2].decode('utf8')
+
+    def read_tree(self, rev):
+        """Return the :class:`TreeEntry` list of a tree or ``None``."""
+        res = self.read('%s^{tree}' % rev)
+        if res is None:
+            return None
+        return _parse_tree(res[2])
+
+    def close(self):
+        with self._lock:
+            for mode in list(self._procs):
+                self._stop_proc(mode)
+
+
+def _parse_tree(data):
+    # Each entry is "<octal mode> <name>\0" followed by the raw 20 byte sha1
+    entries = []
+    pos = 0
+    while pos < len(data):
+        end = data.index(b'\0', pos)
+        mode, name = data[pos:end].decode('utf8').split(' ', 1)
+        mode = mode.zfill(6)
+        sha = data[end + 1:end + 21].hex()
+        entries.append(TreeEntry(mode, _TREE_ENTRY_TYPES.get(mode, 'blob'),
+                                 sha, name))
+        pos = end + 21
+    return entries
+
+
+def get_reader(local_path):
+    """Return the process wide :class:`ObjectReader` for a repository."""
+    with _READERS_GUARD:
+        reader = _READERS.get(local_path)
+        if reader is None:
+            reader = ObjectReader(local_path)
+            _READERS[local_path] = reader
+        return reader
+
+
+def close_all():
+    with _READERS_GUARD:
+        readers = list(_READERS.values())
+        _READERS.clear()
+    for reader in readers:
+        reader.close()
+
+
+def _reset_readers():
+    global _READERS_GUARD
+    # A forked child must not share the parent's pipes, or the lock of a
+    # reader which was in use by another thread at fork time.
+    _READERS.clear()
+    _READERS_GUARD = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_readers)
+atexit.register(close_all)
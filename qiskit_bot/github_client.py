@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Shared, connection pooled client for the GitHub API."""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import github
+from github import Requester
+import requests
+
+from qiskit_bot import http_cache
+from qiskit_bot import metrics
+
+LOG = logging.getLogger(__name__)
+
+_CLIENTS = {}
+_LOCK = threading.Lock()
+_SETTINGS = {}
+_CACHE = None
+_SESSIONS = {}
+
+
+def _cache_key(url, headers):
+    # Responses differ by who is asking and by the requested media type
+    auth = headers.get('Authorization', '')
+    return '%s %s %s' % (hashlib.sha256(auth.encode('utf8')).hexdigest(),
+                         headers.get('Accept', ''), url)
+
+
+def _get_session(host, port, retry, pool_size):
+    key = (host, port, retry, pool_size)
+    with _LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            session.auth = Requester.Requester.noopAuth
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=retry, pool_connections=pool_size,
+                pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            _SESSIONS[key] = session
+        return session
+
+
+class SharedHTTPSConnection(Requester.HTTPSRequestsConnectionClass):
+    """PyGithub connection class which can be shared between threads.
+
+    PyGithub creates a new connection object for every request once its
+    connection classes are injected. The objects are cheap, every one with
+    the same host and pool settings uses a single process wide
+    ``requests.Session`` whose pool keeps the connections to the API alive,
+    and closing one leaves the session open. The pending request is stored
+    per thread between ``request()`` and ``getresponse()``, so a connection
+    can also be used by every worker at once. Metrics are recorded for every
+    request.
+
+    When a cache is configured GET requests are made conditional on the
+    ETag or Last-Modified of the cached response, and a 304 reply is served
+    from the cache. GitHub doesn't count 304 replies against the rate limit.
+    """
+
+    def __init__(self, host, port=None, strict=False, timeout=None,
+                 retry=None, pool_size=None, **kwargs):
+        # The parent's __init__ isn't called, it creates a new session
+        self.host = host
+        self.port = port if port else 443
+        self.protocol = 'https'
+        self.timeout = timeout
+        self.verify = kwargs.get('verify', True)
+        if retry is None:
+            retry = requests.adapters.DEFAULT_RETRIES
+        if pool_size is None:
+            pool_size = requests.adapters.DEFAULT_POOLSIZE
+        self.retry = retry
+        self.pool_size = pool_size
+        self.session = _get_session(host, self.port, retry, pool_size)
+        self._pending = threading.local()
+
+    def close(self):
+        pass
+
+    def request(self, verb, url, input, headers, stream=False):
+        self._pending.request = (verb, url, input, headers, stream)
+
+    def getresponse(self):
+        verb, url, input, headers, stream = self._pending.request
+        cache = _CACHE
+        cache_key = None
+        cached = None
+        if cache is not None and verb == 'GET' and not stream:
+            cache_key = _cache_key(url, headers)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                headers = dict(headers)
+                etag, last_modified, _, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+        endpoint = metrics.github_endpoint(url)
+        start = time.monotonic()
+        response = self.session.request(
+            verb,
+            '%s://%s:%s%s' % (self.protocol, self.host, self.port, url),
+            headers=headers,
+            data=input,
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+            stream=stream,
+        )
+        metrics.GITHUB_REQUEST_LATENCY.labels(verb, endpoint).observe(
+            time.monotonic() - start)
+        metrics.GITHUB_REQUESTS.labels(
+            verb, endpoint, response.status_code).inc()
+        if cache_key is None:
+            return Requester.RequestsResponse(response)
+        if cached is not None and response.status_code == 304:
+            cache.hit(cache_key)
+            cached_headers = cached[2]
+            # Keep the fresh rate limit and date headers from the 304
+            cached_headers.update(
+                (k, v) for k, v in response.headers.items()
+                if k.lower() != 'content-length')
+            return http_cache.CachedResponse(cached_headers, cached[3])
+        cache.miss()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified):
+            cache.put(cache_key, etag, last_modified,
+                      dict(response.headers), response.text)
+        return Requester.RequestsResponse(response)
+
+
+def install():
+    """Make every PyGithub client use :class:`SharedHTTPSConnection`.
+
+    This turns off PyGithub's reuse of connection objects, the connections
+    are kept alive by the shared sessions instead.
+    """
+    Requester.Requester.injectConnectionClasses(
+        Requester.HTTPRequestsConnectionClass, SharedHTTPSConnection)
+
+
+def configure(conf):
+    """Set the client options from the ``github`` section of the bot config.
+
+    Unless ``pool_size`` is set the connection pool is sized so every event
+    worker and background job can hold a connection at the same time, with
+    room for each job to fan out ``changelog.max_in_flight`` label lookups.
+    A ``cache_size`` of 0 disables the on-disk response cache.
+    """
+    global _CACHE
+    github_conf = conf.get('github', {})
+    pool_size = github_conf.get('pool_size')
+    if pool_size is None:
+        max_jobs = conf.get('executor', {}).get('max_workers', 4)
+        max_in_flight = conf.get('changelog', {}).get('max_in_flight', 8)
+        max_requests = max_jobs * max(max_in_flight, 1)
+        pool_size = conf.get('event_workers', 2) + max_requests
+    settings = {'pool_size': pool_size}
+    if 'timeout' in github_conf:
+        settings['timeout'] = github_conf['timeout']
+    if 'retries' in github_conf:
+        settings['retry'] = github_conf['retries']
+    cache_size = github_conf.get('cache_size', 100 * 1024 * 1024)
+    if cache_size and 'working_dir' in conf:
+        cache = http_cache.HTTPCache(
+            os.path.join(conf['working_dir'], 'http_cache.sqlite'),
+            max_size=cache_size)
+    else:
+        cache = None
+    with _LOCK:
+        _SETTINGS.clear()
+        _SETTINGS.update(settings)
+        _CLIENTS.clear()
+        _CACHE = cache
+    LOG.info('Configured GitHub client with %s' % settings)
+
+
+def get_client(access_token=None):
+    """Return the process wide GitHub client for an access token.
+
+    Every caller using the same token shares a single client, and with it a
+    single pool of keep-alive connections to the API.
+    """
+    with _LOCK:
+        client = _CLIENTS.get(access_token)
+        if client is None:
+            auth = github.Auth.Token(access_token) if access_token else None
+            client = github.Github(auth=auth, **_SETTINGS)
+            _CLIENTS[access_token] = client
+        return client
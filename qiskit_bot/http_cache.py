@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""On-disk cache of GitHub API responses for conditional requests."""
+
+import json
+import logging
+import threading
+import time
+
+from qiskit_bot import db
+from qiskit_bot import metrics
+
+LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+class CachedResponse(object):
+    """A response served from the cache, mimicking PyGithub's response."""
+
+    def __init__(self, headers, body):
+        self.status = 200
+        self.headers = headers
+        self.body = body
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+
+class HTTPCache(object):
+    """A size bounded store of validators and bodies for GET responses.
+
+    Entries are keyed by an opaque string (normally the request url plus
+    anything else which changes the response), and the least recently used
+    entries are evicted once the bodies take up more than ``max_size``
+    bytes.
+    """
+
+    def __init__(self, path, max_size=100 * 1024 * 1024):
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        db.init(self.path, _SCHEMA)
+
+    def get(self, key):
+        """Return the cached ``(etag, last_modified, headers, body)``."""
+        conn = db.connect(self.path)
+        try:
+            row = conn.execute(
+                'SELECT etag, last_modified, headers, body FROM responses '
+                'WHERE key = ?', (key,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2]), row[3]
+
+    def hit(self, key):
+        """Record that a cached entry was revalidated and used."""
+        with self._lock:
+            self.hits += 1
+        metrics.GITHUB_CACHE_REQUESTS.labels('hit').inc()
+        conn = db.connect(self.path)
+        try:
+            conn.execute('UPDATE responses SET accessed = ? WHERE key = ?',
+                         (time.time(), key))
+        finally:
+            conn.close()
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+        metrics.GITHUB_CACHE_REQUESTS.labels('miss').inc()
+
+    def put(self, key, etag, last_modified, headers, body):
+        size = len(body.encode('utf8'))
+        if size > self.max_size:
+            return
+        with db.transaction(self.path) as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, etag, last_modified, '
+                'headers, body, size, accessed) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, json.dumps(headers), body, size,
+                 time.time()))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed').fetchall()
+        evicted = 0
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        LOG.debug('Evicted %s entries from the http cache' % evicted)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Bulk lookup of pull request labels."""
+
+from concurrent import futures
+import functools
+import logging
+
+import github
+
+from qiskit_bot import pr_store
+
+LOG = logging.getLogger(__name__)
+
+# The maximum number of pull requests resolved by a single GraphQL query
+GRAPHQL_BATCH_SIZE = 100
+
+_SETTINGS = {'graphql': True, 'max_in_flight': 8}
+
+_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    %s
+  }
+}
+"""
+_PR_FIELD = ('pr%d: pullRequest(number: %d) '
+             '{ updatedAt labels(first: 100) { nodes { name } } }')
+
+
+def _graphql_labels(repo, pr_numbers):
+    owner, name = repo.repo_name.split('/')
+    query = _QUERY % '\n    '.join(_PR_FIELD % (n, n) for n in pr_numbers)
+    variables = {'owner': owner, 'name': name}
+    _, data = repo.gh_repo.requester.requestJsonAndCheck(
+        'POST', '/graphql', input={'query': query, 'variables': variables})
+    repository = (data.get('data') or {}).get('repository') or {}
+    labels = {}
+    for pr_number in pr_numbers:
+        pr = repository.get('pr%d' % pr_number)
+        # A missing pull request (or an issue number) is null in the result
+        # and the reason is listed in the query's errors.
+        if pr is not None:
+            labels[pr_number] = [x['name'] for x in pr['labels']['nodes']]
+            _store_labels(repo, pr_number, labels[pr_number],
+                          pr.get('updatedAt'))
+    return labels
+
+
+def _rest_labels(repo, pr_number):
+    try:
+        pr = repo.gh_repo.get_pull(pr_number)
+    except github.GithubException:
+        return None
+    labels = [x.name for x in pr.labels]
+    _store_labels(repo, pr_number, labels, pr.raw_data.get('updated_at'))
+    return labels
+
+
+def _store_labels(repo, pr_number, labels, updated_at):
+    store = pr_store.get_store()
+    if store is not None:
+        store.set_labels(repo.repo_name, pr_number, labels, updated_at)
+
+
+def _rest_labels_concurrently(repo, pr_numbers):
+    if not pr_numbers:
+        return {}
+    max_workers = min(_SETTINGS['max_in_flight'], len(pr_numbers))
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(functools.partial(_rest_labels, repo), pr_numbers)
+        return {pr_number: pr_labels
+                for pr_number, pr_labels in zip(pr_numbers, results)
+                if pr_labels is not None}
+
+
+def configure(conf):
+    """Set the lookup options from the ``changelog`` section of the config.
+
+    ``graphql`` can be set to false for tokens which can't use the GraphQL
+    API and ``max_in_flight`` limits the concurrent REST requests.
+    """
+    changelog_conf = conf.get('changelog', {})
+    _SETTINGS['graphql'] = changelog_conf.get('graphql', True)
+    _SETTINGS['max_in_flight'] = changelog_conf.get('max_in_flight', 8)
+
+
+def get_pr_labels(repo, pr_numbers):
+    """Get the label names for a list of pull requests.
+
+    Pull requests already in the local :mod:`~qiskit_bot.pr_store` are
+    answered from there without any API request. The rest are fetched with
+    GraphQL queries resolving up to
+    :data:`GRAPHQL_BATCH_SIZE` pull requests at a time. Any pull request the
+    GraphQL API didn't return, including every pull request in a batch whose
+    query failed, is looked up with the REST API. REST lookups run
+    concurrently with at most ``max_in_flight`` requests at once. Each pull
+    request is only looked up once no matter how often it's listed.
+
+    :returns: A dict mapping pull request numbers to a list of label names.
+        Pull requests which couldn't be found are not included.
+    """
+    pr_numbers = list(dict.fromkeys(pr_numbers))
+    store = pr_store.get_store()
+    if store is not None:
+        labels = store.get_labels(repo.repo_name, pr_numbers)
+        pr_numbers = [x for x in pr_numbers if x not in labels]
+        LOG.debug('Found labels for %s pull requests in the local store' %
+                  len(labels))
+    else:
+        labels = {}
+    if _SETTINGS['graphql']:
+        for i in range(0, len(pr_numbers), GRAPHQL_BATCH_SIZE):
+            batch = pr_numbers[i:i + GRAPHQL_BATCH_SIZE]
+            try:
+                labels.update(_graphql_labels(repo, batch))
+            except github.GithubException:
+                LOG.warning('GraphQL label query failed for %s, falling back '
+                            'to the REST API' % repo.repo_name, exc_info=True)
+    missing = [x for x in pr_numbers if x not in labels]
+    labels.update(_rest_labels_concurrently(repo, missing))
+    return labels
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Locks serializing work on the local repository clones."""
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+
+import fasteners
+
+from qiskit_bot import metrics
+
+LOG = logging.getLogger(__name__)
+
+_THREAD_LOCKS = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+_SETTINGS = {'timeout': 1800, 'lease': 900}
+
+
+class LockTimeout(Exception):
+    """A repository lock wasn't acquired before the timeout."""
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def configure(conf):
+    """Set the lock options from the ``locks`` section of the bot config.
+
+    ``timeout`` bounds how long a caller waits for a lock and ``lease`` is
+    how long a holder is expected to keep it. The timeout defaults to two
+    leases, so a waiter only gives up on a holder which overran its lease.
+    """
+    locks_conf = conf.get('locks', {})
+    _SETTINGS['timeout'] = locks_conf.get('timeout', 1800)
+    _SETTINGS['lease'] = locks_conf.get('lease', 900)
+
+
+def _get_thread_lock(path):
+    with _THREAD_LOCKS_GUARD:
+        if path not in _THREAD_LOCKS:
+            _THREAD_LOCKS[path] = threading.Lock()
+        return _THREAD_LOCKS[path]
+
+
+def _reset_thread_locks():
+    global _THREAD_LOCKS_GUARD
+    # A forked child only has the forking thread, any lock held by another
+    # thread at fork time would never be released in the child.
+    _THREAD_LOCKS.clear()
+    _THREAD_LOCKS_GUARD = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_thread_locks)
+
+
+def _owner_path(path):
+    return path + '.owner'
+
+
+def _write_owner(path):
+    now = time.time()
+    owner = {
+        'pid': os.getpid(),
+        'thread': threading.current_thread().name,
+        'acquired': now,
+        'lease_expires': now + _SETTINGS['lease'],
+    }
+    with open(_owner_path(path), 'w') as fd:
+        json.dump(owner, fd)
+
+
+def read_owner(path):
+    """Return the owner record of a held lock or ``None``."""
+    try:
+        with open(_owner_path(path), 'r') as fd:
+            return json.load(fd)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_owner(path):
+    try:
+        os.remove(_owner_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def _timeout_error(path, timeout):
+    owner = read_owner(path)
+    if owner is None:
+        return LockTimeout('Timed out after %ss waiting for %s' % (
+            timeout, path))
+    return LockTimeout(
+        'Timed out after %ss waiting for %s held by pid %s (%s) for %ds' % (
+            timeout, path, owner['pid'], owner['thread'],
+            time.time() - owner['acquired']))
+
+
+@contextlib.contextmanager
+def repo_lock(lock_dir, name, timeout=None):
+    """Exclusively lock a repository across threads and processes.
+
+    fasteners' InterProcessLock is built on POSIX record locks which are
+    owned by the process, so on its own it doesn't exclude other threads of
+    the same process. Take a process local lock first so worker threads are
+    serialized too. While the lock is held an owner record with the pid and
+    lease is kept next to it for :class:`Watchdog` and for error messages.
+
+    :raises LockTimeout: If the lock isn't acquired within ``timeout``
+        seconds, which defaults to the configured lock timeout.
+    """
+    if timeout is None:
+        timeout = _SETTINGS['timeout']
+    path = os.path.join(lock_dir, name)
+    start = time.monotonic()
+    thread_lock = _get_thread_lock(path)
+    if not thread_lock.acquire(timeout=-1 if timeout is None else timeout):
+        raise _timeout_error(path, timeout)
+    try:
+        process_lock = fasteners.InterProcessLock(path)
+        remaining = None
+        if timeout is not None:
+            remaining = max(0, timeout - (time.monotonic() - start))
+        if not process_lock.acquire(timeout=remaining):
+            raise _timeout_error(path, timeout)
+        try:
+            metrics.LOCK_WAIT.labels(name.strip()).observe(
+                time.monotonic() - start)
+            _write_owner(path)
+            yield
+        finally:
+            _remove_owner(path)
+            process_lock.release()
+    finally:
+        thread_lock.release()
+
+
+class Watchdog(object):
+    """Periodically check the owner records of the repository locks.
+
+    The kernel releases a POSIX record lock when its process exits, so a
+    lock held by a dead process is already free and only its owner record
+    is left behind; those records are removed. Holders which are alive but
+    past their lease are logged, the git command timeouts bound how long
+    they can keep the lock.
+    """
+
+    def __init__(self, lock_dir, interval=60):
+        self.lock_dir = lock_dir
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run,
+                                        name='lock-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                LOG.exception('Lock watchdog check failed')
+
+    def check(self):
+        """Check every lock once.
+
+        :returns: The number of stale owner records removed.
+        """
+        removed = 0
+        now = time.time()
+        for entry in os.listdir(self.lock_dir):
+            if not entry.endswith('.owner'):
+                continue
+            path = os.path.join(self.lock_dir, entry[:-len('.owner')])
+            owner = read_owner(path)
+            if owner is None:
+                continue
+            if not pid_alive(owner['pid']):
+                LOG.warning('Removing stale owner record of %s left by dead '
+                            'pid %s' % (path, owner['pid']))
+                _remove_owner(path)
+                removed += 1
+            elif owner['lease_expires'] < now:
+                LOG.warning('%s held by pid %s (%s) past its lease for %ds' % (
+                    path, owner['pid'], owner['thread'],
+                    now - owner['lease_expires']))
+        return removed
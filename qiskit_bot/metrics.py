@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Prometheus metrics exported by the bot.
+
+When the bot is run with several wsgi worker processes set the
+``PROMETHEUS_MULTIPROC_DIR`` environment variable to an empty directory
+before starting them, the ``/metrics`` endpoint will then aggregate the
+metrics from every worker.
+"""
+
+import os
+from urllib import parse
+
+import prometheus_client
+from prometheus_client import multiprocess
+
+HANDLER_LATENCY = prometheus_client.Histogram(
+    'qiskit_bot_webhook_handler_seconds',
+    'Time spent processing a webhook event',
+    ['event', 'action'])
+GIT_COMMAND_LATENCY = prometheus_client.Histogram(
+    'qiskit_bot_git_command_seconds',
+    'Time spent running git subprocesses',
+    ['command'])
+GITHUB_REQUESTS = prometheus_client.Counter(
+    'qiskit_bot_github_requests_total',
+    'Requests made to the GitHub API',
+    ['method', 'endpoint', 'status'])
+GITHUB_REQUEST_LATENCY = prometheus_client.Histogram(
+    'qiskit_bot_github_request_seconds',
+    'Latency of requests made to the GitHub API',
+    ['method', 'endpoint'])
+GITHUB_CACHE_REQUESTS = prometheus_client.Counter(
+    'qiskit_bot_github_cache_requests_total',
+    'Cacheable GitHub API requests by whether they were served from cache',
+    ['result'])
+LOCK_WAIT = prometheus_client.Histogram(
+    'qiskit_bot_lock_wait_seconds',
+    'Time spent waiting to acquire a repository lock',
+    ['repo'])
+EXECUTOR_QUEUE_DEPTH = prometheus_client.Gauge(
+    'qiskit_bot_executor_queue_depth',
+    'Background jobs submitted which have not finished',
+    multiprocess_mode='livesum')
+EVENT_QUEUE_DEPTH = prometheus_client.Gauge(
+    'qiskit_bot_event_queue_depth',
+    'Webhook events waiting to be processed',
+    multiprocess_mode='max')
+
+
+def github_endpoint(url):
+    """Normalize a GitHub API url into a low cardinality endpoint label.
+
+    For example ``/repos/Qiskit/qiskit/pulls/1234/files?page=2`` becomes
+    ``/repos/:owner/:repo/pulls/:number/files``.
+    """
+    pieces = parse.urlsplit(url).path.strip('/').split('/')
+    if pieces[0] == 'repos' and len(pieces) >= 3:
+        pieces[1:3] = [':owner', ':repo']
+    for index, piece in enumerate(pieces):
+        if piece.isdigit():
+            pieces[index] = ':number'
+        elif piece in ('refs', 'tags', 'branches', 'contents', 'commits'):
+            # Everything after these is a user provided name
+            if index + 1 < len(pieces):
+                pieces[index + 1:] = [':name']
+            break
+    return '/' + '/'.join(pieces)
+
+
+def generate_latest():
+    """Render the metrics for a scrape.
+
+    :returns: A tuple of the response body and its content type.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return (prometheus_client.generate_latest(registry),
+            prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Keep the local clones current from push events in the background."""
+
+import logging
+import threading
+
+from qiskit_bot import git
+from qiskit_bot import locks
+
+LOG = logging.getLogger(__name__)
+
+# The latest sha pushed to each (repo name, ref) seen by this process
+_LATEST = {}
+
+
+def is_mirrored(repo, ref, branches=()):
+    """Check if pushes to a ref should be fetched into the local clone.
+
+    Only the refs the bot reads are kept current: the default branch, the
+    stable branches and tags, and any extra ``branches`` by name.
+    """
+    if ref.startswith('refs/tags/'):
+        return True
+    if not ref.startswith('refs/heads/'):
+        return False
+    branch = ref[len('refs/heads/'):]
+    return branch.startswith('stable/') or branch in branches or \
+        branch == repo.repo_config.get('default_branch', 'master')
+
+
+def is_current(repo, ref):
+    """Check if the local copy of a ref is at the last sha pushed to it.
+
+    Only the pushes this process has handled are known. Another worker
+    process, or a push still waiting in the event queue, may have moved the
+    ref on GitHub since, so a ``True`` result can be stale. Only use this to
+    skip fetches where a slightly old ref is harmless, like immutable tags
+    or reading configuration, and always fetch refs new commits are built
+    on.
+
+    :returns: ``False`` if the ref is behind, or if no push for it has been
+        seen so its state is unknown.
+    """
+    sha = _LATEST.get((repo.repo_name, ref))
+    if sha is None:
+        return False
+    return git.resolve_ref(repo, git.tracking_ref(ref)) == sha
+
+
+class Refresher(object):
+    """Fetch pushed refs on a background thread.
+
+    Pushes are collected for ``delay`` seconds after the first one arrives
+    and then fetched with a single ``git fetch`` per repository, so a burst
+    of pushes costs one fetch. Refs which are already current are skipped,
+    and the local copies of refs deleted on GitHub are removed.
+    """
+
+    def __init__(self, lock_dir, delay=2.0):
+        self.lock_dir = lock_dir
+        self.delay = delay
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def schedule(self, repo, ref, sha):
+        """Update a ref to sha, or delete it if sha is ``None``."""
+        if sha is None:
+            _LATEST.pop((repo.repo_name, ref), None)
+        else:
+            _LATEST[(repo.repo_name, ref)] = sha
+        with self._cond:
+            self._pending.setdefault(repo.repo_name, (repo, {}))[1][ref] = sha
+            self._cond.notify()
+
+    def _requeue(self, repo, refs):
+        # Refs scheduled again in the meantime keep their newer sha
+        with self._cond:
+            pending = self._pending.setdefault(repo.repo_name, (repo, {}))[1]
+            for ref, sha in refs.items():
+                pending.setdefault(ref, sha)
+            self._cond.notify()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run,
+                                        name='mirror-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._pending and not self._stop.is_set():
+                    self._cond.wait()
+            # Let the rest of a burst of pushes arrive
+            if self._stop.wait(self.delay):
+                return
+            with self._cond:
+                pending, self._pending = self._pending, {}
+            for repo, refs in pending.values():
+                try:
+                    self.refresh(repo, refs)
+                except locks.LockTimeout as e:
+                    LOG.warning('Retrying the refresh of %s: %s' % (
+                        repo.repo_name, e))
+                    self._requeue(repo, refs)
+                except Exception:
+                    LOG.exception('Failed to refresh %s' % repo.repo_name)
+
+    def refresh(self, repo, refs):
+        stale = [ref for ref, sha in refs.items()
+                 if git.resolve_ref(repo, git.tracking_ref(ref)) != sha]
+        if not stale:
+            return
+        deleted = [ref for ref in stale if refs[ref] is None]
+        stale = [ref for ref in stale if refs[ref] is not None]
+        with locks.repo_lock(self.lock_dir, repo.name):
+            for ref in deleted:
+                git.delete_tracking_ref(repo, ref)
+            if stale:
+                git.fetch_refs(repo, stale)
@@ -14,13 +14,11 @@
 
 import io
 import logging
-import multiprocessing
-import os
 import re
 
-import fasteners
-
-from qiskit_bot import git
+from qiskit_bot import executor
+from qiskit_bot import mirror
+from qiskit_bot import pr_store
 
 LOG = logging.getLogger(__name__)
 
@@ -42,51 +40,57 @@ with io.StringIO() as buf:
     DEFAULT_PRELUDE = buf.getvalue()
 
 
+# This helper function must be a top-level function to be pickable for
+# a process based executor.
+def _process_notification(pr_number, repo, local_config):
+    notifications_config = local_config.get('notifications')
+    always_notify = local_config.get('always_notify')
+    notify_list = set()
+    if notifications_config:
+        notification_regex = {
+            re.compile(k): v for k, v in notifications_config.items()
+        }
+    else:
+        notification_regex = {}
+    pr = repo.gh_repo.get_pull(pr_number)
+    file_list = pr.get_files()
+    filenames = [file.filename for file in file_list]
+    for path_regex, user_list in notification_regex.items():
+        for file_name in filenames:
+            if path_regex.search(file_name):
+                for user in user_list:
+                    notify_list.add(user)
+    if notify_list or always_notify:
+        prelude = local_config.get("notification_prelude", DEFAULT_PRELUDE)
+        association = pr_store.get_author_association(
+            repo.repo_name, pr_number)
+        if association is None:
+            association = pr.raw_data["author_association"]
+            pr_store.set_author_association(
+                repo.repo_name, pr_number, association)
+        with io.StringIO() as buf:
+            # Team members don't get the prelude to make the message
+            # less chatty.
+            if association not in ("MEMBER", "OWNER"):
+                buf.write(prelude)
+            if notify_list:
+                buf.write(
+                    "\nOne or more of the following people are "
+                    "relevant to this code:\n"
+                )
+                for user in sorted(notify_list):
+                    buf.write("- %s\n" % user)
+            body = buf.getvalue()
+        pr.create_issue_comment(body)
+
+
 def trigger_notifications(pr_number, repo, conf):
     """Process any potential notifications on a new PR."""
-    working_dir = conf.get('working_dir')
-    lock_dir = os.path.join(working_dir, 'lock')
-
-    with fasteners.InterProcessLock(os.path.join(lock_dir, repo.name)):
-        git.checkout_default_branch(repo, pull=True)
-        local_config = repo.get_local_config()
+    default_branch = repo.repo_config.get('default_branch', 'master')
+    stale = not mirror.is_current(repo, 'refs/heads/%s' % default_branch)
+    local_config = repo.get_local_config(fetch=stale)
     notifications_config = local_config.get('notifications')
     always_notify = local_config.get('always_notify')
 
-    def _process_notification():
-        notify_list = set()
-        if notifications_config:
-            notification_regex = {
-                re.compile(k): v for k, v in notifications_config.items()
-            }
-        else:
-            notification_regex = {}
-        pr = repo.gh_repo.get_pull(pr_number)
-        file_list = pr.get_files()
-        filenames = [file.filename for file in file_list]
-        for path_regex, user_list in notification_regex.items():
-            for file_name in filenames:
-                if path_regex.search(file_name):
-                    for user in user_list:
-                        notify_list.add(user)
-        if notify_list or always_notify:
-            prelude = local_config.get("notification_prelude", DEFAULT_PRELUDE)
-            with io.StringIO() as buf:
-                # Team members don't get the prelude to make the message
-                # less chatty.
-                if pr.raw_data["author_association"] not in (
-                    "MEMBER", "OWNER"
-                ):
-                    buf.write(prelude)
-                if notify_list:
-                    buf.write(
-                        "\nOne or more of the following people are "
-                        "relevant to this code:\n"
-                    )
-                    for user in sorted(notify_list):
-                        buf.write("- %s\n" % user)
-                body = buf.getvalue()
-            pr.create_issue_comment(body)
-
     if notifications_config or always_notify:
-        multiprocessing.Process(target=_process_notification).start()
+        executor.submit(_process_notification, pr_number, repo, local_config)
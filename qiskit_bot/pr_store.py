@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Local store of pull request metadata kept up to date by webhooks."""
+
+import json
+import logging
+import os
+
+from qiskit_bot import db
+
+LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pulls (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    labels TEXT,
+    author_association TEXT,
+    merged INTEGER NOT NULL DEFAULT 0,
+    merge_commit_sha TEXT,
+    updated_at TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (repo, number)
+)
+"""
+
+# The changelog labels of merged pull requests, see changelog_index
+_CHANGELOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changelog_entries (
+    repo TEXT NOT NULL,
+    merge_sha TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    labels TEXT NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (repo, merge_sha)
+)
+"""
+
+STORE = None
+
+
+class PRStore(object):
+    """Pull request labels and author association keyed by repo and number.
+
+    Entries are written from ``pull_request`` webhook payloads and from any
+    API lookup which had to be made, and are only replaced by data with a
+    newer (or equal) ``updated_at`` so events processed out of order can't
+    roll an entry back.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        db.init(self.path, _SCHEMA, _CHANGELOG_SCHEMA)
+
+    def record_payload(self, repo_name, pr_data):
+        """Store the state of a pull request from a webhook payload.
+
+        The ``author_association`` in webhook payloads doesn't reflect private
+        organization membership so it isn't stored from here.
+        """
+        conn = db.connect(self.path)
+        try:
+            conn.execute(
+                'INSERT INTO pulls (repo, number, labels, merged, '
+                'merge_commit_sha, updated_at) VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (repo, number) DO UPDATE SET '
+                'labels = excluded.labels, merged = excluded.merged, '
+                'merge_commit_sha = excluded.merge_commit_sha, '
+                'updated_at = excluded.updated_at '
+                'WHERE excluded.updated_at >= pulls.updated_at',
+                (repo_name, pr_data['number'],
+                 json.dumps([x['name'] for x in pr_data['labels']]),
+                 int(bool(pr_data.get('merged'))),
+                 pr_data.get('merge_commit_sha'),
+                 pr_data.get('updated_at') or ''))
+        finally:
+            conn.close()
+
+    def set_labels(self, repo_name, pr_number, labels, updated_at):
+        conn = db.connect(self.path)
+        try:
+            conn.execute(
+                'INSERT INTO pulls (repo, number, labels, updated_at) '
+                'VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (repo, number) DO UPDATE SET '
+                'labels = excluded.labels, updated_at = excluded.updated_at '
+                'WHERE excluded.updated_at >= pulls.updated_at '
+                'OR pulls.labels IS NULL',
+                (repo_name, pr_number, json.dumps(labels), updated_at or ''))
+        finally:
+            conn.close()
+
+    def set_author_association(self, repo_name, pr_number, association):
+        conn = db.connect(self.path)
+        try:
+            conn.execute(
+                'INSERT INTO pulls (repo, number, author_association) '
+                'VALUES (?, ?, ?) '
+                'ON CONFLICT (repo, number) DO UPDATE SET '
+                'author_association = excluded.author_association',
+                (repo_name, pr_number, association))
+        finally:
+            conn.close()
+
+    def get_labels(self, repo_name, pr_numbers):
+        """Return a dict of the stored labels for the given pull requests."""
+        pr_numbers = list(pr_numbers)
+        labels = {}
+        conn = db.connect(self.path)
+        try:
+            # Stay well below sqlite's limit on query parameters
+            for i in range(0, len(pr_numbers), 500):
+                batch = pr_numbers[i:i + 500]
+                rows = conn.execute(
+                    'SELECT number, labels FROM pulls WHERE repo = ? AND '
+                    'labels IS NOT NULL AND number IN (%s)' % ','.join(
+                        '?' * len(batch)), [repo_name] + batch).fetchall()
+                labels.update((x[0], json.loads(x[1])) for x in rows)
+        finally:
+            conn.close()
+        return labels
+
+    def get_author_association(self, repo_name, pr_number):
+        conn = db.connect(self.path)
+        try:
+            row = conn.execute(
+                'SELECT author_association FROM pulls WHERE repo = ? AND '
+                'number = ?', (repo_name, pr_number)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def set_changelog_labels(self, repo_name, merge_sha, pr_number, labels,
+                             updated_at):
+        conn = db.connect(self.path)
+        try:
+            conn.execute(
+                'INSERT INTO changelog_entries (repo, merge_sha, number, '
+                'labels, updated_at) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (repo, merge_sha) DO UPDATE SET '
+                'number = excluded.number, labels = excluded.labels, '
+                'updated_at = excluded.updated_at '
+                'WHERE excluded.updated_at >= changelog_entries.updated_at',
+                (repo_name, merge_sha, pr_number, json.dumps(labels),
+                 updated_at or ''))
+        finally:
+            conn.close()
+
+    def get_changelog_labels(self, repo_name, merge_shas):
+        """Return a dict of merge sha to changelog labels for known shas."""
+        merge_shas = list(merge_shas)
+        entries = {}
+        conn = db.connect(self.path)
+        try:
+            for i in range(0, len(merge_shas), 500):
+                batch = merge_shas[i:i + 500]
+                rows = conn.execute(
+                    'SELECT merge_sha, labels FROM changelog_entries WHERE '
+                    'repo = ? AND merge_sha IN (%s)' % ','.join(
+                        '?' * len(batch)), [repo_name] + batch).fetchall()
+                entries.update((x[0], json.loads(x[1])) for x in rows)
+        finally:
+            conn.close()
+        return entries
+
+
+def configure(conf):
+    """Open the store in the bot's working directory."""
+    global STORE
+    STORE = PRStore(os.path.join(conf['working_dir'], 'pr_metadata.sqlite'))
+
+
+def get_store():
+    """Return the configured :class:`PRStore` or ``None``."""
+    return STORE
+
+
+def record_payload(repo_name, pr_data):
+    if STORE is not None:
+        STORE.record_payload(repo_name, pr_data)
+
+
+def get_author_association(repo_name, pr_number):
+    """Return the stored author association or ``None`` if it's unknown."""
+    if STORE is None:
+        return None
+    return STORE.get_author_association(repo_name, pr_number)
+
+
+def set_author_association(repo_name, pr_number, association):
+    if STORE is not None:
+        STORE.set_author_association(repo_name, pr_number, association)
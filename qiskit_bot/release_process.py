@@ -12,217 +12,271 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
+import collections
+from concurrent import futures
+import contextlib
+import functools
 import io
 import logging
-import multiprocessing
 import os
 import re
-import shutil
-from functools import partial
+import threading
 
-import fasteners
-from packaging.version import parse
 import github
+from packaging.version import parse
 
+from qiskit_bot import changelog
+from qiskit_bot import changelog_index
 from qiskit_bot import config
+from qiskit_bot import executor
 from qiskit_bot import git
+from qiskit_bot import labels
+from qiskit_bot import locks
+from qiskit_bot import mirror
+from qiskit_bot import release_state
+from qiskit_bot import tags
 
 LOG = logging.getLogger(__name__)
 
+META_BUMPS = None
+
+
+class ReleaseStepError(Exception):
+    """A release step failed and has to be run again."""
+
 
 def bump_meta(meta_repo, repo, version_number):
-    repo_config = repo.repo_config
-    git.checkout_default_branch(meta_repo, pull=True)
-    version_number_pieces = version_number.split('.')
-    meta_version = git.get_latest_tag(meta_repo).decode('utf8')
-    meta_version_pieces = meta_version.split('.')
-    if repo_config.get('optional_package'):
+    return bump_meta_releases(meta_repo, [(repo, version_number)])
+
+
+def _meta_repo_lock(lock_dir, meta_repo):
+    if lock_dir is None:
+        return contextlib.nullcontext()
+    return locks.repo_lock(lock_dir, meta_repo.name)
+
+
+def bump_meta_releases(meta_repo, releases, lock_dir=None):
+    """Pin several package releases in the meta repo with one commit.
+
+    :param releases: A list of ``(repo, version_number)`` tuples. Releases
+        of optional packages are skipped.
+    :param lock_dir: If set the meta repo lock is taken around each fetch
+        and around the update and push of ``bump_meta``, otherwise the
+        caller has to hold it.
+    """
+    releases = [(repo, version_number) for repo, version_number in releases
+                if not repo.repo_config.get('optional_package')]
+    if not releases:
         return None
-    if int(version_number_pieces[2]) == 0:
-        new_meta_version = '%s.%s.%s' % (meta_version_pieces[0],
-                                         int(meta_version_pieces[1]) + 1, 0)
-    else:
-        new_meta_version = '%s.%s.%s' % (meta_version_pieces[0],
-                                         meta_version_pieces[1],
-                                         int(meta_version_pieces[2]) + 1)
-    package_name = repo.repo_name.split('/')[1]
+    default_ref = 'refs/heads/%s' % meta_repo.repo_config.get(
+        'default_branch', 'master')
+    # The bump commit is built on these refs, so they're always fetched
+    # rather than trusting mirror.is_current()
+    with _meta_repo_lock(lock_dir, meta_repo):
+        git.fetch_refs(meta_repo, [default_ref], force=False)
+    meta_tags = tags.get_index(meta_repo)
+    meta_version = meta_tags.latest() if meta_tags is not None else None
+    if meta_version is None:
+        meta_version = git.get_latest_tag(meta_repo).decode('utf8')
+    meta_version_pieces = meta_version.split('.')
+    edits = {'setup.py': [], 'docs/conf.py': []}
+    requirements = []
+    for repo, version_number in releases:
+        version_number_pieces = version_number.split('.')
+        if int(version_number_pieces[2]) == 0:
+            new_meta_version = '%s.%s.%s' % (
+                meta_version_pieces[0], int(meta_version_pieces[1]) + 1, 0)
+        else:
+            new_meta_version = '%s.%s.%s' % (meta_version_pieces[0],
+                                             meta_version_pieces[1],
+                                             int(meta_version_pieces[2]) + 1)
+        package_name = repo.repo_name.split('/')[1]
+        requirements_str = package_name + '==' + version_number
+        requirements.append(requirements_str)
+        # Edits are applied in order, as if each release was bumped alone
+        edits['setup.py'].append(functools.partial(
+            _bump_setup_py, package_name, requirements_str, new_meta_version))
+        edits['docs/conf.py'].append(functools.partial(
+            _bump_docs_conf, new_meta_version))
     pulls = meta_repo.gh_repo.get_pulls(state='open')
-    setup_py_path = os.path.join(meta_repo.local_path, 'setup.py')
-    docs_conf_path = os.path.join(
-        os.path.join(meta_repo.local_path, 'docs'), 'conf.py')
     title = 'Bump Meta'
-    requirements_str = package_name + '==' + version_number
-    LOG.info("Processing meta repo bump for %s" % requirements_str)
+    LOG.info("Processing meta repo bump for %s" % ', '.join(requirements))
 
     bump_pr = None
     for pull in pulls:
         if pull.title == title:
             bump_pr = pull
-            git.checkout_ref(meta_repo, 'bump_meta')
-            git.pull_remote_ref_to_local(meta_repo, 'bump_meta')
+            base_ref = git.tracking_ref('refs/heads/bump_meta')
             break
     else:
-        branch_name = meta_repo.repo_config.get('default_branch', 'master')
-        git.create_branch('bump_meta', 'origin/%s' % branch_name, meta_repo)
-        git.checkout_ref(meta_repo, 'bump_meta')
-    # Update setup.py
-    buf = io.StringIO()
-    with open(setup_py_path, 'r') as fd:
-        for line in fd:
-            if package_name in line:
-                old_version = re.search(package_name + '==(.*)', line)[1]
-                out_line = line.replace(package_name + '==' + old_version,
-                                        requirements_str)
-                if not out_line.endswith('",\n') and out_line.endswith('\n'):
-                    buf.write(out_line.replace('\n', '",\n'))
-            elif 'version=' in line:
-                old_version = re.search('version=(.*)', line)[1]
-                old_version = old_version.strip('",')
-                old_version_pieces = old_version.split('.')
-                new_version_pieces = new_meta_version.split('.')
-                if old_version != new_meta_version and \
-                        old_version_pieces[1] <= new_version_pieces[1]:
-                    LOG.debug('Bumping meta version %s to %s' % (
-                              old_version, new_meta_version))
-                    out_line = line.replace('version="%s"' % old_version,
-                                            'version="%s"' % new_meta_version)
-                    buf.write(out_line)
-                else:
-                    LOG.debug('Not bumping meta version %s it is the same or '
-                              'less than %s' % (old_version, new_meta_version))
-                    buf.write(line)
-            else:
-                buf.write(line)
-
-    buf.seek(0)
-    with open(setup_py_path, 'w') as fd:
-        shutil.copyfileobj(buf, fd)
-    # Update docs/conf.py
-    buf = io.StringIO()
-    with open(docs_conf_path, 'r') as fd:
-        for line in fd:
-            if line.startswith('release = '):
-                old_version = re.search('release = "(.*)"', line)[1]
-                old_version = old_version.strip('",')
-                old_version_pieces = old_version.split('.')
-                new_version_pieces = new_meta_version.split('.')
-                if old_version != new_meta_version and \
-                        old_version_pieces[1] <= new_version_pieces[1]:
-                    out_line = line.replace(old_version, new_meta_version)
-                    buf.write(out_line)
-                else:
-                    buf.write(line)
-            else:
-                buf.write(line)
-    buf.seek(0)
-    with open(docs_conf_path, 'w') as fd:
-        shutil.copyfileobj(buf, fd)
+        base_ref = git.tracking_ref(default_ref)
+    # The commit is built from git objects, so neither bump_meta nor the
+    # default branch has to be checked out. The base is resolved under the
+    # lock and only read by sha1 after it's released.
+    with _meta_repo_lock(lock_dir, meta_repo):
+        if bump_pr:
+            git.fetch_refs(meta_repo, ['refs/heads/bump_meta'], force=False)
+        parent = git.resolve_ref(meta_repo, base_ref)
+    files = {}
+    for path, path_edits in edits.items():
+        blob_sha = git.get_blob_sha(meta_repo, parent, path)
+        if blob_sha is None:
+            LOG.warning('%s is missing from %s, not bumping it' % (
+                path, meta_repo.repo_name))
+            continue
+        contents = git.read_blob(meta_repo, blob_sha)
+        for edit in path_edits:
+            contents = edit(contents)
+        files[path] = git.hash_object(meta_repo, contents.encode('utf8'))
 
     body = """Bump the meta repo version to include:
 
 %s
 
-""" % requirements_str
+""" % '\n'.join(requirements)
 
-    commit_msg = 'Bump version for %s\n\n%s' % (requirements_str, body)
-    git.create_git_commit_for_all(meta_repo, commit_msg.encode('utf8'))
-    git.push_ref_to_github(meta_repo, 'bump_meta')
+    commit_msg = 'Bump version for %s\n\n%s' % (
+        ', '.join(requirements), body)
+    tree = git.write_tree(meta_repo, parent, files)
+    commit = git.commit_tree(meta_repo, tree, [parent],
+                             commit_msg.encode('utf8'))
+    with _meta_repo_lock(lock_dir, meta_repo):
+        pushed = git.update_ref(meta_repo, 'refs/heads/bump_meta',
+                                commit) and \
+            git.push_ref_to_github(meta_repo, 'bump_meta')
+        if not pushed:
+            raise ReleaseStepError('Failed to push bump_meta of %s' %
+                                   meta_repo.repo_name)
+        # git push doesn't move the tracking ref, the next bump has to build
+        # on this commit even if the push webhook wasn't processed yet
+        git.update_ref(meta_repo, 'refs/remotes/origin/bump_meta', commit)
     branch_name = meta_repo.repo_config.get('default_branch', 'master')
     if not bump_pr:
         meta_repo.gh_repo.create_pull(title, base=branch_name,
                                       head='bump_meta', body=body)
     else:
         old_body = bump_pr.body
-        new_body = old_body + '\n' + requirements_str
+        new_body = old_body + '\n' + '\n'.join(requirements)
         bump_pr.edit(body=new_body)
 
 
-def _generate_changelog(repo, log_string, categories, show_missing=False):
-    git.checkout_default_branch(repo, pull=True)
-    git_log = git.get_git_log(repo, log_string).decode('utf8')
-    if not git_log:
-        return ''
-    git_summaries = []
-    pr_regex = re.compile(r'^.*\((.*)\)')
-    for line in git_log.splitlines():
-        pieces = line.split(' ')
-        if 'tag:' in line:
-            summary = ' '.join(pieces[3:])
-            match = pr_regex.match(summary)
-            if match:
-                pr = match[1][1:]
+def _bump_setup_py(package_name, requirements_str, new_meta_version, text):
+    buf = io.StringIO()
+    for line in io.StringIO(text):
+        if package_name in line:
+            old_version = re.search(package_name + '==(.*)', line)[1]
+            out_line = line.replace(package_name + '==' + old_version,
+                                    requirements_str)
+            if not out_line.endswith('",\n') and out_line.endswith('\n'):
+                buf.write(out_line.replace('\n', '",\n'))
+        elif 'version=' in line:
+            old_version = re.search('version=(.*)', line)[1]
+            old_version = old_version.strip('",')
+            old_version_pieces = old_version.split('.')
+            new_version_pieces = new_meta_version.split('.')
+            if old_version != new_meta_version and \
+                    old_version_pieces[1] <= new_version_pieces[1]:
+                LOG.debug('Bumping meta version %s to %s' % (
+                          old_version, new_meta_version))
+                out_line = line.replace('version="%s"' % old_version,
+                                        'version="%s"' % new_meta_version)
+                buf.write(out_line)
             else:
-                continue
+                LOG.debug('Not bumping meta version %s it is the same or '
+                          'less than %s' % (old_version, new_meta_version))
+                buf.write(line)
         else:
-            summary = ' '.join(pieces[1:])
-            match = pr_regex.match(summary)
-            if match:
-                if match[1][1:]:
-                    pr = match[1][1:]
-                else:
-                    continue
+            buf.write(line)
+    return buf.getvalue()
+
+
+def _bump_docs_conf(new_meta_version, text):
+    buf = io.StringIO()
+    for line in io.StringIO(text):
+        if line.startswith('release = '):
+            old_version = re.search('release = "(.*)"', line)[1]
+            old_version = old_version.strip('",')
+            old_version_pieces = old_version.split('.')
+            new_version_pieces = new_meta_version.split('.')
+            if old_version != new_meta_version and \
+                    old_version_pieces[1] <= new_version_pieces[1]:
+                out_line = line.replace(old_version, new_meta_version)
+                buf.write(out_line)
             else:
-                continue
-        git_summaries.append((summary, pr))
-    changelog_dict = {x: [] for x in categories.keys()}
-    missing_list = []
-    for summary, pr in git_summaries:
-        try:
-            pr_number = int(pr)
-        except ValueError:
-            # Invalid PR number
-            continue
-        try:
-            labels = [x.name for x in repo.gh_repo.get_pull(pr_number).labels]
+                buf.write(line)
+        else:
+            buf.write(line)
+    return buf.getvalue()
+
+
+def _generate_changelog(repo, log_string, categories, show_missing=False,
+                        fmt='markdown'):
+    entries = []
+    empty = True
+    for commit in git.iter_log(repo, log_string):
+        empty = False
+        # Skip commits without a valid PR number in the summary
+        if commit.pr_number is not None:
+            entries.append((commit.sha, commit.subject, commit.pr_number))
+    if empty:
+        return ''
+    result = changelog.Changelog(categories)
+    # Pull requests indexed when they merged don't need a label lookup
+    indexed = changelog_index.lookup(repo, [x[0] for x in entries])
+    pr_labels = {}
+    unindexed = [x[2] for x in entries if x[0] not in indexed]
+    if unindexed:
+        pr_labels = labels.get_pr_labels(repo, unindexed)
+    for sha, summary, pr_number in entries:
+        if sha in indexed:
+            entry_labels = indexed[sha]
         # If we have an issue querying github for labels this is likely a
         # malformed commit summary line with an invalid PR number so just
         # skip this commit
-        except github.GithubException:
+        elif pr_number in pr_labels:
+            entry_labels = pr_labels[pr_number]
+        else:
             continue
         label_found = False
-        for label in labels:
-            if label in changelog_dict:
+        for label in entry_labels:
+            if label in categories:
                 if categories[label] is None:
                     label_found = True
                     break
-                changelog_dict[label].append(summary)
+                result.add(label, summary, pr_number)
                 label_found = True
         if not label_found:
             if show_missing:
-                missing_list.append(summary)
-    changelog = "# Changelog\n"
-    for label in changelog_dict:
-        if not changelog_dict[label]:
+                result.add_missing(summary, pr_number)
+    return result.render(fmt, show_missing)
+
+
+def _previous_major_from_git(version_obj, repo):
+    tags_str = git.get_tags(repo)
+    previous_major = version_obj.major - 1
+    for tag in tags_str.splitlines():
+        tag_version = parse(tag)
+        if tag_version.is_prerelease:
             continue
-        changelog += '## %s\n' % categories[label]
-        for pr in changelog_dict[label]:
-            entry = '-   %s\n' % pr
-            changelog += entry
-        changelog += ('\n')
-    if show_missing:
-        if missing_list:
-            changelog += ('\n')
-            changelog += '## Missing changelog entry\n'
-            for entry in missing_list:
-                changelog += '-   %s\n' % entry
-    return changelog
-
-
-def create_github_release(repo, log_string, version_number, categories,
-                          prerelease=False):
-    changelog = _generate_changelog(repo, log_string, categories)
-    release_name = repo.name + ' ' + version_number
-    repo.gh_repo.create_git_release(version_number, release_name, changelog,
-                                    prerelease=prerelease)
+        if tag_version.major == previous_major:
+            return tag
+    return None
 
 
 def _get_log_string(version_obj, version_number, repo):
+    # Lookups use the repo's tag index when it's loaded, and fall back to
+    # computing the previous version or scanning git tags otherwise.
+    index = tags.get_index(repo)
+    old_version = None
     # If a second prerelease show log from first
     if version_obj.is_prerelease and version_obj.pre[1] > 1:
-        old_version = (
-            f"{version_obj.base_version}{version_obj.pre[0]}"
-            f"{version_obj.pre[1] - 1}"
-        )
+        if index is not None:
+            old_version = index.previous_prerelease(version_obj)
+        if old_version is None:
+            old_version = (
+                f"{version_obj.base_version}{version_obj.pre[0]}"
+                f"{version_obj.pre[1] - 1}"
+            )
     # If a patch release log between 0.A.X..0.A.X-1
     elif version_obj.micro > 0:
         old_version = (
@@ -231,90 +285,289 @@ def _get_log_string(version_obj, version_number, repo):
         )
     # If a major version log between X.0.0..x-1.y.z
     elif version_obj.major >= 1 and version_obj.minor == 0:
-        tags = git.get_tags(repo)
-        previous_major = version_obj.major - 1
-        for tag in tags.splitlines():
-            tag_version = parse(tag)
-            if tag_version.is_prerelease:
-                continue
-            if tag_version.major == previous_major:
-                old_version = tag
-                break
+        if index is not None:
+            old_version = index.previous_major(version_obj)
+        if old_version is None:
+            old_version = _previous_major_from_git(version_obj, repo)
     # If a minor release log between Y.X.0..Y.X-1.0
     else:
-        old_version = f"{version_obj.major}.{version_obj.minor - 1}.0"
+        if index is not None:
+            old_version = index.previous_minor(version_obj)
+        if old_version is None:
+            old_version = f"{version_obj.major}.{version_obj.minor - 1}.0"
     return f"{version_number}...{old_version}"
 
 
-# This helper function must be a top-level function to be pickable for
-# `multiprocessing`.
-def _finish_release__changelog_process(
-    version_number, lock_dir, repo, version_obj, is_prerelease
-):
-    with fasteners.InterProcessLock(os.path.join(lock_dir, repo.name)):
-        git.checkout_default_branch(repo, pull=True)
-        log_string = _get_log_string(version_obj, version_number, repo)
-        categories = repo.get_local_config().get(
-            'categories', config.default_changelog_categories)
-        create_github_release(repo, log_string, version_number,
-                              categories, is_prerelease)
-        git.checkout_default_branch(repo, pull=True)
+def _release_refs(repo, version_number):
+    """Return the refs a release of ``version_number`` needs locally."""
+    default_branch = repo.repo_config.get('default_branch', 'master')
+    return ['refs/heads/%s' % default_branch, 'refs/tags/%s' % version_number]
 
 
-# This helper function must be a top-level function to be pickable for
-# `multiprocessing`.
-def _finish_release__meta_process(version_number, lock_dir, repo, meta_repo):
-    with fasteners.InterProcessLock(os.path.join(lock_dir,
-                                                 meta_repo.name)):
-        bump_meta(meta_repo, repo, version_number)
-        git.checkout_default_branch(meta_repo, pull=True)
+# The steps of a release and the steps each of them depends on. Steps are
+# idempotent, so a step interrupted by a restart can be run again.
+RELEASE_STEPS = collections.OrderedDict([
+    ('branch', ()),
+    ('changelog', ()),
+    ('publish', ('changelog',)),
+    ('meta', ()),
+])
 
 
-def finish_release(version_number, repo, conf, meta_repo):
-    """Do the post tag release processes."""
-    working_dir = conf.get('working_dir')
-    lock_dir = os.path.join(working_dir, 'lock')
-    repo_config = repo.repo_config
+def _fetch_release_refs(version_number, lock_dir, repo):
+    # Only updating refs needs the lock, everything after it reads git
+    # objects so release steps for the same repo can run side by side.
+    if not mirror.is_current(repo, 'refs/tags/%s' % version_number):
+        with locks.repo_lock(lock_dir, repo.name):
+            fetched = git.fetch_refs(repo, _release_refs(repo, version_number),
+                                     force=False)
+        if not fetched:
+            raise ReleaseStepError('Failed to fetch release %s of %s' % (
+                version_number, repo.repo_name))
+
+
+# The step functions must be top-level functions to be pickable for a
+# process based executor.
+def _release_step__branch(version_number, lock_dir, repo):
     version_obj = parse(version_number)
-    is_prerelease = version_obj.is_prerelease
-    is_postrelease = version_obj.is_postrelease
-    version_number_pieces = version_obj.base_version.split('.')
-    branch_number = '.'.join(version_number_pieces[:2])
-
-    with fasteners.InterProcessLock(os.path.join(lock_dir, repo.name)):
-        # Pull latest default_branch
-        git.checkout_default_branch(repo, pull=True)
-        if repo_config.get('branch_on_release'):
-            branch_name = 'stable/%s' % branch_number
-            repo_branches = [x.name for x in repo.gh_repo.get_branches()]
-            if int(version_number_pieces[2]) == 0 and \
-                    branch_name not in repo_branches:
-                if is_prerelease and version_obj.pre[0] != "rc":
-                    pass
-                else:
-                    git.checkout_default_branch(repo, pull=True)
-                    git.create_branch(branch_name, version_number, repo,
-                                      push=True)
-
-    if not is_postrelease:
-        _changelog_process = partial(
-            _finish_release__changelog_process,
-            version_number,
-            lock_dir,
-            repo,
-            version_obj,
-            is_prerelease,
-        )
-        multiprocessing.Process(target=_changelog_process).start()
+    branch_number = '.'.join(version_obj.base_version.split('.')[:2])
+    branch_name = 'stable/%s' % branch_number
+    _fetch_release_refs(version_number, lock_dir, repo)
+    repo_branches = [x.name for x in repo.gh_repo.get_branches()]
+    if branch_name in repo_branches:
+        return
+    with locks.repo_lock(lock_dir, repo.name):
+        if git.resolve_ref(repo, 'refs/heads/%s' % branch_name) is None:
+            pushed = git.create_branch(branch_name, version_number, repo,
+                                       push=True)
+        else:
+            # An earlier attempt created the branch but didn't push it
+            pushed = git.push_ref_to_github(
+                repo, 'refs/tags/%s^{commit}:refs/heads/%s' % (
+                    version_number, branch_name))
+    if not pushed:
+        raise ReleaseStepError('Failed to push %s of %s' % (
+            branch_name, repo.repo_name))
 
+
+def _release_step__changelog(version_number, lock_dir, repo):
+    _fetch_release_refs(version_number, lock_dir, repo)
+    log_string = _get_log_string(parse(version_number), version_number, repo)
+    categories = repo.get_local_config().get(
+        'categories', config.default_changelog_categories)
+    return _generate_changelog(repo, log_string, categories)
+
+
+def _release_step__publish(version_number, repo, body):
+    release_name = repo.name + ' ' + version_number
+    try:
+        repo.gh_repo.create_git_release(
+            version_number, release_name, body,
+            prerelease=parse(version_number).is_prerelease)
+    except github.GithubException as e:
+        # The release was created before the step was recorded as done
+        if e.status != 422:
+            raise
+        LOG.info('Release %s already exists, not creating it' %
+                 release_name)
+
+
+def meta_bump_lock_name(meta_repo):
+    return '%s bump_meta' % meta_repo.name.strip()
+
+
+def _finish_release__meta_process(lock_dir, meta_repo, releases):
+    # Bumps read and rewrite bump_meta and the pull request body, so they
+    # are serialized on their own lock. The meta repo lock is only taken
+    # for the ref updates, and isn't held across the GitHub API calls.
+    with locks.repo_lock(lock_dir, meta_bump_lock_name(meta_repo)):
+        bump_meta_releases(meta_repo, releases, lock_dir=lock_dir)
+
+
+def _chain_future(source, targets):
+    exc = source.exception()
+    for target in targets:
+        if exc is not None:
+            target.set_exception(exc)
+        else:
+            target.set_result(None)
+
+
+class MetaBumpAggregator(object):
+    """Coalesce the meta repo bumps of releases tagged close together.
+
+    The first release added starts a ``window`` second timer and every
+    release added before it fires is pinned by the same bump job, so a
+    release day costs one commit, push and pull request update. A newer
+    release of a package replaces its pending one.
+    """
+
+    def __init__(self, lock_dir, window):
+        self.lock_dir = lock_dir
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._meta_repo = None
+        self._timer = None
+
+    def add(self, meta_repo, repo, version_number):
+        """Pin a release in the next meta bump.
+
+        :returns: A :class:`concurrent.futures.Future` which is done once the
+            bump job pinning the release, or a newer one of the package, is.
+        """
+        future = futures.Future()
+        with self._lock:
+            self._meta_repo = meta_repo
+            waiters = [future]
+            if repo.repo_name in self._pending:
+                waiters += self._pending.pop(repo.repo_name)[2]
+            self._pending[repo.repo_name] = (repo, version_number, waiters)
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+
+    def flush(self):
+        """Submit the bump job for the pending releases now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending = list(self._pending.values())
+            self._pending.clear()
+            meta_repo = self._meta_repo
+        if not pending:
+            return
+        LOG.info('Bumping meta repo for %s releases' % len(pending))
+        releases = [(repo, version_number)
+                    for repo, version_number, _ in pending]
+        waiters = [waiter for _, _, step_waiters in pending
+                   for waiter in step_waiters]
+        try:
+            job = executor.submit(_finish_release__meta_process,
+                                  self.lock_dir, meta_repo, releases)
+        except Exception as e:
+            job = futures.Future()
+            job.set_exception(e)
+        job.add_done_callback(functools.partial(_chain_future,
+                                                targets=waiters))
+
+
+def configure(conf):
+    """Set up meta bump coalescing from ``meta_bump_window``.
+
+    With a window of 0 every release is bumped by its own job.
+    """
+    global META_BUMPS
+    window = conf.get('meta_bump_window', 30.0)
+    if window > 0:
+        META_BUMPS = MetaBumpAggregator(
+            os.path.join(conf['working_dir'], 'lock'), window)
+    else:
+        META_BUMPS = None
+
+
+def _release_steps(version_number, repo):
+    """Return the steps a release of ``version_number`` of repo needs."""
+    version_obj = parse(version_number)
+    steps = []
+    if repo.repo_config.get('branch_on_release') and \
+            int(version_obj.base_version.split('.')[2]) == 0 and \
+            (not version_obj.is_prerelease or version_obj.pre[0] == 'rc'):
+        steps.append('branch')
+    if not version_obj.is_postrelease:
+        steps += ['changelog', 'publish']
     # Only bump the metapackage for tracked/required packages optional extra
     # versions are not pinned and if not a pre-release
-    if not repo.repo_config.get('optional_package') and not is_prerelease:
-        _meta_process = partial(
-            _finish_release__meta_process,
-            version_number,
-            lock_dir,
-            repo,
-            meta_repo,
-        )
-        multiprocessing.Process(target=_meta_process).start()
+    if not repo.repo_config.get('optional_package') and \
+            not version_obj.is_prerelease:
+        steps.append('meta')
+    return steps
+
+
+def _start_step(step, version_number, lock_dir, repo, meta_repo, states):
+    if step == 'branch':
+        return executor.submit(_release_step__branch, version_number,
+                               lock_dir, repo)
+    if step == 'changelog':
+        return executor.submit(_release_step__changelog, version_number,
+                               lock_dir, repo)
+    if step == 'publish':
+        return executor.submit(_release_step__publish, version_number, repo,
+                               states['changelog'][1])
+    if META_BUMPS is not None:
+        return META_BUMPS.add(meta_repo, repo, version_number)
+    return executor.submit(_finish_release__meta_process, lock_dir,
+                           meta_repo, [(repo, version_number)])
+
+
+def _step_done(store, version_number, lock_dir, repo, meta_repo, step,
+               future):
+    exc = future.exception()
+    if exc is not None:
+        LOG.warning('Release step %s of %s %s failed: %s' % (
+            step, repo.repo_name, version_number, exc))
+        store.fail(repo.repo_name, version_number, step, repr(exc))
+        return
+    store.complete(repo.repo_name, version_number, step, future.result())
+    _run_release(store, version_number, lock_dir, repo, meta_repo)
+
+
+def _run_release(store, version_number, lock_dir, repo, meta_repo):
+    """Start the pending steps of a release whose dependencies are done."""
+    states = store.get(repo.repo_name, version_number)
+    for step, depends_on in RELEASE_STEPS.items():
+        if states.get(step, ('done',))[0] != 'pending':
+            continue
+        # Steps the release doesn't need count as done
+        if any(states.get(dep, ('done',))[0] != 'done'
+               for dep in depends_on):
+            continue
+        if not store.claim(repo.repo_name, version_number, step):
+            continue
+        try:
+            future = _start_step(step, version_number, lock_dir, repo,
+                                 meta_repo, states)
+        except Exception as e:
+            future = futures.Future()
+            future.set_exception(e)
+        future.add_done_callback(functools.partial(
+            _step_done, store, version_number, lock_dir, repo, meta_repo,
+            step))
+
+
+def finish_release(version_number, repo, conf, meta_repo):
+    """Do the post tag release processes.
+
+    The release steps are recorded in the working dir and run on the job
+    pool as soon as the steps they depend on are done.
+    """
+    working_dir = conf.get('working_dir')
+    lock_dir = os.path.join(working_dir, 'lock')
+    store = release_state.get_store(working_dir)
+    store.create(repo.repo_name, version_number,
+                 _release_steps(version_number, repo))
+    _run_release(store, version_number, lock_dir, repo, meta_repo)
+
+
+def resume(conf, repos, meta_repo):
+    """Restart the unfinished release steps left by an earlier process.
+
+    :param dict repos: The configured repos by name.
+    """
+    working_dir = conf['working_dir']
+    lock_dir = os.path.join(working_dir, 'lock')
+    store = release_state.get_store(working_dir)
+    store.recover()
+    for repo_name, version_number in store.incomplete():
+        repo = repos.get(repo_name)
+        if repo is None:
+            LOG.warning('Not resuming release %s of %s, it is not a '
+                        'configured repository' % (version_number,
+                                                   repo_name))
+            continue
+        LOG.info('Resuming release %s of %s' % (version_number, repo_name))
+        store.retry(repo_name, version_number)
+        _run_release(store, version_number, lock_dir, repo, meta_repo)
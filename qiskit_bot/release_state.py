@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Persistent progress of the steps of each release."""
+
+import logging
+import os
+import threading
+import time
+
+from qiskit_bot import db
+from qiskit_bot import locks
+
+LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS release_steps (
+    repo TEXT NOT NULL,
+    version TEXT NOT NULL,
+    step TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner_pid INTEGER,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (repo, version, step)
+)
+"""
+
+_STORES = {}
+_STORES_GUARD = threading.Lock()
+
+
+class ReleaseStore(object):
+    """The state of every step of every release, keyed by repo and version.
+
+    A step is ``pending`` until it's claimed, ``running`` while a job is
+    working on it and then ``done`` with its result or ``failed`` with the
+    error. Steps which were running in a process that no longer exists are
+    made pending again by :meth:`recover`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        db.init(self.path, _SCHEMA)
+
+    def create(self, repo_name, version_number, steps):
+        """Add the steps of a release, keeping the state of known steps.
+
+        Failed steps of a release which is triggered again are retried.
+        """
+        now = time.time()
+        conn = db.connect(self.path)
+        try:
+            conn.executemany(
+                'INSERT OR IGNORE INTO release_steps '
+                '(repo, version, step, updated_at) VALUES (?, ?, ?, ?)',
+                [(repo_name, version_number, step, now) for step in steps])
+        finally:
+            conn.close()
+        self.retry(repo_name, version_number)
+
+    def retry(self, repo_name, version_number):
+        """Make the failed steps of a release pending again."""
+        conn = db.connect(self.path)
+        try:
+            conn.execute(
+                "UPDATE release_steps SET state = 'pending', error = NULL, "
+                "updated_at = ? WHERE repo = ? AND version = ? "
+                "AND state = 'failed'",
+                (time.time(), repo_name, version_number))
+        finally:
+            conn.close()
+
+    def claim(self, repo_name, version_number, step):
+        """Mark a pending step as running.
+
+        :returns: ``False`` if the step isn't pending, e.g. because another
+            caller claimed it first.
+        """
+        conn = db.connect(self.path)
+        try:
+            cur = conn.execute(
+                "UPDATE release_steps SET state = 'running', owner_pid = ?, "
+                "updated_at = ? WHERE repo = ? AND version = ? AND step = ? "
+                "AND state = 'pending'",
+                (os.getpid(), time.time(), repo_name, version_number, step))
+            return cur.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, repo_name, version_number, step, result=None):
+        self._finish(repo_name, version_number, step, 'done', result, None)
+
+    def fail(self, repo_name, version_number, step, error):
+        self._finish(repo_name, version_number, step, 'failed', None, error)
+
+    def _finish(self, repo_name, version_number, step, state, result, error):
+        conn = db.connect(self.path)
+        try:
+            conn.execute(
+                'UPDATE release_steps SET state = ?, result = ?, error = ?, '
+                'owner_pid = NULL, updated_at = ? WHERE repo = ? '
+                'AND version = ? AND step = ?',
+                (state, result, error, time.time(), repo_name,
+                 version_number, step))
+        finally:
+            conn.close()
+
+    def get(self, repo_name, version_number):
+        """Return a dict of step name to ``(state, result)`` for a release."""
+        conn = db.connect(self.path)
+        try:
+            rows = conn.execute(
+                'SELECT step, state, result FROM release_steps '
+                'WHERE repo = ? AND version = ?',
+                (repo_name, version_number)).fetchall()
+        finally:
+            conn.close()
+        return {step: (state, result) for step, state, result in rows}
+
+    def incomplete(self):
+        """Return the ``(repo, version)`` of releases with unfinished steps."""
+        conn = db.connect(self.path)
+        try:
+            return conn.execute(
+                "SELECT DISTINCT repo, version FROM release_steps "
+                "WHERE state != 'done' ORDER BY repo, version").fetchall()
+        finally:
+            conn.close()
+
+    def recover(self):
+        """Make the steps claimed by a process which no longer exists pending.
+
+        This runs on startup, before this process starts any step, so steps
+        owned by its own pid were left behind by an earlier process.
+        """
+        recovered = 0
+        with db.transaction(self.path) as conn:
+            rows = conn.execute(
+                "SELECT repo, version, step, owner_pid FROM release_steps "
+                "WHERE state = 'running'").fetchall()
+            for repo_name, version_number, step, owner_pid in rows:
+                if owner_pid is not None and owner_pid != os.getpid() and \
+                        locks.pid_alive(owner_pid):
+                    continue
+                conn.execute(
+                    "UPDATE release_steps SET state = 'pending', "
+                    "owner_pid = NULL WHERE repo = ? AND version = ? "
+                    "AND step = ?", (repo_name, version_number, step))
+                recovered += 1
+        if recovered:
+            LOG.warning('Requeued %s interrupted release steps from %s' % (
+                recovered, self.path))
+        return recovered
+
+
+def get_store(working_dir):
+    """Return the :class:`ReleaseStore` of a working directory."""
+    path = os.path.join(working_dir, 'releases.sqlite')
+    with _STORES_GUARD:
+        store = _STORES.get(path)
+        if store is None:
+            store = ReleaseStore(path)
+            _STORES[path] = store
+        return store
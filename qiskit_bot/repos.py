@@ -12,19 +12,31 @@
 
 import logging
 import os
-import subprocess
-
-from github import Github
 
 from qiskit_bot import config
+from qiskit_bot import git
+from qiskit_bot import github_client
+from qiskit_bot import locks
 
 LOG = logging.getLogger(__name__)
 
+# Extra git clone arguments for each clone_strategy. Partial clones fetch
+# missing objects from GitHub on demand, and shallow clones are deepened by
+# the git module when a command needs more history. Shallow clones also
+# fetch every tag on startup.
+CLONE_ARGS = {
+    'full': [],
+    'blobless': ['--filter=blob:none'],
+    'treeless': ['--filter=tree:0'],
+    'shallow': ['--depth=1'],
+}
+
 
 class Repo(object):
 
     def __init__(self, working_dir, repo_name, access_token, repo_config=None):
         self.local_path = os.path.join(working_dir, repo_name)
+        self.lock_dir = os.path.join(working_dir, 'lock')
         self.repo_name = repo_name
         self.name = self._get_name()
         self.gh_repo = self._get_gh_repo(access_token)
@@ -38,8 +50,15 @@ class Repo(object):
         else:
             LOG.info('Local repo clone at %s already exists, not creating' %
                      self.local_path)
+        if self.repo_config.get('sparse_paths'):
+            git.sparse_checkout(self, self.repo_config['sparse_paths'])
+        if git.is_shallow(self):
+            # Tag lookups need every release tag, not only the cloned ones
+            git.fetch_tags(self)
         self.ssh_remote = 'github'
-        self.local_config = self.get_local_config()
+        # Repos are created with the repo lock held
+        self.local_config = config.load_repo_config_from_git(
+            self, self._resolve_default_branch())
 
     def _get_name(self):
         repo = self.repo_name.split('/')[1]
@@ -55,30 +74,47 @@ class Repo(object):
     def _create_repo(self):
         LOG.info('Creating local clone of %s at %s' % (self.repo_name,
                                                        self.local_path))
-        res = subprocess.run(['git', 'clone',
-                              'https://github.com/%s' % self.repo_name,
-                              self.local_path],
-                             check=True,
-                             capture_output=True)
-        LOG.debug('git clone https://github.com/%s '
-                  '%s\nstdout:\n%s\nstderr:\n%s' % (self.repo_name,
+        strategy = self.repo_config.get('clone_strategy', 'full')
+        args = list(CLONE_ARGS[strategy])
+        if self.repo_config.get('sparse_paths'):
+            # Only check out the top level files until the paths are set
+            args.append('--sparse')
+        res = git.clone('https://github.com/%s' % self.repo_name,
+                        self.local_path, args)
+        LOG.debug('git clone (%s) https://github.com/%s '
+                  '%s\nstdout:\n%s\nstderr:\n%s' % (strategy,
+                                                    self.repo_name,
                                                     self.local_path,
                                                     res.stdout, res.stderr))
 
     def _create_ssh_remote(self):
         LOG.info('Creating ssh remote for %s' % self.repo_name)
-        res = subprocess.run(['git', 'remote', 'add', 'github',
-                              'git@github.com:%s' % self.repo_name],
-                             cwd=self.local_path, capture_output=True,
-                             check=True)
+        res = git.add_remote(self.local_path, 'github',
+                             'git@github.com:%s' % self.repo_name)
         LOG.debug('git remote add github git@github.com/%s\n'
                   'stdout:\n%s\nstderr:\n%s' % (self.repo_name,
                                                 res.stdout, res.stderr))
 
     def _get_gh_repo(self, access_token):
-        gh_session = Github(access_token)
+        gh_session = github_client.get_client(access_token)
         repo = gh_session.get_repo(self.repo_name)
         return repo
 
-    def get_local_config(self):
-        return config.load_repo_config(self)
+    def get_local_config(self, fetch=False):
+        """Load qiskit_bot.yaml from the remote default branch.
+
+        The config is read from git objects so the worktree is neither
+        checked out nor pulled. If ``fetch`` is set the default branch is
+        fetched from GitHub first. The branch is fetched and resolved under
+        the repo lock, so this must not be called with the lock held.
+        """
+        with locks.repo_lock(self.lock_dir, self.name):
+            if fetch:
+                git.fetch_default_branch(self)
+            sha = self._resolve_default_branch()
+        return config.load_repo_config_from_git(self, sha)
+
+    def _resolve_default_branch(self):
+        default_branch = self.repo_config.get('default_branch', 'master')
+        return git.resolve_ref(
+            self, git.tracking_ref('refs/heads/%s' % default_branch))
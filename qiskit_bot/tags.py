@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Version sorted index of each repository's release tags."""
+
+import bisect
+import logging
+import threading
+
+from packaging.version import InvalidVersion
+from packaging.version import Version
+
+from qiskit_bot import git
+
+LOG = logging.getLogger(__name__)
+
+_INDEXES = {}
+_INDEXES_GUARD = threading.Lock()
+
+
+class TagIndex(object):
+    """Release tags of a repository kept sorted by version.
+
+    Tags which aren't valid versions are ignored. Lookups bisect the sorted
+    versions instead of scanning every tag.
+    """
+
+    def __init__(self, tags=()):
+        self._lock = threading.Lock()
+        self._versions = []
+        self._names = {}
+        for tag in tags:
+            self.add(tag)
+
+    def __len__(self):
+        return len(self._versions)
+
+    def add(self, tag):
+        try:
+            version = Version(tag)
+        except InvalidVersion:
+            return
+        with self._lock:
+            if version not in self._names:
+                self._names[version] = tag
+                bisect.insort(self._versions, version)
+
+    def remove(self, tag):
+        try:
+            version = Version(tag)
+        except InvalidVersion:
+            return
+        with self._lock:
+            # Another spelling of the version may be indexed instead
+            if self._names.get(version) == tag:
+                del self._names[version]
+                self._versions.remove(version)
+
+    def latest(self):
+        """Return the newest final release."""
+        with self._lock:
+            for version in reversed(self._versions):
+                if not version.is_prerelease:
+                    return self._names[version]
+        return None
+
+    def previous_major(self, version):
+        """Return the newest final release of the previous major version."""
+        with self._lock:
+            index = bisect.bisect_left(self._versions,
+                                       Version('%s.dev0' % version.major))
+            while index > 0:
+                index -= 1
+                tag_version = self._versions[index]
+                if tag_version.major < version.major - 1:
+                    break
+                if not tag_version.is_prerelease:
+                    return self._names[tag_version]
+        return None
+
+    def previous_minor(self, version):
+        """Return the first final release of the previous minor version."""
+        if version.minor == 0:
+            return None
+        release = (version.major, version.minor - 1)
+        with self._lock:
+            index = bisect.bisect_left(self._versions,
+                                       Version('%s.%s.dev0' % release))
+            while index < len(self._versions):
+                tag_version = self._versions[index]
+                if tag_version.release[:2] != release:
+                    break
+                if not tag_version.is_prerelease:
+                    return self._names[tag_version]
+                index += 1
+        return None
+
+    def previous_prerelease(self, version):
+        """Return the newest earlier prerelease of the same release."""
+        with self._lock:
+            index = bisect.bisect_left(self._versions, version)
+            if index > 0:
+                tag_version = self._versions[index - 1]
+                if tag_version.is_prerelease and \
+                        tag_version.release == version.release:
+                    return self._names[tag_version]
+        return None
+
+
+def load(repo):
+    """Build the index of a repository from its local tags."""
+    index = TagIndex(git.get_tags(repo).splitlines())
+    with _INDEXES_GUARD:
+        _INDEXES[repo.repo_name] = index
+    LOG.info('Indexed %s tags for %s' % (len(index), repo.repo_name))
+    return index
+
+
+def get_index(repo):
+    """Return the index of a repository or ``None`` if it isn't loaded."""
+    return _INDEXES.get(repo.repo_name)
+
+
+def add_tag(repo, tag):
+    index = get_index(repo)
+    if index is not None:
+        index.add(tag)
+
+
+def remove_tag(repo, tag):
+    index = get_index(repo)
+    if index is not None:
+        index.remove(tag)
+
+
+def clear():
+    with _INDEXES_GUARD:
+        _INDEXES.clear()
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import os
+
+import fixtures
+
+
+class TempDB(fixtures.Fixture):
+    """The path of a sqlite database in a temporary directory."""
+
+    def __init__(self, name):
+        super(TempDB, self).__init__()
+        self.name = name
+
+    def _setUp(self):
+        self.directory = self.useFixture(fixtures.TempDir()).path
+        self.path = os.path.join(self.directory, self.name)
+
+
+def pr_payload(number, pr_labels, updated_at, merged=True):
+    return {'number': number,
+            'labels': [{'name': x} for x in pr_labels],
+            'merged': merged,
+            'merge_commit_sha': 'sha%s' % number if merged else None,
+            'updated_at': updated_at}
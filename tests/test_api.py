@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import json
+import os
+import unittest
+
+import fixtures
+
+from qiskit_bot import api
+from qiskit_bot import deliveries
+from qiskit_bot import event_queue
+
+
+class TestWebhook(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = fixtures.TempDir()
+        self.useFixture(self.temp_dir)
+        self.queue = event_queue.EventQueue(
+            os.path.join(self.temp_dir.path, 'events.sqlite'))
+        self.deliveries = deliveries.DeliveryJournal(
+            os.path.join(self.temp_dir.path, 'deliveries.sqlite'))
+        self.handler = unittest.mock.MagicMock()
+        for patcher in [
+                unittest.mock.patch.object(api, 'setup'),
+                unittest.mock.patch.object(api, 'EVENT_QUEUE', self.queue),
+                unittest.mock.patch.object(api, 'DELIVERIES',
+                                           self.deliveries),
+                unittest.mock.patch.object(api.WEBHOOK, '_secret', None),
+                unittest.mock.patch.dict(api.WEBHOOK.handlers,
+                                         {'create': [self.handler]})]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = api.APP.test_client()
+
+    def post(self, event_type, payload, delivery_id):
+        headers = {'X-GitHub-Event': event_type,
+                   'X-GitHub-Delivery': delivery_id}
+        return self.client.post('/postreceive', data=json.dumps(payload),
+                                headers=headers,
+                                content_type='application/json')
+
+    def test_event_queued(self):
+        payload = {'ref': '0.1.0', 'ref_type': 'tag'}
+        res = self.post('create', payload, 'delivery-1')
+        self.assertEqual(202, res.status_code)
+        self.assertEqual(1, self.queue.depth())
+        event_id, event_type, data = self.queue.get()
+        self.assertEqual(('create', payload), (event_type, data))
+        # Hooks only run once a worker dispatches the event
+        self.handler.assert_not_called()
+        api._dispatch_event(event_type, data)
+        self.handler.assert_called_once_with(payload)
+
+    def test_event_without_hooks_not_queued(self):
+        res = self.post('watch', {'action': 'started'}, 'delivery-1')
+        self.assertEqual(202, res.status_code)
+        self.assertEqual(0, self.queue.depth())
+
+    def test_duplicate_delivery_not_queued(self):
+        payload = {'ref': '0.1.0', 'ref_type': 'tag'}
+        res = self.post('create', payload, 'delivery-1')
+        self.assertEqual(202, res.status_code)
+        res = self.post('create', payload, 'delivery-1')
+        self.assertEqual(202, res.status_code)
+        self.assertEqual(1, self.queue.depth())
+
+    def test_redelivery_of_failed_event(self):
+        self.queue.deliveries = self.deliveries
+        self.queue.max_attempts = 1
+        payload = {'ref': '0.1.0', 'ref_type': 'tag'}
+        self.post('create', payload, 'delivery-1')
+        self.assertFalse(self.queue.fail(self.queue.get()[0], 'error'))
+        self.assertEqual(0, self.queue.depth())
+        res = self.post('create', payload, 'delivery-1')
+        self.assertEqual(202, res.status_code)
+        self.assertEqual(1, self.queue.depth())
+
+
+class TestOnPush(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = unittest.mock.MagicMock()
+        self.repo.repo_name = 'Qiskit/qiskit-terra'
+        self.repo.repo_config = {'default_branch': 'main'}
+        self.refresher = unittest.mock.MagicMock()
+        for patcher in [
+                unittest.mock.patch.object(api, 'REFRESHER', self.refresher),
+                unittest.mock.patch.dict(api.REPOS,
+                                         {self.repo.repo_name: self.repo})]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def push(self, ref, after='sha1', deleted=False):
+        api.on_push({'repository': {'full_name': self.repo.repo_name},
+                     'ref': ref, 'after': after, 'deleted': deleted})
+
+    def test_default_branch_scheduled(self):
+        self.push('refs/heads/main')
+        self.refresher.schedule.assert_called_once_with(
+            self.repo, 'refs/heads/main', 'sha1')
+
+    def test_unread_branch_ignored(self):
+        self.push('refs/heads/gh-readonly-queue/main/pr-1-abc')
+        self.refresher.schedule.assert_not_called()
+
+    def test_deleted_branch(self):
+        self.push('refs/heads/stable/0.1', after='0' * 40, deleted=True)
+        self.refresher.schedule.assert_called_once_with(
+            self.repo, 'refs/heads/stable/0.1', None)
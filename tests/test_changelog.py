@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import json
+import unittest
+
+from qiskit_bot import changelog
+from qiskit_bot import config
+
+
+class TestChangelog(unittest.TestCase):
+
+    def setUp(self):
+        self.changelog = changelog.Changelog(
+            config.default_changelog_categories)
+        self.changelog.add('Changelog: Bugfix', 'Fix a bug (#1)', 1)
+        self.changelog.add('Changelog: New Feature', 'Add a thing (#2)', 2)
+        self.changelog.add('Changelog: New Feature',
+                           'Add another thing (#3)', 3)
+        self.changelog.add_missing('Fix a typo (#4)', 4)
+
+    def test_render_markdown(self):
+        expected = """# Changelog
+## Added
+-   Add a thing (#2)
+-   Add another thing (#3)
+
+## Fixed
+-   Fix a bug (#1)
+
+"""
+        self.assertEqual(expected, self.changelog.render())
+        expected += """
+## Missing changelog entry
+-   Fix a typo (#4)
+"""
+        self.assertEqual(expected,
+                         self.changelog.render('markdown', show_missing=True))
+
+    def test_render_json(self):
+        res = json.loads(self.changelog.render('json', show_missing=True))
+        self.assertEqual(
+            {'sections': [
+                {'label': 'Changelog: New Feature', 'title': 'Added',
+                 'entries': [{'summary': 'Add a thing (#2)', 'pr_number': 2},
+                             {'summary': 'Add another thing (#3)',
+                              'pr_number': 3}]},
+                {'label': 'Changelog: Bugfix', 'title': 'Fixed',
+                 'entries': [{'summary': 'Fix a bug (#1)', 'pr_number': 1}]}],
+             'missing': [{'summary': 'Fix a typo (#4)', 'pr_number': 4}]},
+            res)
+        self.assertNotIn('missing', json.loads(self.changelog.render('json')))
+
+    def test_render_rst(self):
+        expected = """Changelog
+=========
+
+Added
+-----
+
+- Add a thing (#2)
+- Add another thing (#3)
+
+Fixed
+-----
+
+- Fix a bug (#1)
+
+Missing changelog entry
+-----------------------
+
+- Fix a typo (#4)
+
+"""
+        self.assertEqual(expected,
+                         self.changelog.render('rst', show_missing=True))
+
+    def test_render_rst_escapes_markup(self):
+        log = changelog.Changelog(config.default_changelog_categories)
+        log.add('Changelog: Bugfix', 'Fix *args handling in `foo_` (#12)', 12)
+        log.add_missing('Allow a|b and C:\\path (#13)', 13)
+        res = log.render('rst', show_missing=True)
+        self.assertIn('- Fix \\*args handling in \\`foo\\_\\` (#12)\n', res)
+        self.assertIn('- Allow a\\|b and C:\\\\path (#13)\n', res)
+        # Headings are never escaped
+        self.assertIn('Missing changelog entry\n', res)
+
+    def test_render_unknown_format(self):
+        self.assertRaises(ValueError, self.changelog.render, 'html')
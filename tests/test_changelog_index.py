@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import unittest
+
+import fixtures
+
+from qiskit_bot import changelog_index
+from qiskit_bot import config
+from qiskit_bot import pr_store
+
+from . import db_fixtures
+
+
+class TestChangelogIndex(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.store = pr_store.PRStore(self.useFixture(
+            db_fixtures.TempDB('pr_metadata.sqlite')).path)
+        patcher = unittest.mock.patch.object(pr_store, 'STORE', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.repo = unittest.mock.MagicMock()
+        self.repo.repo_name = 'Qiskit/qiskit-terra'
+        self.repo.get_local_config.return_value = {}
+
+    def test_classify(self):
+        categories = config.default_changelog_categories
+        self.assertEqual([], changelog_index.classify(['bug', 'docs'],
+                                                      categories))
+        self.assertEqual(
+            ['Changelog: Bugfix', 'Changelog: New Feature'],
+            changelog_index.classify(
+                ['Changelog: Bugfix', 'docs', 'Changelog: New Feature'],
+                categories))
+        self.assertEqual(
+            ['Changelog: None'],
+            changelog_index.classify(['Changelog: None', 'Changelog: Bugfix'],
+                                     categories))
+
+    def test_record_merged_pull(self):
+        changelog_index.record_pull(
+            self.repo, db_fixtures.pr_payload(1, ['Changelog: Bugfix', 'docs'],
+                                              '2026-01-01T00:00:00Z'))
+        self.assertEqual({'sha1': ['Changelog: Bugfix']},
+                         changelog_index.lookup(self.repo, ['sha1', 'sha2']))
+
+    def test_unmerged_pull_not_indexed(self):
+        changelog_index.record_pull(
+            self.repo, db_fixtures.pr_payload(1, ['Changelog: Bugfix'],
+                                              '2026-01-01T00:00:00Z',
+                                              merged=False))
+        self.assertEqual({}, changelog_index.lookup(self.repo, ['sha1']))
+
+    def test_relabel_after_merge(self):
+        changelog_index.record_pull(
+            self.repo, db_fixtures.pr_payload(1, ['Changelog: Bugfix'],
+                                              '2026-01-01T00:00:00Z'))
+        changelog_index.record_pull(
+            self.repo, db_fixtures.pr_payload(1, ['Changelog: New Feature'],
+                                              '2026-01-02T00:00:00Z'))
+        # An older event processed late doesn't win
+        changelog_index.record_pull(
+            self.repo, db_fixtures.pr_payload(1, [], '2026-01-01T12:00:00Z'))
+        self.assertEqual({'sha1': ['Changelog: New Feature']},
+                         changelog_index.lookup(self.repo, ['sha1']))
+
+    def test_repo_categories(self):
+        self.repo.get_local_config.return_value = {
+            'categories': {'new feature': 'Added'}}
+        changelog_index.record_pull(
+            self.repo, db_fixtures.pr_payload(
+                1, ['new feature', 'Changelog: Bugfix'],
+                '2026-01-01T00:00:00Z'))
+        self.assertEqual({'sha1': ['new feature']},
+                         changelog_index.lookup(self.repo, ['sha1']))
+
+    def test_no_store(self):
+        with unittest.mock.patch.object(pr_store, 'STORE', None):
+            changelog_index.record_pull(
+                self.repo, db_fixtures.pr_payload(1, ['Changelog: Bugfix'],
+                                                  '2026-01-01T00:00:00Z'))
+            self.assertEqual({}, changelog_index.lookup(self.repo, ['sha1']))
@@ -87,13 +87,18 @@ class TestConfig(unittest.TestCase):
 
 class TestLocalConfig(unittest.TestCase):
 
-    def test_load_config_empty(self):
-        mock_open = unittest.mock.mock_open(read_data='')
+    def _load_repo_config(self, config_text):
         repo = unittest.mock.MagicMock()
-        repo.local_path = '/tmp/fake'
-        with unittest.mock.patch('qiskit_bot.config.open', mock_open):
-            with unittest.mock.patch('os.path.isfile', return_value=True):
-                result = config.load_repo_config(repo)
+        with unittest.mock.patch.dict('qiskit_bot.config._REPO_CONFIG_CACHE',
+                                      clear=True), \
+                unittest.mock.patch('qiskit_bot.git.get_blob_sha',
+                                    return_value='abc'), \
+                unittest.mock.patch('qiskit_bot.git.read_blob',
+                                    return_value=config_text):
+            return config.load_repo_config_from_git(repo, 'origin/main')
+
+    def test_load_config_empty(self):
+        result = self._load_repo_config('')
         expected = {}
         self.assertEqual(result, expected)
 
@@ -107,12 +112,7 @@ class TestLocalConfig(unittest.TestCase):
                 - "@user3"
                 - "@user2"
         """
-        mock_open = unittest.mock.mock_open(read_data=config_text)
-        repo = unittest.mock.MagicMock()
-        repo.local_path = '/tmp/fake'
-        with unittest.mock.patch('qiskit_bot.config.open', mock_open):
-            with unittest.mock.patch('os.path.isfile', return_value=True):
-                result = config.load_repo_config(repo)
+        result = self._load_repo_config(config_text)
         expected = {
             'notifications': {
                 'path_1': ['@user1', '@user2'],
@@ -138,12 +138,7 @@ class TestLocalConfig(unittest.TestCase):
 
             I include whitespace:
         """
-        mock_open = unittest.mock.mock_open(read_data=config_text)
-        repo = unittest.mock.MagicMock()
-        repo.local_path = '/tmp/fake'
-        with unittest.mock.patch('qiskit_bot.config.open', mock_open):
-            with unittest.mock.patch('os.path.isfile', return_value=True):
-                result = config.load_repo_config(repo)
+        result = self._load_repo_config(config_text)
         expected = {
             'categories': {
                 'Changelog: Custom': 'Special category',
@@ -159,16 +154,32 @@ class TestLocalConfig(unittest.TestCase):
         }
         self.assertEqual(result, expected)
 
-    def test_invalid_file(self):
+    @unittest.mock.patch.dict('qiskit_bot.config._REPO_CONFIG_CACHE',
+                              clear=True)
+    @unittest.mock.patch('qiskit_bot.git.read_blob',
+                         return_value='always_notify: true\n')
+    @unittest.mock.patch('qiskit_bot.git.get_blob_sha', return_value='abc')
+    def test_load_config_from_git_cached(self, blob_sha_mock, read_mock):
+        repo = unittest.mock.MagicMock()
+        for _ in range(2):
+            result = config.load_repo_config_from_git(repo, 'origin/main')
+            self.assertEqual({'always_notify': True}, result)
+        blob_sha_mock.assert_called_with(repo, 'origin/main',
+                                         'qiskit_bot.yaml')
+        self.assertEqual(2, blob_sha_mock.call_count)
+        read_mock.assert_called_once_with(repo, 'abc')
+
+    @unittest.mock.patch('qiskit_bot.git.read_blob')
+    @unittest.mock.patch('qiskit_bot.git.get_blob_sha', return_value=None)
+    def test_load_config_from_git_no_file(self, blob_sha_mock, read_mock):
         repo = unittest.mock.MagicMock()
-        repo.local_path = '/tmp/fake'
-        with unittest.mock.patch('os.path.isfile', return_value=False):
-            result = config.load_repo_config(repo)
+        result = config.load_repo_config_from_git(repo, 'origin/main')
         expected = {
             'categories': config.default_changelog_categories,
             'notifications': {},
         }
         self.assertEqual(result, expected)
+        read_mock.assert_not_called()
 
     def test_readme_example(self):
         config_text = """---
@@ -192,12 +203,7 @@ class TestLocalConfig(unittest.TestCase):
             I include whitespace:
 
         """
-        mock_open = unittest.mock.mock_open(read_data=config_text)
-        repo = unittest.mock.MagicMock()
-        repo.local_path = '/tmp/fake'
-        with unittest.mock.patch('qiskit_bot.config.open', mock_open):
-            with unittest.mock.patch('os.path.isfile', return_value=True):
-                result = config.load_repo_config(repo)
+        result = self._load_repo_config(config_text)
         expected = {
             'categories': {
                 'Changelog: Custom': 'Special category',
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import unittest
+
+import fixtures
+
+from qiskit_bot import deliveries
+
+from . import db_fixtures
+
+
+class TestDeliveryJournal(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.path = self.useFixture(
+            db_fixtures.TempDB('deliveries.sqlite')).path
+
+    def test_duplicate_delivery(self):
+        journal = deliveries.DeliveryJournal(self.path)
+        self.assertTrue(journal.record('guid-1'))
+        self.assertFalse(journal.record('guid-1'))
+        self.assertTrue(journal.record('guid-2'))
+
+    def test_duplicate_across_instances(self):
+        deliveries.DeliveryJournal(self.path).record('guid-1')
+        journal = deliveries.DeliveryJournal(self.path)
+        self.assertFalse(journal.record('guid-1'))
+
+    def test_bounded(self):
+        journal = deliveries.DeliveryJournal(self.path, max_size=2)
+        for guid in ('guid-1', 'guid-2', 'guid-3'):
+            self.assertTrue(journal.record(guid))
+        self.assertEqual(2, len(journal._recent))
+        # The oldest delivery is evicted from memory and disk
+        self.assertTrue(
+            deliveries.DeliveryJournal(self.path).record('guid-1'))
+
+    def test_discard(self):
+        journal = deliveries.DeliveryJournal(self.path)
+        journal.record('guid-1')
+        journal.discard('guid-1')
+        self.assertTrue(journal.record('guid-1'))
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import threading
+import time
+import unittest
+
+import fixtures
+
+from qiskit_bot import db
+from qiskit_bot import deliveries
+from qiskit_bot import event_queue
+
+from . import db_fixtures
+
+
+class TestEventQueue(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.queue = event_queue.EventQueue(self.useFixture(
+            db_fixtures.TempDB('events.sqlite')).path)
+
+    def test_fifo_order(self):
+        self.queue.put('create', {'ref': '0.1.0'})
+        self.queue.put('pull_request', {'action': 'opened'})
+        self.assertEqual(2, self.queue.depth())
+        first = self.queue.get()
+        second = self.queue.get()
+        self.assertEqual(('create', {'ref': '0.1.0'}), first[1:])
+        self.assertEqual(('pull_request', {'action': 'opened'}), second[1:])
+        self.assertIsNone(self.queue.get())
+        self.assertEqual(0, self.queue.depth())
+
+    def test_events_persist(self):
+        self.queue.put('create', {'ref': '0.1.0'})
+        new_queue = event_queue.EventQueue(self.queue.path)
+        self.assertEqual('create', new_queue.get()[1])
+
+    def test_complete_removes_event(self):
+        self.queue.put('create', {'ref': '0.1.0'})
+        event_id = self.queue.get()[0]
+        self.queue.complete(event_id)
+        self.assertEqual(0, self.queue.recover())
+        self.assertIsNone(self.queue.get())
+
+    def test_recover_dead_owner(self):
+        self.queue.put('create', {'ref': '0.1.0'})
+        self.queue.get()
+        with unittest.mock.patch('qiskit_bot.locks.pid_alive',
+                                 return_value=False):
+            self.assertEqual(1, self.queue.recover())
+        self.assertEqual(('create', {'ref': '0.1.0'}), self.queue.get()[1:])
+
+    @unittest.mock.patch('qiskit_bot.locks.pid_alive', return_value=True)
+    def test_recover_own_pid(self, pid_alive_mock):
+        self.queue.put('create', {'ref': '0.1.0'})
+        self.queue.get()
+        # Events owned by this pid are left over from an earlier process
+        self.assertEqual(1, self.queue.recover())
+        self.assertEqual(('create', {'ref': '0.1.0'}), self.queue.get()[1:])
+
+    @unittest.mock.patch('qiskit_bot.locks.pid_alive', return_value=True)
+    @unittest.mock.patch('os.getpid', return_value=1)
+    def test_recover_skips_live_owner(self, getpid_mock, pid_alive_mock):
+        self.queue.put('create', {'ref': '0.1.0'})
+        self.queue.get()
+        getpid_mock.return_value = 2
+        self.assertEqual(0, self.queue.recover())
+        self.assertIsNone(self.queue.get())
+
+    def test_workers_dispatch(self):
+        processed = []
+        done = threading.Event()
+
+        def dispatch(event_type, payload):
+            if payload['fail']:
+                raise ValueError('Fake failure')
+            processed.append(event_type)
+            done.set()
+
+        self.queue.max_attempts = 1
+        workers = event_queue.EventWorkers(self.queue, dispatch, count=2)
+        workers.start()
+        self.addCleanup(workers.stop, 5)
+        self.queue.put('push', {'fail': True})
+        self.queue.put('create', {'fail': False})
+        self.assertTrue(done.wait(5))
+        workers.stop(5)
+        self.assertEqual(['create'], processed)
+        self.assertEqual(0, self.queue.depth())
+        self.assertEqual(0, self.queue.recover())
+
+    @unittest.mock.patch.object(event_queue, 'RETRY_DELAY', 60)
+    def test_fail_retries(self):
+        self.queue.put('create', {'ref': '0.1.0'})
+        event_id = self.queue.get()[0]
+        self.assertTrue(self.queue.fail(event_id, 'error'))
+        self.assertEqual(1, self.queue.depth())
+        # The retry waits for the delay
+        self.assertIsNone(self.queue.get())
+        with unittest.mock.patch('time.time', return_value=time.time() + 61):
+            self.assertEqual(event_id, self.queue.get()[0])
+
+    @unittest.mock.patch.object(event_queue, 'RETRY_DELAY', 0)
+    def test_fail_gives_up(self):
+        journal = deliveries.DeliveryJournal(
+            self.useFixture(db_fixtures.TempDB('deliveries.sqlite')).path)
+        queue = event_queue.EventQueue(self.queue.path, deliveries=journal,
+                                       max_attempts=2)
+        self.assertTrue(journal.record('delivery-1'))
+        queue.put('create', {'ref': '0.1.0'}, 'delivery-1')
+        self.assertTrue(queue.fail(queue.get()[0], 'error'))
+        self.assertFalse(journal.record('delivery-1'))
+        self.assertFalse(queue.fail(queue.get()[0], 'error'))
+        self.assertIsNone(queue.get())
+        self.assertEqual(0, queue.depth())
+        # A redelivery of the failed event isn't a duplicate
+        self.assertTrue(journal.record('delivery-1'))
+
+    def test_add_columns(self):
+        path = self.useFixture(db_fixtures.TempDB('old.sqlite')).path
+        db.init(path, """
+CREATE TABLE events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner_pid INTEGER,
+    received_at REAL NOT NULL,
+    error TEXT
+)
+""")
+        queue = event_queue.EventQueue(path)
+        queue.put('create', {'ref': '0.1.0'}, 'delivery-1')
+        self.assertEqual(('create', {'ref': '0.1.0'}), queue.get()[1:])
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import threading
+import time
+import unittest
+
+from qiskit_bot import executor
+
+
+def _fail():
+    raise ValueError('Fake failure')
+
+
+def _wait_for_idle(timeout=5):
+    # Done callbacks run just after the future's result is set
+    end = time.monotonic() + timeout
+    while executor.queue_depth() and time.monotonic() < end:
+        time.sleep(0.01)
+
+
+class TestExecutor(unittest.TestCase):
+
+    def setUp(self):
+        executor.configure({'executor': {'type': 'thread',
+                                         'max_workers': 1}})
+        self.addCleanup(executor.shutdown)
+
+    def test_submit(self):
+        future = executor.submit(sum, [1, 2, 3])
+        self.assertEqual(6, future.result(5))
+
+    def test_queue_depth(self):
+        release = threading.Event()
+        first = executor.submit(release.wait, 5)
+        second = executor.submit(release.wait, 5)
+        self.assertEqual(2, executor.queue_depth())
+        release.set()
+        first.result(5)
+        second.result(5)
+        _wait_for_idle()
+        self.assertEqual(0, executor.queue_depth())
+
+    def test_failure_recorded(self):
+        executor.FAILURES.clear()
+        future = executor.submit(_fail)
+        self.assertRaises(ValueError, future.result, 5)
+        _wait_for_idle()
+        self.assertEqual(1, len(executor.FAILURES))
+        self.assertEqual('_fail', executor.FAILURES[0][1])
+        self.assertEqual(0, executor.queue_depth())
@@ -12,22 +12,27 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
+import os
 import subprocess
+import time
 import unittest
 
+import fixtures
+
 from qiskit_bot import git
+from qiskit_bot import git_objects
 
 
 class TestGit(unittest.TestCase):
 
-    @unittest.mock.patch('subprocess.run',
+    @unittest.mock.patch('qiskit_bot.git._run',
                          side_effect=subprocess.CalledProcessError(2, 'git'))
     def test_create_branch_git_exception(self, subprocess_mock):
         repo = unittest.mock.MagicMock()
         res = git.create_branch('stable/0.9', 'sha1', repo)
         self.assertEqual(False, res)
 
-    @unittest.mock.patch('subprocess.run')
+    @unittest.mock.patch('qiskit_bot.git._run')
     def test_checkout_default_branch_no_config(self, subproc_mock):
         repo_config = {}
         repo = unittest.mock.MagicMock()
@@ -38,13 +43,17 @@ class TestGit(unittest.TestCase):
                                            capture_output=True, check=True,
                                            cwd='/tmp/fake_clone')
         self.assertEqual(subproc_mock.mock_calls[0], expected_call)
-        expected_pull_call = unittest.mock.call(['git', 'pull'],
-                                                capture_output=True,
-                                                check=True,
-                                                cwd='/tmp/fake_clone')
-        self.assertEqual(subproc_mock.mock_calls[-1], expected_pull_call)
+        expected_fetch_call = unittest.mock.call(
+            ['git', 'fetch', 'origin',
+             'refs/heads/master:refs/remotes/origin/master'],
+            capture_output=True, check=True, cwd='/tmp/fake_clone')
+        self.assertIn(expected_fetch_call, subproc_mock.mock_calls)
+        expected_merge_call = unittest.mock.call(
+            ['git', 'merge', '--ff-only', 'origin/master'],
+            capture_output=True, check=True, cwd='/tmp/fake_clone')
+        self.assertEqual(subproc_mock.mock_calls[-1], expected_merge_call)
 
-    @unittest.mock.patch('subprocess.run')
+    @unittest.mock.patch('qiskit_bot.git._run')
     def test_checkout_default_branch_config(self, subproc_mock):
         repo_config = {'default_branch': 'main'}
         repo = unittest.mock.MagicMock()
@@ -55,8 +64,302 @@ class TestGit(unittest.TestCase):
                                            capture_output=True, check=True,
                                            cwd='/tmp/fake_clone')
         self.assertEqual(subproc_mock.mock_calls[0], expected_call)
-        expected_pull_call = unittest.mock.call(['git', 'pull'],
-                                                capture_output=True,
-                                                check=True,
-                                                cwd='/tmp/fake_clone')
-        self.assertEqual(subproc_mock.mock_calls[-1], expected_pull_call)
+        expected_fetch_call = unittest.mock.call(
+            ['git', 'fetch', 'origin',
+             'refs/heads/main:refs/remotes/origin/main'],
+            capture_output=True, check=True, cwd='/tmp/fake_clone')
+        self.assertIn(expected_fetch_call, subproc_mock.mock_calls)
+        expected_merge_call = unittest.mock.call(
+            ['git', 'merge', '--ff-only', 'origin/main'],
+            capture_output=True, check=True, cwd='/tmp/fake_clone')
+        self.assertEqual(subproc_mock.mock_calls[-1], expected_merge_call)
+
+    @unittest.mock.patch('qiskit_bot.git._run')
+    def test_fetch_refs_fast_forward_only(self, run_mock):
+        repo = unittest.mock.MagicMock()
+        repo.local_path = '/tmp/fake_clone'
+        git.fetch_refs(repo, ['refs/heads/main', 'refs/tags/0.1.0'],
+                       force=False)
+        run_mock.assert_called_once_with(
+            ['git', 'fetch', 'origin',
+             'refs/heads/main:refs/remotes/origin/main',
+             'refs/tags/0.1.0:refs/tags/0.1.0'],
+            capture_output=True, check=True, cwd='/tmp/fake_clone')
+
+
+class TestTimeout(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def test_timeout_kills_process_group(self):
+        temp_dir = self.useFixture(fixtures.TempDir())
+        subprocess.run(['git', 'init', '-q'], cwd=temp_dir.path, check=True)
+        # The alias runs through a shell which starts a child of its own
+        subprocess.run(['git', 'config', 'alias.hang', '!sleep 30; sleep 30'],
+                       cwd=temp_dir.path, check=True)
+        start = time.monotonic()
+        with self.assertRaises(subprocess.CalledProcessError) as cm:
+            git._run(['git', 'hang'], capture_output=True, check=True,
+                     cwd=temp_dir.path, timeout=0.5)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(-9, cm.exception.returncode)
+
+    @unittest.mock.patch.dict(git._TIMEOUTS, {'log': 0.5})
+    def test_iter_log_timeout(self):
+        repo = unittest.mock.MagicMock()
+        repo.local_path = self.useFixture(fixtures.TempDir()).path
+        popen = subprocess.Popen
+        with unittest.mock.patch(
+                'subprocess.Popen',
+                side_effect=lambda cmd, **kwargs: popen(['sleep', '30'],
+                                                        **kwargs)):
+            start = time.monotonic()
+            with self.assertRaises(subprocess.CalledProcessError) as cm:
+                list(git.iter_log(repo, 'main'))
+        self.assertEqual(-9, cm.exception.returncode)
+        self.assertLess(time.monotonic() - start, 10)
+
+
+class TestSSH(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(git._SSH_ENV.clear)
+        self.working_dir = self.useFixture(fixtures.TempDir()).path
+
+    def test_configure_writes_ssh_config(self):
+        git.configure({'working_dir': self.working_dir,
+                       'ssh': {'control_persist': 300}})
+        config_path = os.path.join(self.working_dir, 'ssh', 'config')
+        with open(config_path) as fd:
+            ssh_config = fd.read()
+        self.assertIn('ControlMaster auto', ssh_config)
+        self.assertIn('ControlPersist 300', ssh_config)
+        self.assertEqual(0o600, os.stat(config_path).st_mode & 0o777)
+        self.assertEqual('ssh -F %s' % config_path,
+                         git._SSH_ENV['GIT_SSH_COMMAND'])
+
+    def test_configure_control_persist_disabled(self):
+        git.configure({'working_dir': self.working_dir,
+                       'ssh': {'control_persist': 0}})
+        self.assertEqual({}, git._SSH_ENV)
+        self.assertFalse(os.path.exists(os.path.join(self.working_dir,
+                                                     'ssh')))
+
+    @unittest.mock.patch('qiskit_bot.git._run')
+    def test_push_refs_single_push(self, run_mock):
+        git.configure({'working_dir': self.working_dir})
+        repo = unittest.mock.MagicMock()
+        repo.local_path = '/tmp/fake_clone'
+        repo.ssh_remote = 'git@github.com:Qiskit/qiskit.git'
+        self.assertTrue(git.push_refs_to_github(repo, ['stable/0.1', '0.1.0']))
+        run_mock.assert_called_once_with(
+            ['git', 'push', 'git@github.com:Qiskit/qiskit.git',
+             'stable/0.1', '0.1.0'],
+            capture_output=True, check=True, cwd='/tmp/fake_clone',
+            env=unittest.mock.ANY)
+        env = run_mock.call_args[1]['env']
+        self.assertEqual(git._SSH_ENV['GIT_SSH_COMMAND'],
+                         env['GIT_SSH_COMMAND'])
+
+
+class TestSparseCheckout(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = self.useFixture(fixtures.TempDir())
+        for var, value in [('GIT_AUTHOR_NAME', 'Qiskit Bot'),
+                           ('GIT_AUTHOR_EMAIL', 'qiskit@example.com'),
+                           ('GIT_COMMITTER_NAME', 'Qiskit Bot'),
+                           ('GIT_COMMITTER_EMAIL', 'qiskit@example.com')]:
+            self.useFixture(fixtures.EnvironmentVariable(var, value))
+        self.repo = unittest.mock.MagicMock()
+        self.repo.local_path = temp_dir.path
+        subprocess.run(['git', 'init', '-q'], cwd=temp_dir.path, check=True)
+        os.mkdir(os.path.join(temp_dir.path, 'docs'))
+        for path in ('setup.py', 'README.md', 'docs/conf.py',
+                     'docs/index.rst'):
+            with open(os.path.join(temp_dir.path, path), 'w') as fd:
+                fd.write('%s\n' % path)
+        subprocess.run(['git', 'add', '.'], cwd=temp_dir.path, check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'Initial'],
+                       cwd=temp_dir.path, check=True)
+
+    def test_sparse_checkout(self):
+        paths = ['setup.py', 'docs/conf.py']
+        self.assertTrue(git.sparse_checkout(self.repo, paths))
+        self.assertFalse(os.path.exists(os.path.join(self.repo.local_path,
+                                                     'README.md')))
+        self.assertFalse(os.path.exists(os.path.join(self.repo.local_path,
+                                                     'docs', 'index.rst')))
+        for path in paths:
+            self.assertTrue(os.path.exists(os.path.join(self.repo.local_path,
+                                                        path)))
+        # Files outside the sparse checkout are still tracked
+        res = subprocess.run(['git', 'status', '--porcelain'],
+                             cwd=self.repo.local_path, check=True,
+                             capture_output=True, encoding='UTF8')
+        self.assertEqual('', res.stdout)
+
+
+class TestPlumbing(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = self.useFixture(fixtures.TempDir())
+        for var, value in [('GIT_AUTHOR_NAME', 'Qiskit Bot'),
+                           ('GIT_AUTHOR_EMAIL', 'qiskit@example.com'),
+                           ('GIT_COMMITTER_NAME', 'Qiskit Bot'),
+                           ('GIT_COMMITTER_EMAIL', 'qiskit@example.com')]:
+            self.useFixture(fixtures.EnvironmentVariable(var, value))
+        self.repo = unittest.mock.MagicMock()
+        self.repo.local_path = temp_dir.path
+        subprocess.run(['git', 'init', '-q', '-b', 'main'], cwd=temp_dir.path,
+                       check=True)
+        os.mkdir(os.path.join(temp_dir.path, 'docs'))
+        for path in ('setup.py', 'docs/conf.py', 'docs/index.rst'):
+            with open(os.path.join(temp_dir.path, path), 'w') as fd:
+                fd.write('%s\n' % path)
+        os.chmod(os.path.join(temp_dir.path, 'setup.py'), 0o755)
+        subprocess.run(['git', 'add', '.'], cwd=temp_dir.path, check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'Initial'],
+                       cwd=temp_dir.path, check=True)
+
+    def git(self, *args):
+        return subprocess.run(('git',) + args, cwd=self.repo.local_path,
+                              check=True, capture_output=True,
+                              encoding='UTF8').stdout
+
+    def test_commit_without_worktree(self):
+        parent = git.resolve_ref(self.repo, 'refs/heads/main')
+        files = {
+            'setup.py': git.hash_object(self.repo, b'bumped setup\n'),
+            'docs/conf.py': git.hash_object(self.repo, b'bumped conf\n'),
+        }
+        tree = git.write_tree(self.repo, parent, files)
+        commit = git.commit_tree(self.repo, tree, [parent], b'Bump\n')
+        self.assertTrue(git.update_ref(self.repo, 'refs/heads/bump_meta',
+                                       commit))
+        self.assertEqual('bumped setup\n',
+                         self.git('show', 'bump_meta:setup.py'))
+        self.assertEqual('bumped conf\n',
+                         self.git('show', 'bump_meta:docs/conf.py'))
+        self.assertEqual('docs/index.rst\n',
+                         self.git('show', 'bump_meta:docs/index.rst'))
+        self.assertEqual(parent, self.git('rev-parse', 'bump_meta^').strip())
+        self.assertIn('100755 blob',
+                      self.git('ls-tree', 'bump_meta', 'setup.py'))
+        # Neither the worktree nor the checked out branch changed
+        self.assertEqual(parent, self.git('rev-parse', 'HEAD').strip())
+        self.assertEqual('', self.git('status', '--porcelain'))
+
+    def test_update_ref_old_sha(self):
+        parent = git.resolve_ref(self.repo, 'refs/heads/main')
+        tree = git.write_tree(self.repo, parent, {})
+        commit = git.commit_tree(self.repo, tree, [parent], b'Empty\n')
+        self.assertFalse(git.update_ref(self.repo, 'refs/heads/main', commit,
+                                        old_sha1=commit))
+        self.assertEqual(parent, git.resolve_ref(self.repo, 'refs/heads/main'))
+
+
+class TestShallowClone(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(git_objects.close_all)
+        self.temp_dir = fixtures.TempDir()
+        self.useFixture(self.temp_dir)
+        origin = os.path.join(self.temp_dir.path, 'origin')
+        os.mkdir(origin)
+        self.origin = origin
+        env = dict(os.environ, GIT_AUTHOR_NAME='Qiskit Bot',
+                   GIT_AUTHOR_EMAIL='qiskit@example.com',
+                   GIT_COMMITTER_NAME='Qiskit Bot',
+                   GIT_COMMITTER_EMAIL='qiskit@example.com')
+        self.env = env
+        subprocess.run(['git', 'init', '-q', '-b', 'main'], cwd=origin,
+                       check=True)
+        for i in range(10):
+            subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m',
+                            'Commit %s' % i], cwd=origin, check=True, env=env)
+            if i == 2:
+                subprocess.run(['git', 'tag', '-a', '-m', '0.1.0', '0.1.0'],
+                               cwd=origin, check=True, env=env)
+        self.repo = unittest.mock.MagicMock()
+        self.repo.local_path = os.path.join(self.temp_dir.path, 'clone')
+        subprocess.run(['git', 'clone', '-q', '--depth=1',
+                        'file://%s' % origin, self.repo.local_path],
+                       check=True)
+        self.assertEqual('', git.get_tags(self.repo))
+        self.assertTrue(git.fetch_tags(self.repo))
+
+    def test_fetch_tags(self):
+        self.assertEqual('0.1.0\n', git.get_tags(self.repo))
+
+    def count_commits(self):
+        return subprocess.run(['git', 'rev-list', '--count', 'main'],
+                              cwd=self.repo.local_path, check=True,
+                              capture_output=True,
+                              encoding='UTF8').stdout.strip()
+
+    def test_fetch_tags_keeps_history(self):
+        self.assertTrue(git.deepen(self.repo, 3))
+        self.assertEqual('4', self.count_commits())
+        for tag, rev in [('0.2.0', 'main~1'), ('0.3.0', 'main')]:
+            subprocess.run(['git', 'tag', '-a', '-m', tag, tag, rev],
+                           cwd=self.origin, check=True, env=self.env)
+        self.assertTrue(git.fetch_tags(self.repo))
+        self.assertEqual(['0.1.0', '0.2.0', '0.3.0'],
+                         sorted(git.get_tags(self.repo).split()))
+        self.assertEqual('4', self.count_commits())
+        # Tags which exist locally aren't fetched again
+        self.assertTrue(git.fetch_tags(self.repo))
+        self.assertEqual('4', self.count_commits())
+
+    @unittest.mock.patch.object(git, 'DEEPEN_STEP', 2)
+    def test_log_range_deepens(self):
+        self.assertTrue(git.is_shallow(self.repo))
+        log = git.iter_log(self.repo, '0.1.0..main')
+        self.assertEqual(['Commit %s' % i for i in range(9, 2, -1)],
+                         [x.subject for x in log])
+
+    @unittest.mock.patch.object(git, 'DEEPEN_STEP', 2)
+    def test_latest_tag_deepens(self):
+        self.assertEqual(b'0.1.0\n', git.get_latest_tag(self.repo))
+
+
+class TestIterLog(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = fixtures.TempDir()
+        self.useFixture(self.temp_dir)
+        self.repo = unittest.mock.MagicMock()
+        self.repo.local_path = self.temp_dir.path
+        env = dict(os.environ, GIT_AUTHOR_NAME='Qiskit Bot',
+                   GIT_AUTHOR_EMAIL='qiskit@example.com',
+                   GIT_COMMITTER_NAME='Qiskit Bot',
+                   GIT_COMMITTER_EMAIL='qiskit@example.com')
+        subprocess.run(['git', 'init', '-q', '-b', 'main'],
+                       cwd=self.temp_dir.path, check=True)
+        for subject in ['Initial commit',
+                        'Fix handling of tag: prefixes (#12)',
+                        'Add a thing (Qiskit/qiskit-aqua#1440)',
+                        'Prepare 0.2.0 release (#15)']:
+            subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m',
+                            subject], cwd=self.temp_dir.path, check=True,
+                           env=env)
+        subprocess.run(['git', 'tag', '0.2.0'], cwd=self.temp_dir.path,
+                       check=True)
+
+    def test_iter_log(self):
+        entries = list(git.iter_log(self.repo, 'main~3..main'))
+        self.assertEqual(
+            [('Prepare 0.2.0 release (#15)', 15),
+             ('Add a thing (Qiskit/qiskit-aqua#1440)', None),
+             ('Fix handling of tag: prefixes (#12)', 12)],
+            [(x.subject, x.pr_number) for x in entries])
+        self.assertEqual(['HEAD -> main', 'tag: 0.2.0'], entries[0].refs)
+        self.assertEqual([], entries[1].refs)
+        self.assertEqual(40, len(entries[0].sha))
+
+    @unittest.mock.patch.object(git, '_CHUNK_SIZE', 7)
+    def test_iter_log_small_chunks(self):
+        self.assertEqual(4, len(list(git.iter_log(self.repo, 'main'))))
+
+    def test_iter_log_invalid_range(self):
+        self.assertRaises(subprocess.CalledProcessError, list,
+                          git.iter_log(self.repo, 'nope..main'))
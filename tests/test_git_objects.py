@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import os
+import subprocess
+import time
+import unittest
+
+import fixtures
+
+from qiskit_bot import git_objects
+
+
+def git(path, *args):
+    cmd = ['git', '-c', 'user.name=Qiskit Bot', '-c',
+           'user.email=qiskit@example.com'] + list(args)
+    return subprocess.run(cmd, cwd=path, check=True, capture_output=True,
+                          encoding='UTF8').stdout.strip()
+
+
+class TestObjectReader(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = fixtures.TempDir()
+        self.useFixture(self.temp_dir)
+        self.path = self.temp_dir.path
+        git(self.path, 'init', '-q', '-b', 'main')
+        for i in range(3):
+            with open(os.path.join(self.path, 'file.txt'), 'w') as fd:
+                fd.write('version %s\n' % i)
+            git(self.path, 'add', 'file.txt')
+            git(self.path, 'commit', '-q', '-m', 'Commit %s' % i,
+                '--date', '2026-01-0%sT00:00:00' % (i + 1))
+        self.reader = git_objects.ObjectReader(self.path)
+        self.addCleanup(self.reader.close)
+
+    def test_resolve(self):
+        self.assertEqual(git(self.path, 'rev-parse', 'main'),
+                         self.reader.resolve('main'))
+        self.assertIsNone(self.reader.resolve('not-a-branch'))
+        self.assertIsNone(self.reader.resolve('main:missing.txt'))
+
+    def test_read_blob(self):
+        self.assertEqual('version 2\n', self.reader.read_blob('main:file.txt'))
+        self.assertEqual('version 0\n',
+                         self.reader.read_blob('main~2:file.txt'))
+
+    def test_restart(self):
+        self.assertIsNotNone(self.reader.resolve('main'))
+        self.reader._procs['--batch-check'].kill()
+        self.reader._procs['--batch-check'].wait()
+        self.assertEqual(git(self.path, 'rev-parse', 'main'),
+                         self.reader.resolve('main'))
+
+    @unittest.mock.patch.object(git_objects, 'TIMEOUT', 0.5)
+    def test_timeout(self):
+        popen = subprocess.Popen
+        with unittest.mock.patch(
+                'subprocess.Popen',
+                side_effect=lambda cmd, **kwargs: popen(['sleep', '30'],
+                                                        **kwargs)):
+            start = time.monotonic()
+            self.assertRaises(TimeoutError, self.reader.resolve, 'main')
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual({}, self.reader._procs)
+        # The next request starts a new process
+        self.assertEqual(git(self.path, 'rev-parse', 'main'),
+                         self.reader.resolve('main'))
+
+    def test_get_reader_shared(self):
+        self.addCleanup(git_objects.close_all)
+        self.assertIs(git_objects.get_reader(self.path),
+                      git_objects.get_reader(self.path))
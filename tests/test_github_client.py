@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import json
+import threading
+import unittest
+import unittest.mock
+
+from github import Requester
+import requests
+
+from qiskit_bot import github_client
+
+
+class TestGithubClient(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(github_client.configure, {})
+
+    def test_client_shared(self):
+        github_client.configure({})
+        client = github_client.get_client('fake_token')
+        self.assertIs(client, github_client.get_client('fake_token'))
+        self.assertIsNot(client, github_client.get_client('other_token'))
+
+    @unittest.mock.patch('github.Github')
+    def test_pool_size_from_concurrency(self, github_mock):
+        github_client.configure({'event_workers': 3,
+                                 'executor': {'max_workers': 4},
+                                 'changelog': {'max_in_flight': 5}})
+        github_client.get_client('fake_token')
+        self.assertEqual(23, github_mock.call_args[1]['pool_size'])
+
+    @unittest.mock.patch('github.Github')
+    def test_configured_limits(self, github_mock):
+        github_client.configure({'github': {'pool_size': 4, 'timeout': 30,
+                                            'retries': 2}})
+        github_client.get_client('fake_token')
+        kwargs = github_mock.call_args[1]
+        self.assertEqual(4, kwargs['pool_size'])
+        self.assertEqual(30, kwargs['timeout'])
+        self.assertEqual(2, kwargs['retry'])
+
+    def test_connection_requests_per_thread(self):
+        cnx = github_client.SharedHTTPSConnection('api.github.com')
+        cnx.request('GET', '/repos/Qiskit/qiskit', None, {})
+        other_thread = threading.Thread(
+            target=cnx.request, args=('POST', '/graphql', '{}', {}))
+        other_thread.start()
+        other_thread.join()
+        with unittest.mock.patch.object(cnx.session, 'request') as req_mock:
+            req_mock.return_value.status_code = 200
+            cnx.getresponse()
+        self.assertEqual('GET', req_mock.call_args[0][0])
+        self.assertEqual('https://api.github.com:443/repos/Qiskit/qiskit',
+                         req_mock.call_args[0][1])
+
+    def test_connections_share_session(self):
+        cnx = github_client.SharedHTTPSConnection('api.github.com',
+                                                  pool_size=4)
+        session = cnx.session
+        cnx.close()
+        self.assertIs(session, github_client.SharedHTTPSConnection(
+            'api.github.com', pool_size=4).session)
+        self.assertIsNot(session, github_client.SharedHTTPSConnection(
+            'api.github.com', pool_size=8).session)
+
+    def test_client_reuses_session(self):
+        github_client.install()
+        self.addCleanup(Requester.Requester.resetConnectionClasses)
+        github_client.configure({'github': {'pool_size': 3}})
+        client = github_client.get_client('fake_token')
+        with unittest.mock.patch('requests.Session.request',
+                                 autospec=True) as req_mock:
+            req_mock.return_value.status_code = 200
+            req_mock.return_value.headers = {}
+            req_mock.return_value.text = json.dumps(
+                {'full_name': 'Qiskit/qiskit',
+                 'url': 'https://api.github.com/repos/Qiskit/qiskit'})
+            client.get_repo('Qiskit/qiskit')
+            client.get_repo('Qiskit/qiskit')
+        self.assertEqual(2, req_mock.call_count)
+        sessions = [call[0][0] for call in req_mock.call_args_list]
+        self.assertIs(sessions[0], sessions[1])
+        self.assertIsInstance(sessions[0], requests.Session)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import unittest
+
+import fixtures
+
+from qiskit_bot import github_client
+from qiskit_bot import http_cache
+
+from . import db_fixtures
+
+
+def fake_response(status_code, headers, text=''):
+    response = unittest.mock.MagicMock()
+    response.status_code = status_code
+    response.headers = headers
+    response.text = text
+    return response
+
+
+class TestHTTPCache(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.db = self.useFixture(db_fixtures.TempDB('http_cache.sqlite'))
+        self.path = self.db.path
+
+    def test_put_get(self):
+        cache = http_cache.HTTPCache(self.path)
+        self.assertIsNone(cache.get('key'))
+        cache.put('key', '"abc"', None, {'ETag': '"abc"'}, '{"number": 1}')
+        self.assertEqual(('"abc"', None, {'ETag': '"abc"'}, '{"number": 1}'),
+                         cache.get('key'))
+
+    def test_eviction(self):
+        cache = http_cache.HTTPCache(self.path, max_size=10)
+        cache.put('first', '"1"', None, {}, 'a' * 6)
+        cache.put('second', '"2"', None, {}, 'b' * 4)
+        cache.hit('first')
+        cache.put('third', '"3"', None, {}, 'c' * 4)
+        # second was the least recently used entry
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNotNone(cache.get('third'))
+
+    def test_too_large_not_cached(self):
+        cache = http_cache.HTTPCache(self.path, max_size=4)
+        cache.put('key', '"abc"', None, {}, 'a' * 5)
+        self.assertIsNone(cache.get('key'))
+
+    def test_cache_enabled_by_default(self):
+        github_client.configure({'working_dir': self.db.directory})
+        self.addCleanup(github_client.configure, {})
+        self.assertEqual(100 * 1024 * 1024, github_client._CACHE.max_size)
+        github_client.configure({'working_dir': self.db.directory,
+                                 'github': {'cache_size': 0}})
+        self.assertIsNone(github_client._CACHE)
+
+    def test_conditional_request(self):
+        github_client.configure({'working_dir': self.db.directory,
+                                 'github': {'cache_size': 1024}})
+        self.addCleanup(github_client.configure, {})
+        cache = github_client._CACHE
+        cnx = github_client.SharedHTTPSConnection('api.github.com')
+        headers = {'Authorization': 'token fake'}
+        with unittest.mock.patch.object(cnx.session, 'request') as req_mock:
+            req_mock.return_value = fake_response(
+                200, {'ETag': '"abc"', 'X-RateLimit-Remaining': '10'},
+                '{"number": 1}')
+            cnx.request('GET', '/repos/Qiskit/qiskit/pulls/1', None,
+                        headers)
+            self.assertEqual('{"number": 1}', cnx.getresponse().read())
+            self.assertNotIn('If-None-Match',
+                             req_mock.call_args[1]['headers'])
+
+            req_mock.return_value = fake_response(
+                304, {'X-RateLimit-Remaining': '9'})
+            cnx.request('GET', '/repos/Qiskit/qiskit/pulls/1', None,
+                        headers)
+            response = cnx.getresponse()
+        self.assertEqual('"abc"',
+                         req_mock.call_args[1]['headers']['If-None-Match'])
+        self.assertEqual(200, response.status)
+        self.assertEqual('{"number": 1}', response.read())
+        self.assertEqual('9', response.headers['X-RateLimit-Remaining'])
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
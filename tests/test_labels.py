@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import re
+import threading
+import unittest
+
+import github
+
+from qiskit_bot import labels
+
+
+def fake_graphql(known_labels):
+    """Build a fake GraphQL endpoint answering pull request label queries."""
+
+    def request(verb, url, input=None):
+        repository = {}
+        for pr_number in re.findall(r'pullRequest\(number: (\d+)\)',
+                                    input['query']):
+            pr_labels = known_labels.get(int(pr_number))
+            if pr_labels is None:
+                repository['pr%s' % pr_number] = None
+            else:
+                repository['pr%s' % pr_number] = {
+                    'labels': {'nodes': [{'name': x} for x in pr_labels]}}
+        return {}, {'data': {'repository': repository}}
+
+    return unittest.mock.MagicMock(side_effect=request)
+
+
+class TestLabels(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = unittest.mock.MagicMock()
+        self.repo.repo_name = 'Qiskit/qiskit-terra'
+        self.addCleanup(labels.configure, {})
+
+    def test_graphql_batches(self):
+        known_labels = {x: ['Changelog: Bugfix'] for x in range(1, 251)}
+        request_mock = fake_graphql(known_labels)
+        self.repo.gh_repo.requester.requestJsonAndCheck = request_mock
+        res = labels.get_pr_labels(self.repo, list(range(1, 251)) + [1])
+        self.assertEqual(known_labels, res)
+        self.assertEqual(3, request_mock.call_count)
+        self.assertEqual({'owner': 'Qiskit', 'name': 'qiskit-terra'},
+                         request_mock.call_args[1]['input']['variables'])
+        self.repo.gh_repo.get_pull.assert_not_called()
+
+    def test_missing_pr_falls_back_to_rest(self):
+        self.repo.gh_repo.requester.requestJsonAndCheck = fake_graphql(
+            {1234: ['Changelog: None']})
+        self.repo.gh_repo.get_pull.side_effect = github.GithubException(
+            404, {}, {})
+        res = labels.get_pr_labels(self.repo, [1234, 4321])
+        self.assertEqual({1234: ['Changelog: None']}, res)
+        self.repo.gh_repo.get_pull.assert_called_once_with(4321)
+
+    def test_graphql_error_falls_back_to_rest(self):
+        self.repo.gh_repo.requester.requestJsonAndCheck.side_effect = (
+            github.GithubException(403, {}, {}))
+        label = unittest.mock.MagicMock()
+        label.name = 'Changelog: New Feature'
+        self.repo.gh_repo.get_pull.return_value.labels = [label]
+        res = labels.get_pr_labels(self.repo, [1234])
+        self.assertEqual({1234: ['Changelog: New Feature']}, res)
+
+    def test_rest_only_concurrent(self):
+        labels.configure({'changelog': {'graphql': False,
+                                        'max_in_flight': 2}})
+        lock = threading.Lock()
+        in_flight = []
+        max_seen = []
+
+        def fake_get_pull(pr_number):
+            with lock:
+                in_flight.append(pr_number)
+                max_seen.append(len(in_flight))
+            label = unittest.mock.MagicMock()
+            label.name = 'label-%s' % pr_number
+            pr = unittest.mock.MagicMock()
+            pr.labels = [label]
+            with lock:
+                in_flight.remove(pr_number)
+            return pr
+
+        get_pull = unittest.mock.MagicMock(side_effect=fake_get_pull)
+        self.repo.gh_repo.get_pull = get_pull
+        res = labels.get_pr_labels(self.repo, [5, 3, 5, 9, 1, 3])
+        self.repo.gh_repo.requester.requestJsonAndCheck.assert_not_called()
+        # Duplicates are only fetched once and order is preserved
+        self.assertEqual(4, get_pull.call_count)
+        self.assertEqual([5, 3, 9, 1], list(res))
+        self.assertEqual(['label-9'], res[9])
+        self.assertLessEqual(max(max_seen), 2)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import json
+import os
+import threading
+import unittest
+
+import fixtures
+
+from qiskit_bot import locks
+
+
+class TestRepoLock(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = fixtures.TempDir()
+        self.useFixture(self.temp_dir)
+        self.lock_dir = self.temp_dir.path
+        self.path = os.path.join(self.lock_dir, 'qiskit-terra')
+
+    def test_owner_record(self):
+        with locks.repo_lock(self.lock_dir, 'qiskit-terra'):
+            owner = locks.read_owner(self.path)
+            self.assertEqual(os.getpid(), owner['pid'])
+            self.assertGreater(owner['lease_expires'], owner['acquired'])
+        self.assertIsNone(locks.read_owner(self.path))
+
+    def test_timeout(self):
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with locks.repo_lock(self.lock_dir, 'qiskit-terra'):
+                acquired.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        acquired.wait()
+        with self.assertRaisesRegex(locks.LockTimeout, 'held by pid'):
+            with locks.repo_lock(self.lock_dir, 'qiskit-terra', timeout=0.1):
+                self.fail('Lock acquired while held')
+
+    def test_default_timeout(self):
+        self.addCleanup(locks.configure, {})
+        locks.configure({'locks': {'timeout': 5}})
+        self.assertEqual(5, locks._SETTINGS['timeout'])
+        locks.configure({})
+        self.assertEqual(1800, locks._SETTINGS['timeout'])
+
+    def test_watchdog_removes_dead_owner(self):
+        with open(self.path + '.owner', 'w') as fd:
+            json.dump({'pid': 123456789, 'thread': 'event-worker-0',
+                       'acquired': 0, 'lease_expires': 900}, fd)
+        watchdog = locks.Watchdog(self.lock_dir)
+        with unittest.mock.patch.object(locks, 'pid_alive',
+                                        return_value=False):
+            self.assertEqual(1, watchdog.check())
+        self.assertIsNone(locks.read_owner(self.path))
+
+    def test_watchdog_keeps_live_owner(self):
+        with locks.repo_lock(self.lock_dir, 'qiskit-terra'):
+            self.assertEqual(0, locks.Watchdog(self.lock_dir).check())
+            self.assertIsNotNone(locks.read_owner(self.path))
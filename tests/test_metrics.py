@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import unittest
+
+import prometheus_client
+
+from qiskit_bot import git
+from qiskit_bot import github_client
+from qiskit_bot import metrics
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_github_endpoint(self):
+        self.assertEqual(
+            '/repos/:owner/:repo/pulls/:number/files',
+            metrics.github_endpoint(
+                '/repos/Qiskit/qiskit/pulls/1234/files?page=2'))
+        self.assertEqual(
+            '/repos/:owner/:repo/git/refs/:name',
+            metrics.github_endpoint(
+                '/repos/Qiskit/qiskit/git/refs/heads/bump_meta'))
+        self.assertEqual('/repos/:owner/:repo',
+                         metrics.github_endpoint('/repos/Qiskit/qiskit'))
+
+    def _sample(self, name, labels):
+        value = prometheus_client.REGISTRY.get_sample_value(name, labels)
+        return value or 0
+
+    @unittest.mock.patch('subprocess.Popen')
+    def test_git_command_latency(self, subproc_mock):
+        proc = subproc_mock.return_value.__enter__.return_value
+        proc.communicate.return_value = (b'', b'')
+        proc.returncode = 0
+        repo = unittest.mock.MagicMock()
+        repo.local_path = '/tmp/fake_clone'
+        before = self._sample('qiskit_bot_git_command_seconds_count',
+                              {'command': 'branch'})
+        git.create_branch('stable/0.1', 'sha1', repo)
+        after = self._sample('qiskit_bot_git_command_seconds_count',
+                             {'command': 'branch'})
+        self.assertEqual(1, after - before)
+
+    def test_github_request_metrics(self):
+        labels = {'method': 'GET', 'endpoint': '/repos/:owner/:repo',
+                  'status': '200'}
+        before = self._sample('qiskit_bot_github_requests_total', labels)
+        cnx = github_client.SharedHTTPSConnection('api.github.com')
+        cnx.request('GET', '/repos/Qiskit/qiskit', None, {})
+        response = unittest.mock.MagicMock()
+        response.status_code = 200
+        with unittest.mock.patch.object(cnx.session, 'request',
+                                        return_value=response):
+            self.assertEqual(200, cnx.getresponse().status)
+        after = self._sample('qiskit_bot_github_requests_total', labels)
+        self.assertEqual(1, after - before)
+
+    def test_generate_latest(self):
+        body, content_type = metrics.generate_latest()
+        self.assertIn(b'qiskit_bot_executor_queue_depth', body)
+        self.assertEqual(prometheus_client.CONTENT_TYPE_LATEST, content_type)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import os
+import subprocess
+import time
+import unittest
+
+import fixtures
+
+from qiskit_bot import git_objects
+from qiskit_bot import locks
+from qiskit_bot import mirror
+
+
+class TestMirror(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = fixtures.TempDir()
+        self.useFixture(self.temp_dir)
+        self.lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(self.lock_dir)
+        self.origin = os.path.join(self.temp_dir.path, 'origin')
+        os.mkdir(self.origin)
+        self.env = dict(os.environ, GIT_AUTHOR_NAME='Qiskit Bot',
+                        GIT_AUTHOR_EMAIL='qiskit@example.com',
+                        GIT_COMMITTER_NAME='Qiskit Bot',
+                        GIT_COMMITTER_EMAIL='qiskit@example.com')
+        subprocess.run(['git', 'init', '-q', '-b', 'main'], cwd=self.origin,
+                       check=True)
+        self.commit()
+        self.repo = unittest.mock.MagicMock()
+        self.repo.name = 'qiskit-terra'
+        self.repo.repo_name = 'Qiskit/qiskit-terra'
+        self.repo.local_path = os.path.join(self.temp_dir.path, 'clone')
+        subprocess.run(['git', 'clone', '-q', self.origin,
+                        self.repo.local_path], check=True)
+        self.addCleanup(git_objects.close_all)
+        self.addCleanup(mirror._LATEST.clear)
+
+    def commit(self):
+        subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m', 'Test'],
+                       cwd=self.origin, check=True, env=self.env)
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=self.origin,
+                              check=True, capture_output=True,
+                              encoding='UTF8').stdout.strip()
+
+    def test_refresh(self):
+        refresher = mirror.Refresher(self.lock_dir)
+        self.assertFalse(mirror.is_current(self.repo, 'refs/heads/main'))
+        sha = self.commit()
+        refresher.schedule(self.repo, 'refs/heads/main', sha)
+        self.assertFalse(mirror.is_current(self.repo, 'refs/heads/main'))
+        refresher.refresh(self.repo, {'refs/heads/main': sha})
+        self.assertTrue(mirror.is_current(self.repo, 'refs/heads/main'))
+
+    @unittest.mock.patch('qiskit_bot.git.fetch_refs')
+    def test_burst_coalesced(self, fetch_mock):
+        refresher = mirror.Refresher(self.lock_dir, delay=0.2)
+        # Schedule the whole burst before the delay can start
+        for _ in range(3):
+            refresher.schedule(self.repo, 'refs/heads/main', self.commit())
+        refresher.start()
+        self.addCleanup(refresher.stop)
+        for _ in range(50):
+            if fetch_mock.called:
+                break
+            time.sleep(0.1)
+        time.sleep(0.3)
+        fetch_mock.assert_called_once_with(self.repo, ['refs/heads/main'])
+
+    @unittest.mock.patch('qiskit_bot.git.fetch_refs')
+    def test_current_ref_not_fetched(self, fetch_mock):
+        refresher = mirror.Refresher(self.lock_dir)
+        sha = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=self.origin,
+                             check=True, capture_output=True,
+                             encoding='UTF8').stdout.strip()
+        refresher.refresh(self.repo, {'refs/heads/main': sha})
+        fetch_mock.assert_not_called()
+
+    @unittest.mock.patch('qiskit_bot.git.fetch_refs')
+    def test_lock_timeout_retried(self, fetch_mock):
+        refresher = mirror.Refresher(self.lock_dir, delay=0.1)
+        sha = self.commit()
+        refresher.schedule(self.repo, 'refs/heads/main', sha)
+        with unittest.mock.patch.object(
+                refresher, 'refresh',
+                side_effect=[locks.LockTimeout('Timed out'), None]) as \
+                refresh_mock:
+            refresher.start()
+            self.addCleanup(refresher.stop)
+            for _ in range(50):
+                if refresh_mock.call_count == 2:
+                    break
+                time.sleep(0.1)
+            refresher.stop()
+        self.assertEqual(
+            [unittest.mock.call(self.repo, {'refs/heads/main': sha})] * 2,
+            refresh_mock.call_args_list)
+
+    def test_deleted_ref(self):
+        refresher = mirror.Refresher(self.lock_dir)
+        subprocess.run(['git', 'update-ref', 'refs/remotes/origin/feature',
+                        'HEAD'], cwd=self.repo.local_path, check=True)
+        refresher.schedule(self.repo, 'refs/heads/feature', None)
+        refresher.refresh(self.repo, {'refs/heads/feature': None})
+        res = subprocess.run(['git', 'rev-parse', '--verify', '-q',
+                              'refs/remotes/origin/feature'],
+                             cwd=self.repo.local_path)
+        self.assertNotEqual(0, res.returncode)
+
+    def test_is_mirrored(self):
+        self.repo.repo_config = {'default_branch': 'main'}
+        for ref in ['refs/heads/main', 'refs/heads/stable/0.1',
+                    'refs/tags/0.1.0']:
+            self.assertTrue(mirror.is_mirrored(self.repo, ref))
+        for ref in ['refs/heads/feature', 'refs/heads/bump_meta',
+                    'refs/heads/gh-readonly-queue/main/pr-1-abc']:
+            self.assertFalse(mirror.is_mirrored(self.repo, ref))
+        self.assertTrue(mirror.is_mirrored(self.repo, 'refs/heads/bump_meta',
+                                           ('bump_meta',)))
@@ -30,8 +30,12 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
     def setUp(self):
         self.temp_dir = fixtures.TempDir()
         self.useFixture(self.temp_dir)
+        patcher = unittest.mock.patch.object(
+            notifications.mirror, 'is_current', return_value=True)
+        self.is_current_mock = patcher.start()
+        self.addCleanup(patcher.stop)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_basic_notification(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -52,12 +56,14 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
             return_value=local_config
         )
         repo.gh_repo = gh_mock
+        repo.repo_config = {'default_branch': 'main'}
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
+        self.is_current_mock.assert_called_once_with(repo, 'refs/heads/main')
+        repo.get_local_config.assert_called_once_with(fetch=False)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = notifications.DEFAULT_PRELUDE + (
             "\nOne or more of the following people are relevant to "
             "this code:\n- @user1\n- @user2\n"
@@ -65,7 +71,7 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_no_prelude_for_team_mbembers(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -88,11 +94,10 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = (
             "\nOne or more of the following people are relevant to "
             "this code:\n- '@user1'\n- '@user2'\n"
@@ -100,7 +105,7 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_multiple_overlapping_file_notifications(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -123,11 +128,10 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = notifications.DEFAULT_PRELUDE + (
             "\nOne or more of the following people are relevant to "
             "this code:\n- @user1\n- @user2\n- @user3\n"
@@ -136,7 +140,7 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_no_matching_files(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -159,15 +163,14 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_not_called()
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_one_hit_multiple_notification_rules(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -190,11 +193,10 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = notifications.DEFAULT_PRELUDE + (
             "\nOne or more of the following people are relevant to "
             "this code:\n- @user1\n- @user2\n"
@@ -202,7 +204,7 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_no_match_always_notify(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -226,16 +228,15 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = notifications.DEFAULT_PRELUDE
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_no_match_always_notify_custom_prelude(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -260,16 +261,15 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = "This is my prelude\n"
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_always_notify_no_notification(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -289,16 +289,15 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = notifications.DEFAULT_PRELUDE
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
 
-    @unittest.mock.patch("multiprocessing.Process")
+    @unittest.mock.patch("qiskit_bot.executor.submit")
     def test_match_custom_prelude(self, sub_mock):
         repo = unittest.mock.MagicMock()
         local_config = {
@@ -323,11 +322,10 @@ class TestNotifications(fixtures.TestWithFixtures, unittest.TestCase):
         )
         repo.gh_repo = gh_mock
         conf = {'working_dir': self.temp_dir.path}
-        with unittest.mock.patch('qiskit_bot.git.checkout_default_branch'):
-            notifications.trigger_notifications(1234, repo, conf)
+        notifications.trigger_notifications(1234, repo, conf)
         sub_mock.assert_called_once()
-        inner_func = sub_mock.call_args_list[0][1]['target']
-        inner_func()
+        inner_func, *args = sub_mock.call_args_list[0][0]
+        inner_func(*args)
         expected_body = """This is my prelude
 
 One or more of the following people are relevant to this code:
@@ -336,3 +334,18 @@ One or more of the following people are relevant to this code:
 """
         gh_mock.get_pull.assert_called_once_with(1234)
         pr_mock.create_issue_comment.assert_called_once_with(expected_body)
+
+    @unittest.mock.patch("qiskit_bot.executor.submit")
+    def test_stale_default_branch_fetched(self, sub_mock):
+        self.is_current_mock.return_value = False
+        repo = unittest.mock.MagicMock()
+        repo.name = 'test'
+        repo.repo_config = {'default_branch': 'main'}
+        local_config = {"notifications": {".*": ["@user1"]}}
+        repo.get_local_config.return_value = local_config
+        conf = {'working_dir': self.temp_dir.path}
+        notifications.trigger_notifications(1234, repo, conf)
+        self.is_current_mock.assert_called_once_with(repo, 'refs/heads/main')
+        repo.get_local_config.assert_called_once_with(fetch=True)
+        sub_mock.assert_called_once_with(
+            notifications._process_notification, 1234, repo, local_config)
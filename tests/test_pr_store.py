@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import unittest
+
+import fixtures
+
+from qiskit_bot import community
+from qiskit_bot import labels
+from qiskit_bot import pr_store
+
+from . import db_fixtures
+
+
+class TestPRStore(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.store = pr_store.PRStore(self.useFixture(
+            db_fixtures.TempDB('pr_metadata.sqlite')).path)
+        patcher = unittest.mock.patch.object(pr_store, 'STORE', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_record_payload(self):
+        self.store.record_payload('Qiskit/qiskit', db_fixtures.pr_payload(
+            1, ['Changelog: New Feature'], '2026-01-01T00:00:00Z',
+            merged=False))
+        self.store.record_payload('Qiskit/qiskit', db_fixtures.pr_payload(
+            1, ['Changelog: Bugfix'], '2026-01-02T00:00:00Z', merged=True))
+        self.assertEqual({1: ['Changelog: Bugfix']},
+                         self.store.get_labels('Qiskit/qiskit', [1, 2]))
+        self.assertEqual({}, self.store.get_labels('Qiskit/rustworkx', [1]))
+
+    def test_out_of_order_payload_ignored(self):
+        self.store.record_payload('Qiskit/qiskit', db_fixtures.pr_payload(
+            1, ['Changelog: Bugfix'], '2026-01-02T00:00:00Z'))
+        self.store.record_payload('Qiskit/qiskit', db_fixtures.pr_payload(
+            1, [], '2026-01-01T00:00:00Z'))
+        self.assertEqual({1: ['Changelog: Bugfix']},
+                         self.store.get_labels('Qiskit/qiskit', [1]))
+
+    def test_author_association_not_from_payload(self):
+        self.store.record_payload('Qiskit/qiskit', db_fixtures.pr_payload(
+            1, [], '2026-01-01T00:00:00Z'))
+        self.assertIsNone(pr_store.get_author_association('Qiskit/qiskit', 1))
+        pr_store.set_author_association('Qiskit/qiskit', 1, 'MEMBER')
+        self.assertEqual('MEMBER',
+                         pr_store.get_author_association('Qiskit/qiskit', 1))
+
+    def test_get_pr_labels_uses_store(self):
+        self.addCleanup(labels.configure, {})
+        labels.configure({'changelog': {'graphql': False}})
+        repo = unittest.mock.MagicMock()
+        repo.repo_name = 'Qiskit/qiskit'
+        self.store.record_payload('Qiskit/qiskit', db_fixtures.pr_payload(
+            1, ['Changelog: Bugfix'], '2026-01-01T00:00:00Z'))
+        pr_mock = unittest.mock.MagicMock()
+        label = unittest.mock.MagicMock()
+        label.name = 'Changelog: Removal'
+        pr_mock.labels = [label]
+        pr_mock.raw_data = {'updated_at': '2026-01-01T00:00:00Z'}
+        repo.gh_repo.get_pull.return_value = pr_mock
+        res = labels.get_pr_labels(repo, [1, 2])
+        self.assertEqual({1: ['Changelog: Bugfix'],
+                          2: ['Changelog: Removal']}, res)
+        repo.gh_repo.get_pull.assert_called_once_with(2)
+        # The REST lookup was written back to the store
+        self.assertEqual({2: ['Changelog: Removal']},
+                         self.store.get_labels('Qiskit/qiskit', [2]))
+
+    def test_community_label_uses_stored_association(self):
+        repo = unittest.mock.MagicMock()
+        repo.repo_name = 'Qiskit/qiskit'
+        repo.repo_config = {'uses_community_label': True}
+        pr_store.set_author_association('Qiskit/qiskit', 1, 'MEMBER')
+        data = {'number': 1, 'user': {'type': 'User'}, 'labels': []}
+        community.add_community_label(data, repo)
+        repo.gh_repo.get_pull.assert_not_called()
@@ -12,13 +12,20 @@
 # copyright notice, and modified files need to carry a notice indicating
 # that they have been altered from the originals.
 
+from concurrent import futures
 import os
+import threading
+import time
 import unittest
 
 import fixtures
+import github
 from packaging.version import parse
 
 from qiskit_bot import config
+from qiskit_bot import git
+from qiskit_bot import locks
+from qiskit_bot import pr_store
 from qiskit_bot import release_process
 
 from . import fake_meta  # noqa
@@ -29,6 +36,49 @@ class PicklableMagicMock(unittest.mock.MagicMock):
         return (unittest.mock.MagicMock, ())
 
 
+def run_inline(fn, *args, **kwargs):
+    future = futures.Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def log_entries(oneline_log):
+    """Build the iter_log() output for a git log --oneline string."""
+    entries = []
+    for line in oneline_log.splitlines():
+        if line:
+            sha, subject = line.split(' ', 1)
+            entries.append(git._log_entry(sha, '', subject))
+    return entries
+
+
+def serve_meta_repo(git_mock, path):
+    """Back the mocked git object functions with the fake meta repo files.
+
+    New blobs are written back under path so the bumped files can be checked
+    on disk.
+    """
+    def read_blob(repo, file_path):
+        with open(os.path.join(path, file_path)) as fd:
+            return fd.read()
+
+    def write_tree(repo, base_tree, files):
+        for file_path, data in files.items():
+            with open(os.path.join(path, file_path), 'wb') as fd:
+                fd.write(data)
+        return 'tree_sha'
+
+    git_mock.resolve_ref.return_value = 'parent_sha'
+    git_mock.get_blob_sha.side_effect = lambda repo, ref, file_path: file_path
+    git_mock.read_blob.side_effect = read_blob
+    git_mock.hash_object.side_effect = lambda repo, data: data
+    git_mock.write_tree.side_effect = write_tree
+    git_mock.commit_tree.return_value = 'commit_sha'
+
+
 class TestReleaseProcess(fixtures.TestWithFixtures, unittest.TestCase):
 
     def setUp(self):
@@ -45,6 +95,7 @@ class TestReleaseProcess(fixtures.TestWithFixtures, unittest.TestCase):
             return_value='0.20.0'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -52,8 +103,7 @@ class TestReleaseProcess(fixtures.TestWithFixtures, unittest.TestCase):
         version_number = '0.16.1'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.16.1
 
 Bump the meta repo version to include:
@@ -62,8 +112,14 @@ qiskit-terra==0.16.1
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -91,6 +147,124 @@ qiskit-terra==0.16.1
         meta_repo.gh_repo.create_pull.assert_called_once_with(
             'Bump Meta', base='master', head='bump_meta', body=body)
 
+    @unittest.mock.patch.object(release_process, 'git')
+    def test_branch_step_lock_scope(self, git_mock):
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        repo.repo_config = {}
+        held = {}
+
+        def repo_locked(name):
+            try:
+                with locks.repo_lock(lock_dir, 'qiskit-terra', timeout=0):
+                    pass
+            except locks.LockTimeout:
+                held[name] = True
+            else:
+                held[name] = False
+
+        repo.gh_repo.get_branches.side_effect = (
+            lambda: repo_locked('get_branches') or [])
+        git_mock.resolve_ref.return_value = None
+        git_mock.create_branch.side_effect = (
+            lambda *args, **kwargs: repo_locked('create_branch') or True)
+        release_process._release_step__branch('0.12.0', lock_dir, repo)
+        self.assertEqual({'get_branches': False, 'create_branch': True},
+                         held)
+        git_mock.create_branch.assert_called_once_with(
+            'stable/0.12', '0.12.0', repo, push=True)
+
+    @unittest.mock.patch.object(release_process, 'git')
+    def test_branch_step_pushes_existing_local_branch(self, git_mock):
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.repo_config = {}
+        repo.gh_repo.get_branches.return_value = []
+        git_mock.resolve_ref.return_value = 'branch_sha'
+        release_process._release_step__branch('0.12.0', lock_dir, repo)
+        git_mock.create_branch.assert_not_called()
+        git_mock.push_ref_to_github.assert_called_once_with(
+            repo, 'refs/tags/0.12.0^{commit}:refs/heads/stable/0.12')
+
+    @unittest.mock.patch.object(release_process, 'git')
+    def test_branch_step_push_failure(self, git_mock):
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.repo_config = {}
+        repo.gh_repo.get_branches.return_value = []
+        git_mock.resolve_ref.return_value = None
+        git_mock.create_branch.return_value = False
+        self.assertRaises(release_process.ReleaseStepError,
+                          release_process._release_step__branch, '0.12.0',
+                          lock_dir, repo)
+
+    @unittest.mock.patch.object(release_process, 'git')
+    def test_bump_meta_push_failure(self, git_mock):
+        self.useFixture(fake_meta.FakeMetaRepo(self.temp_dir, '0.20.0',
+                                               terra_version='0.16.0'))
+        meta_repo = unittest.mock.MagicMock()
+        meta_repo.repo_config = {}
+        meta_repo.local_path = self.temp_dir.path
+        git_mock.get_latest_tag.return_value = b'0.20.0'
+        serve_meta_repo(git_mock, self.temp_dir.path)
+        git_mock.push_ref_to_github.return_value = False
+        bump_pr = unittest.mock.MagicMock()
+        bump_pr.title = 'Bump Meta'
+        meta_repo.gh_repo.get_pulls.return_value = [bump_pr]
+        repo = unittest.mock.MagicMock()
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        repo.repo_config = {}
+        self.assertRaises(release_process.ReleaseStepError,
+                          release_process.bump_meta, meta_repo, repo,
+                          '0.16.1')
+        bump_pr.edit.assert_not_called()
+
+    @unittest.mock.patch.object(release_process, 'git')
+    def test_meta_process_lock_scope(self, git_mock):
+        self.useFixture(fake_meta.FakeMetaRepo(self.temp_dir, '0.20.0',
+                                               terra_version='0.16.0'))
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        meta_repo = unittest.mock.MagicMock()
+        meta_repo.name = 'qiskit'
+        meta_repo.repo_config = {}
+        meta_repo.local_path = self.temp_dir.path
+        git_mock.get_latest_tag.return_value = b'0.20.0'
+        serve_meta_repo(git_mock, self.temp_dir.path)
+        repo = unittest.mock.MagicMock()
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        repo.repo_config = {}
+        held = {}
+
+        def meta_repo_locked(name):
+            try:
+                with locks.repo_lock(lock_dir, 'qiskit', timeout=0):
+                    pass
+            except locks.LockTimeout:
+                held[name] = True
+            else:
+                held[name] = False
+
+        meta_repo.gh_repo.get_pulls.side_effect = (
+            lambda state: meta_repo_locked('get_pulls') or [])
+        git_mock.update_ref.side_effect = (
+            lambda *args: meta_repo_locked('update_ref') or True)
+        git_mock.push_ref_to_github.side_effect = (
+            lambda *args: meta_repo_locked('push') or True)
+        meta_repo.gh_repo.create_pull.side_effect = (
+            lambda *args, **kwargs: meta_repo_locked('create_pull'))
+        release_process._finish_release__meta_process(
+            lock_dir, meta_repo, [(repo, '0.16.1')])
+        self.assertEqual({'get_pulls': False, 'update_ref': True,
+                          'push': True, 'create_pull': False}, held)
+
     @unittest.mock.patch.object(release_process, 'git')
     def test_bump_meta_patch_release_from_minor_with_unrelated_pulls(self,
                                                                      git_mock):
@@ -107,6 +281,7 @@ qiskit-terra==0.16.1
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -114,8 +289,7 @@ qiskit-terra==0.16.1
         version_number = '0.16.1'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.16.1
 
 Bump the meta repo version to include:
@@ -124,8 +298,14 @@ qiskit-terra==0.16.1
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -171,6 +351,7 @@ qiskit-terra==0.16.1
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -179,9 +360,9 @@ qiskit-terra==0.16.1
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_called_once_with(meta_repo, 'bump_meta')
-        git_mock.pull_remote_ref_to_local.assert_called_once_with(
-            meta_repo, 'bump_meta')
+        git_mock.fetch_refs.assert_called_with(
+            meta_repo, ['refs/heads/bump_meta'], force=False)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/bump_meta')
         commit_msg = """Bump version for qiskit-terra==0.16.1
 
 Bump the meta repo version to include:
@@ -189,8 +370,14 @@ Bump the meta repo version to include:
 qiskit-terra==0.16.1
 
 """
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -228,6 +415,7 @@ qiskit-terra==0.16.1
             return_value='0.15.1'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -235,8 +423,7 @@ qiskit-terra==0.16.1
         version_number = '0.9.1'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.9.1
 
 Bump the meta repo version to include:
@@ -245,8 +432,14 @@ qiskit-terra==0.9.1
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -291,6 +484,7 @@ qiskit-terra==0.9.1
             pull_mock, pull_mock_two])
 
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -298,8 +492,7 @@ qiskit-terra==0.9.1
         version_number = '0.9.1'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.9.1
 
 Bump the meta repo version to include:
@@ -308,8 +501,14 @@ qiskit-terra==0.9.1
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -356,6 +555,7 @@ qiskit-terra==0.9.1
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -364,9 +564,9 @@ qiskit-terra==0.9.1
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_called_once_with(meta_repo, 'bump_meta')
-        git_mock.pull_remote_ref_to_local.assert_called_once_with(
-            meta_repo, 'bump_meta')
+        git_mock.fetch_refs.assert_called_with(
+            meta_repo, ['refs/heads/bump_meta'], force=False)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/bump_meta')
         commit_msg = """Bump version for qiskit-terra==0.16.1
 
 Bump the meta repo version to include:
@@ -374,8 +574,14 @@ Bump the meta repo version to include:
 qiskit-terra==0.16.1
 
 """
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -421,6 +627,7 @@ qiskit-terra==0.16.1
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -429,9 +636,9 @@ qiskit-terra==0.16.1
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_called_once_with(meta_repo, 'bump_meta')
-        git_mock.pull_remote_ref_to_local.assert_called_once_with(
-            meta_repo, 'bump_meta')
+        git_mock.fetch_refs.assert_called_with(
+            meta_repo, ['refs/heads/bump_meta'], force=False)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/bump_meta')
         commit_msg = """Bump version for qiskit-terra==0.16.1
 
 Bump the meta repo version to include:
@@ -439,8 +646,14 @@ Bump the meta repo version to include:
 qiskit-terra==0.16.1
 
 """
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -478,6 +691,7 @@ qiskit-terra==0.16.1
             return_value='0.20.0'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -485,8 +699,7 @@ qiskit-terra==0.16.1
         version_number = '0.17.0'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.17.0
 
 Bump the meta repo version to include:
@@ -495,8 +708,14 @@ qiskit-terra==0.17.0
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -540,6 +759,7 @@ qiskit-terra==0.17.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -547,8 +767,7 @@ qiskit-terra==0.17.0
         version_number = '0.17.0'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.17.0
 
 Bump the meta repo version to include:
@@ -557,8 +776,14 @@ qiskit-terra==0.17.0
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -606,6 +831,7 @@ qiskit-terra==0.17.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -614,9 +840,9 @@ qiskit-terra==0.17.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_called_once_with(meta_repo, 'bump_meta')
-        git_mock.pull_remote_ref_to_local.assert_called_once_with(
-            meta_repo, 'bump_meta')
+        git_mock.fetch_refs.assert_called_with(
+            meta_repo, ['refs/heads/bump_meta'], force=False)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/bump_meta')
         commit_msg = """Bump version for qiskit-terra==0.17.0
 
 Bump the meta repo version to include:
@@ -624,8 +850,14 @@ Bump the meta repo version to include:
 qiskit-terra==0.17.0
 
 """
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -663,6 +895,7 @@ qiskit-terra==0.17.0
             return_value='0.15.1'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -670,8 +903,7 @@ qiskit-terra==0.17.0
         version_number = '0.10.0'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.10.0
 
 Bump the meta repo version to include:
@@ -680,8 +912,14 @@ qiskit-terra==0.10.0
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -726,6 +964,7 @@ qiskit-terra==0.10.0
             pull_mock, pull_mock_two])
 
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -733,8 +972,7 @@ qiskit-terra==0.10.0
         version_number = '0.10.0'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/master', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/master')
         commit_msg = """Bump version for qiskit-terra==0.10.0
 
 Bump the meta repo version to include:
@@ -743,8 +981,14 @@ qiskit-terra==0.10.0
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -791,6 +1035,7 @@ qiskit-terra==0.10.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -799,9 +1044,9 @@ qiskit-terra==0.10.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_called_once_with(meta_repo, 'bump_meta')
-        git_mock.pull_remote_ref_to_local.assert_called_once_with(
-            meta_repo, 'bump_meta')
+        git_mock.fetch_refs.assert_called_with(
+            meta_repo, ['refs/heads/bump_meta'], force=False)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/bump_meta')
         commit_msg = """Bump version for qiskit-terra==0.16.0
 
 Bump the meta repo version to include:
@@ -809,8 +1054,14 @@ Bump the meta repo version to include:
 qiskit-terra==0.16.0
 
 """
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1021,8 +1272,11 @@ qiskit-terra==0.16.0
                              unittest.mock.MagicMock()))
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
     def test_finish_release(self, bump_meta_mock, github_release_mock,
                             git_mock):
         meta_repo = PicklableMagicMock()
@@ -1030,18 +1284,27 @@ qiskit-terra==0.16.0
         meta_repo.name = 'qiskit'
         repo = PicklableMagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         repo.repo_config = {'branch_on_release': False}
+        repo.get_local_config.return_value = {}
         conf = {'working_dir': self.temp_dir.path}
         release_process.finish_release('0.12.0', repo, conf, meta_repo)
-        bump_meta_mock.called_once_with(meta_repo, repo, '0.12.0')
-        github_release_mock.called_once_with(
-            repo, '0.12.0...0.11.0', '0.12.0',
-            config.default_changelog_categories)
+        bump_meta_mock.assert_called_once_with(
+            meta_repo, [(repo, '0.12.0')],
+            lock_dir=os.path.join(self.temp_dir.path, 'lock'))
+        github_release_mock.assert_called_once_with(
+            repo, '0.12.0...0.11.0', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '0.12.0', 'qiskit-terra 0.12.0', 'changelog',
+            prerelease=False)
         git_mock.create_branch.assert_not_called()
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
     def test_finish_release_with_branch(self, bump_meta_mock,
                                         github_release_mock,
                                         git_mock):
@@ -1050,21 +1313,64 @@ qiskit-terra==0.16.0
         meta_repo.name = 'qiskit'
         repo = PicklableMagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         repo.gh_repo.get_branches.return_value = []
         repo.repo_config = {'branch_on_release': True}
+        repo.get_local_config.return_value = {}
+        git_mock.resolve_ref.return_value = None
         conf = {'working_dir': self.temp_dir.path}
         release_process.finish_release('0.12.0', repo, conf, meta_repo)
-        bump_meta_mock.called_once_with(meta_repo, repo, '0.12.0')
-        github_release_mock.called_once_with(
-            repo, '0.12.0...0.11.0', '0.12.0',
-            config.default_changelog_categories)
+        bump_meta_mock.assert_called_once_with(
+            meta_repo, [(repo, '0.12.0')],
+            lock_dir=os.path.join(self.temp_dir.path, 'lock'))
+        github_release_mock.assert_called_once_with(
+            repo, '0.12.0...0.11.0', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '0.12.0', 'qiskit-terra 0.12.0', 'changelog',
+            prerelease=False)
         git_mock.create_branch.assert_called_once_with(
             'stable/0.12', '0.12.0', repo, push=True)
 
+    @unittest.mock.patch.object(release_process, 'git')
+    @unittest.mock.patch.object(release_process, '_generate_changelog')
+    def test_changelog_step_fetch_failure(self, changelog_mock, git_mock):
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        git_mock.fetch_refs.return_value = False
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        self.assertRaises(release_process.ReleaseStepError,
+                          release_process._release_step__changelog, '0.12.0',
+                          lock_dir, repo)
+        changelog_mock.assert_not_called()
+
+    @unittest.mock.patch.object(release_process, 'git')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    def test_changelog_step_reads_without_checkout(self, changelog_mock,
+                                                   git_mock):
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.get_local_config.return_value = {}
+        git_mock.get_tags.return_value = '0.12.0\n0.11.0\n'
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        self.assertEqual('changelog', release_process._release_step__changelog(
+            '0.12.0', lock_dir, repo))
+        git_mock.fetch_refs.assert_called_once_with(
+            repo, ['refs/heads/%s' % repo.repo_config.get.return_value,
+                   'refs/tags/0.12.0'], force=False)
+        git_mock.checkout_default_branch.assert_not_called()
+        changelog_mock.assert_called_once_with(
+            repo, '0.12.0...0.11.0', config.default_changelog_categories)
+
     @unittest.mock.patch.object(release_process, 'git')
     def test_generate_changelog_with_invalid_PR_number(self, git_mock):
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        repo.gh_repo.requester.requestJsonAndCheck.side_effect = (
+            github.GithubException(403, {}, {}))
         repo.gh_repo.get_branches.return_value = []
         repo.repo_config = {'branch_on_release': True}
         fake_log = """403bc40f8 Add PauliSumOp (Qiskit/qiskit-aqua#1440)
@@ -1072,7 +1378,7 @@ qiskit-terra==0.16.0
 6e2542243 Change collect_1q_runs return for performance (#5685)
 25eb58a29 Add unroll step to level2 passmanager optimization loop (#5671)
 """
-        git_mock.get_git_log.return_value = fake_log.encode('utf8')
+        git_mock.iter_log.return_value = log_entries(fake_log)
         res = release_process._generate_changelog(
             repo, '0.17.0...0.16.0',
             config.default_changelog_categories, True)
@@ -1103,13 +1409,16 @@ qiskit-terra==0.16.0
             return result
 
         repo.gh_repo.get_pull = fake_get_pull
+        repo.gh_repo.requester.requestJsonAndCheck.side_effect = (
+            github.GithubException(403, {}, {}))
+        repo.repo_name = 'Qiskit/qiskit-terra'
         repo.repo_config = {'branch_on_release': True}
         fake_log = """
 5a7f41344 Tune performance of optimize_1q_decomposition (#5682)
 6e2542243 Change collect_1q_runs return for performance (#5685)
 25eb58a29 Add unroll step to level2 passmanager optimization loop (#5671)
 """
-        git_mock.get_git_log.return_value = fake_log.encode('utf8')
+        git_mock.iter_log.return_value = log_entries(fake_log)
         res = release_process._generate_changelog(
             repo, '0.17.0...0.16.0',
             config.default_changelog_categories, True)
@@ -1132,6 +1441,7 @@ qiskit-terra==0.16.0
             return_value='0.20.0'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1140,7 +1450,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1181,6 +1491,7 @@ qiskit-terra==0.16.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1189,7 +1500,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1232,6 +1543,7 @@ qiskit-terra==0.16.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1240,9 +1552,8 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_not_called()
-        git_mock.pull_remote_ref_to_local.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.hash_object.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1279,6 +1590,7 @@ qiskit-terra==0.16.0
             return_value='0.15.1'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1287,7 +1599,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1329,6 +1641,7 @@ qiskit-terra==0.16.0
             pull_mock, pull_mock_two])
 
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1337,7 +1650,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1381,6 +1694,7 @@ qiskit-terra==0.16.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1389,9 +1703,8 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_not_called()
-        git_mock.pull_remote_ref_to_local.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.hash_object.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1436,6 +1749,7 @@ qiskit-terra==0.16.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1444,9 +1758,8 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_not_called()
-        git_mock.pull_remote_ref_to_local.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.hash_object.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1484,6 +1797,7 @@ qiskit-terra==0.16.0
             return_value='0.20.0'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1492,7 +1806,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1533,6 +1847,7 @@ qiskit-terra==0.16.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1541,7 +1856,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1586,6 +1901,7 @@ qiskit-terra==0.16.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1594,9 +1910,8 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_not_called()
-        git_mock.pull_remote_ref_to_local.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.hash_object.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1633,6 +1948,7 @@ qiskit-terra==0.16.0
             return_value='0.15.1'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1641,7 +1957,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1683,6 +1999,7 @@ qiskit-terra==0.16.0
             pull_mock, pull_mock_two])
 
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1691,7 +2008,7 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1735,6 +2052,7 @@ qiskit-terra==0.16.0
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(
             return_value=[pull_mock, pull_mock_two, existing_pull_mock])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1743,9 +2061,8 @@ qiskit-terra==0.16.0
 
         release_process.bump_meta(meta_repo, repo, version_number)
         git_mock.create_branch.assert_not_called()
-        git_mock.checkout_ref.assert_not_called()
-        git_mock.pull_remote_ref_to_local.assert_not_called()
-        git_mock.create_git_commit_for_all.assert_not_called()
+        git_mock.hash_object.assert_not_called()
+        git_mock.commit_tree.assert_not_called()
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1781,6 +2098,7 @@ qiskit-terra==0.16.0
             return_value='0.20.0'.encode('utf8'))
         meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
         meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
         repo.repo_name = 'Qiskit/qiskit-terra'
@@ -1788,8 +2106,7 @@ qiskit-terra==0.16.0
         version_number = '0.16.1'
 
         release_process.bump_meta(meta_repo, repo, version_number)
-        git_mock.create_branch.assert_called_once_with(
-            'bump_meta', 'origin/main', meta_repo)
+        git_mock.tracking_ref.assert_called_once_with('refs/heads/main')
         commit_msg = """Bump version for qiskit-terra==0.16.1
 
 Bump the meta repo version to include:
@@ -1798,8 +2115,14 @@ qiskit-terra==0.16.1
 
 """
 
-        git_mock.create_git_commit_for_all.assert_called_once_with(
-            meta_repo, commit_msg.encode('utf8'))
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        self.assertEqual(
+            [unittest.mock.call(meta_repo, 'refs/heads/bump_meta',
+                                'commit_sha'),
+             unittest.mock.call(meta_repo, 'refs/remotes/origin/bump_meta',
+                                'commit_sha')],
+            git_mock.update_ref.call_args_list)
         with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
             terra_bump = False
             meta_bump = False
@@ -1828,8 +2151,9 @@ qiskit-terra==0.16.1
             'Bump Meta', base='main', head='bump_meta', body=body)
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
     def test_finish_prerelease(self, bump_meta_mock, github_release_mock,
                                git_mock):
         meta_repo = unittest.mock.MagicMock()
@@ -1837,25 +2161,29 @@ qiskit-terra==0.16.1
         meta_repo.name = 'qiskit'
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         repo.repo_config = {'branch_on_release': True}
         repo.get_local_config = lambda: {}
+        git_mock.resolve_ref.return_value = None
         conf = {'working_dir': self.temp_dir.path}
         with unittest.mock.patch.object(
-                release_process, 'multiprocessing'
-        ) as mp_mock:
-            mp_mock.Process = ProcessMock
+                release_process.executor, 'submit', new=run_inline
+        ):
             release_process.finish_release('0.12.0rc1', repo, conf, meta_repo)
         git_mock.create_branch.assert_called_once_with(
             "stable/0.12", "0.12.0rc1", repo, push=True
         )
         github_release_mock.assert_called_once_with(
-            repo, '0.12.0rc1...0.11.0', '0.12.0rc1',
-            config.default_changelog_categories, True)
+            repo, '0.12.0rc1...0.11.0', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '0.12.0rc1', 'qiskit-terra 0.12.0rc1', 'changelog',
+            prerelease=True)
         bump_meta_mock.assert_not_called()
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
     def test_finish_release_with_pre_existing_branch(self, bump_meta_mock,
                                                      github_release_mock,
                                                      git_mock):
@@ -1864,6 +2192,7 @@ qiskit-terra==0.16.1
         meta_repo.name = 'qiskit'
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         # After a pre-release we've already created a stable branch so we
         # should create a bump meta pr and not create a branch.
         fake_branch = unittest.mock.MagicMock()
@@ -1873,19 +2202,23 @@ qiskit-terra==0.16.1
         repo.get_local_config = lambda: {}
         conf = {'working_dir': self.temp_dir.path}
         with unittest.mock.patch.object(
-                release_process, 'multiprocessing'
-        ) as mp_mock:
-            mp_mock.Process = ProcessMock
+                release_process.executor, 'submit', new=run_inline
+        ):
             release_process.finish_release('0.12.0', repo, conf, meta_repo)
         git_mock.create_branch.assert_not_called()
-        bump_meta_mock.called_once_with(meta_repo, repo, '0.12.0')
+        bump_meta_mock.assert_called_once_with(
+            meta_repo, [(repo, '0.12.0')],
+            lock_dir=os.path.join(self.temp_dir.path, 'lock'))
         github_release_mock.assert_called_once_with(
-            repo, '0.12.0...0.11.0', '0.12.0',
-            config.default_changelog_categories, False)
+            repo, '0.12.0...0.11.0', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '0.12.0', 'qiskit-terra 0.12.0', 'changelog',
+            prerelease=False)
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
     def test_finish_prerelease_with_pre_existing_branch(self, bump_meta_mock,
                                                         github_release_mock,
                                                         git_mock):
@@ -1894,6 +2227,7 @@ qiskit-terra==0.16.1
         meta_repo.name = 'qiskit'
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         # After a pre-release we've already created a stable branch so we
         # should create a bump meta pr and not create a branch.
         fake_branch = unittest.mock.MagicMock()
@@ -1903,19 +2237,21 @@ qiskit-terra==0.16.1
         repo.get_local_config = lambda: {}
         conf = {'working_dir': self.temp_dir.path}
         with unittest.mock.patch.object(
-                release_process, 'multiprocessing'
-        ) as mp_mock:
-            mp_mock.Process = ProcessMock
+                release_process.executor, 'submit', new=run_inline
+        ):
             release_process.finish_release('0.12.0rc2', repo, conf, meta_repo)
         bump_meta_mock.assert_not_called()
         github_release_mock.assert_called_once_with(
-            repo, '0.12.0rc2...0.12.0rc1', '0.12.0rc2',
-            config.default_changelog_categories, True)
+            repo, '0.12.0rc2...0.12.0rc1', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '0.12.0rc2', 'qiskit-terra 0.12.0rc2', 'changelog',
+            prerelease=True)
         git_mock.create_branch.assert_not_called()
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
     def test_finish_prerelease_non_rc(self, bump_meta_mock,
                                       github_release_mock, git_mock):
         meta_repo = unittest.mock.MagicMock()
@@ -1923,23 +2259,26 @@ qiskit-terra==0.16.1
         meta_repo.name = 'qiskit'
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         repo.repo_config = {'branch_on_release': True}
         repo.get_local_config = lambda: {}
         conf = {'working_dir': self.temp_dir.path}
         with unittest.mock.patch.object(
-                release_process, 'multiprocessing'
-        ) as mp_mock:
-            mp_mock.Process = ProcessMock
+                release_process.executor, 'submit', new=run_inline
+        ):
             release_process.finish_release('0.12.0b1', repo, conf, meta_repo)
         git_mock.create_branch.assert_not_called()
         github_release_mock.assert_called_once_with(
-            repo, '0.12.0b1...0.11.0', '0.12.0b1',
-            config.default_changelog_categories, True)
+            repo, '0.12.0b1...0.11.0', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '0.12.0b1', 'qiskit-terra 0.12.0b1', 'changelog',
+            prerelease=True)
         bump_meta_mock.assert_not_called()
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
     def test_finish_major_version_prerelease_non_rc(self, bump_meta_mock,
                                                     github_release_mock,
                                                     git_mock):
@@ -1948,6 +2287,7 @@ qiskit-terra==0.16.1
         meta_repo.name = 'qiskit'
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         repo.repo_config = {'branch_on_release': True}
         repo.get_local_config = lambda: {}
         conf = {'working_dir': self.temp_dir.path}
@@ -1968,19 +2308,21 @@ qiskit-terra==0.16.1
 """
         git_mock.get_tags = tag_history
         with unittest.mock.patch.object(
-                release_process, 'multiprocessing'
-        ) as mp_mock:
-            mp_mock.Process = ProcessMock
+                release_process.executor, 'submit', new=run_inline
+        ):
             release_process.finish_release('1.0.0b1', repo, conf, meta_repo)
         git_mock.create_branch.assert_not_called()
         github_release_mock.assert_called_once_with(
-            repo, '1.0.0b1...0.45.1', '1.0.0b1',
-            config.default_changelog_categories, True)
+            repo, '1.0.0b1...0.45.1', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '1.0.0b1', 'qiskit-terra 1.0.0b1', 'changelog',
+            prerelease=True)
         bump_meta_mock.assert_not_called()
 
     @unittest.mock.patch.object(release_process, 'git')
-    @unittest.mock.patch.object(release_process, 'create_github_release')
-    @unittest.mock.patch.object(release_process, 'bump_meta')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
     def test_finish_major_version_prerelease_rc(self, bump_meta_mock,
                                                 github_release_mock,
                                                 git_mock):
@@ -1989,8 +2331,10 @@ qiskit-terra==0.16.1
         meta_repo.name = 'qiskit'
         repo = unittest.mock.MagicMock()
         repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
         repo.repo_config = {'branch_on_release': True}
         repo.get_local_config = lambda: {}
+        git_mock.resolve_ref.return_value = None
         conf = {'working_dir': self.temp_dir.path}
 
         def tag_history(*args, **kwargs):
@@ -2011,23 +2355,245 @@ qiskit-terra==0.16.1
 
         git_mock.get_tags = tag_history
         with unittest.mock.patch.object(
-                release_process, 'multiprocessing'
-        ) as mp_mock:
-            mp_mock.Process = ProcessMock
+                release_process.executor, 'submit', new=run_inline
+        ):
             release_process.finish_release('1.0.0rc1', repo, conf, meta_repo)
         git_mock.create_branch.assert_called_once_with(
             "stable/1.0", "1.0.0rc1", repo, push=True
         )
         github_release_mock.assert_called_once_with(
-            repo, '1.0.0rc1...0.45.1', '1.0.0rc1',
-            config.default_changelog_categories, True)
+            repo, '1.0.0rc1...0.45.1', config.default_changelog_categories)
+        repo.gh_repo.create_git_release.assert_called_once_with(
+            '1.0.0rc1', 'qiskit-terra 1.0.0rc1', 'changelog',
+            prerelease=True)
         bump_meta_mock.assert_not_called()
 
+    @unittest.mock.patch.object(release_process, 'git')
+    def test_bump_meta_releases_single_commit(self, git_mock):
+        self.useFixture(fake_meta.FakeMetaRepo(self.temp_dir, '0.20.0',
+                                               terra_version='0.16.0',
+                                               aer_version='0.7.0'))
+        meta_repo = unittest.mock.MagicMock()
+        meta_repo.repo_config = {}
+        git_mock.get_latest_tag = unittest.mock.MagicMock(
+            return_value='0.20.0'.encode('utf8'))
+        meta_repo.gh_repo.get_pulls = unittest.mock.MagicMock(return_value=[])
+        meta_repo.local_path = self.temp_dir.path
+        serve_meta_repo(git_mock, self.temp_dir.path)
+        terra = unittest.mock.MagicMock()
+        terra.repo_name = 'Qiskit/qiskit-terra'
+        terra.repo_config = {}
+        aer = unittest.mock.MagicMock()
+        aer.repo_name = 'Qiskit/qiskit-aer'
+        aer.repo_config = {}
+        optional = unittest.mock.MagicMock()
+        optional.repo_name = 'Qiskit/qiskit-optional'
+        optional.repo_config = {'optional_package': True}
+
+        release_process.bump_meta_releases(
+            meta_repo, [(terra, '0.16.1'), (optional, '0.1.0'),
+                        (aer, '0.8.0')])
+        body = ("Bump the meta repo version to include:\n\n"
+                "qiskit-terra==0.16.1\nqiskit-aer==0.8.0\n\n")
+        commit_msg = ('Bump version for qiskit-terra==0.16.1, '
+                      'qiskit-aer==0.8.0\n\n' + body)
+        git_mock.commit_tree.assert_called_once_with(
+            meta_repo, 'tree_sha', ['parent_sha'], commit_msg.encode('utf8'))
+        git_mock.push_ref_to_github.assert_called_once_with(meta_repo,
+                                                            'bump_meta')
+        meta_repo.gh_repo.get_pulls.assert_called_once_with(state='open')
+        meta_repo.gh_repo.create_pull.assert_called_once_with(
+            'Bump Meta', base='master', head='bump_meta', body=body)
+        with open(os.path.join(self.temp_dir.path, 'setup.py'), 'r') as fd:
+            setup_py = fd.read()
+        self.assertIn('"qiskit-terra==0.16.1",', setup_py)
+        self.assertIn('"qiskit-aer==0.8.0",', setup_py)
+        # The minor release wins over the patch release
+        self.assertIn('version="0.21.0",', setup_py)
+
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
+    def test_meta_bump_aggregator_coalesces(self, bump_meta_mock):
+        meta_repo = unittest.mock.MagicMock()
+        meta_repo.name = 'qiskit'
+        terra = unittest.mock.MagicMock()
+        terra.repo_name = 'Qiskit/qiskit-terra'
+        aer = unittest.mock.MagicMock()
+        aer.repo_name = 'Qiskit/qiskit-aer'
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        aggregator = release_process.MetaBumpAggregator(lock_dir, 3600)
+        aggregator.add(meta_repo, terra, '0.16.0')
+        aggregator.add(meta_repo, aer, '0.8.0')
+        aggregator.add(meta_repo, terra, '0.16.1')
+        bump_meta_mock.assert_not_called()
+        aggregator.flush()
+        bump_meta_mock.assert_called_once_with(
+            meta_repo, [(aer, '0.8.0'), (terra, '0.16.1')], lock_dir=lock_dir)
+        aggregator.flush()
+        self.assertEqual(1, bump_meta_mock.call_count)
+
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
+    def test_meta_bump_aggregator_window(self, bump_meta_mock):
+        meta_repo = unittest.mock.MagicMock()
+        meta_repo.name = 'qiskit'
+        terra = unittest.mock.MagicMock()
+        terra.repo_name = 'Qiskit/qiskit-terra'
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        aggregator = release_process.MetaBumpAggregator(lock_dir, 0.1)
+        aggregator.add(meta_repo, terra, '0.16.0')
+        for _ in range(50):
+            if bump_meta_mock.called:
+                break
+            time.sleep(0.1)
+        bump_meta_mock.assert_called_once_with(meta_repo, [(terra, '0.16.0')],
+                                               lock_dir=lock_dir)
+
+    @unittest.mock.patch.object(release_process, 'META_BUMPS', None)
+    def test_configure_meta_bump_window(self):
+        release_process.configure({'working_dir': self.temp_dir.path})
+        default_window = release_process.META_BUMPS.window
+        release_process.configure(config.schema({
+            'api_key': 'fake', 'working_dir': self.temp_dir.path,
+            'meta_repo': 'Qiskit/qiskit', 'repos': []}))
+        self.assertEqual(default_window, release_process.META_BUMPS.window)
+        release_process.configure({'working_dir': self.temp_dir.path,
+                                   'meta_bump_window': 0})
+        self.assertIsNone(release_process.META_BUMPS)
 
-class ProcessMock:
+    @unittest.mock.patch.object(release_process, 'git')
+    @unittest.mock.patch.object(release_process, '_generate_changelog',
+                                return_value='changelog')
+    @unittest.mock.patch.object(release_process, 'bump_meta_releases')
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
+    def test_failed_step_resumed(self, bump_meta_mock, changelog_mock,
+                                 git_mock):
+        meta_repo = unittest.mock.MagicMock()
+        meta_repo.name = 'qiskit'
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        repo.repo_config = {}
+        repo.get_local_config.return_value = {}
+        repo.gh_repo.create_git_release.side_effect = github.GithubException(
+            500, 'Server Error', None)
+        conf = {'working_dir': self.temp_dir.path}
+        os.mkdir(os.path.join(self.temp_dir.path, 'lock'))
+        release_process.finish_release('0.12.0', repo, conf, meta_repo)
+        store = release_process.release_state.get_store(self.temp_dir.path)
+        self.assertEqual({'changelog': ('done', 'changelog'),
+                          'publish': ('failed', None),
+                          'meta': ('done', None)},
+                         store.get(repo.repo_name, '0.12.0'))
+
+        repo.gh_repo.create_git_release.side_effect = None
+        release_process.resume(conf, {repo.repo_name: repo}, meta_repo)
+        # Only the failed step runs again, from the stored changelog
+        changelog_mock.assert_called_once()
+        bump_meta_mock.assert_called_once()
+        self.assertEqual(2, repo.gh_repo.create_git_release.call_count)
+        repo.gh_repo.create_git_release.assert_called_with(
+            '0.12.0', 'qiskit-terra 0.12.0', 'changelog', prerelease=False)
+        self.assertEqual([], store.incomplete())
+
+    @unittest.mock.patch.object(release_process, 'git')
+    @unittest.mock.patch.object(release_process, '_generate_changelog')
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
+    def test_publish_waits_for_changelog(self, changelog_mock, git_mock):
+        meta_repo = unittest.mock.MagicMock()
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        repo.repo_config = {'optional_package': True}
+        repo.get_local_config.return_value = {}
+        changelog_mock.side_effect = ValueError('Bad log')
+        conf = {'working_dir': self.temp_dir.path}
+        os.mkdir(os.path.join(self.temp_dir.path, 'lock'))
+        release_process.finish_release('0.12.0', repo, conf, meta_repo)
+        repo.gh_repo.create_git_release.assert_not_called()
+        store = release_process.release_state.get_store(self.temp_dir.path)
+        self.assertEqual({'changelog': ('failed', None),
+                          'publish': ('pending', None)},
+                         store.get(repo.repo_name, '0.12.0'))
+
+    @unittest.mock.patch.object(release_process, 'git')
+    @unittest.mock.patch.object(release_process, '_generate_changelog')
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
+    @unittest.mock.patch.dict(locks._SETTINGS, {'timeout': 0.1})
+    def test_lock_timeout_fails_step(self, changelog_mock, git_mock):
+        meta_repo = unittest.mock.MagicMock()
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        repo.repo_config = {'optional_package': True}
+        conf = {'working_dir': self.temp_dir.path}
+        lock_dir = os.path.join(self.temp_dir.path, 'lock')
+        os.mkdir(lock_dir)
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with locks.repo_lock(lock_dir, repo.name):
+                acquired.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        acquired.wait()
+        release_process.finish_release('0.12.0', repo, conf, meta_repo)
+        changelog_mock.assert_not_called()
+        store = release_process.release_state.get_store(self.temp_dir.path)
+        self.assertEqual({'changelog': ('failed', None),
+                          'publish': ('pending', None)},
+                         store.get(repo.repo_name, '0.12.0'))
+
+    @unittest.mock.patch.object(release_process.executor, 'submit',
+                                new=run_inline)
+    def test_publish_existing_release(self):
+        repo = unittest.mock.MagicMock()
+        repo.name = 'qiskit-terra'
+        repo.gh_repo.create_git_release.side_effect = github.GithubException(
+            422, {'errors': [{'code': 'already_exists'}]}, None)
+        release_process._release_step__publish('0.12.0', repo, 'changelog')
 
-    def __init__(self, target=None):
-        self.target = target
+    @unittest.mock.patch.object(release_process, 'git')
+    @unittest.mock.patch.object(release_process.labels, 'get_pr_labels')
+    def test_generate_changelog_from_index(self, labels_mock, git_mock):
+        store = pr_store.PRStore(
+            os.path.join(self.temp_dir.path, 'pr_metadata.sqlite'))
+        self.useFixture(fixtures.MockPatchObject(pr_store, 'STORE', store))
+        repo = unittest.mock.MagicMock()
+        repo.repo_name = 'Qiskit/qiskit-terra'
+        store.set_changelog_labels(repo.repo_name, '5a7f41344', 5682,
+                                   ['Changelog: New Feature'], '')
+        store.set_changelog_labels(repo.repo_name, '6e2542243', 5685,
+                                   ['Changelog: None'], '')
+        labels_mock.return_value = {5671: ['Changelog: Bugfix']}
+        fake_log = """
+5a7f41344 Tune performance of optimize_1q_decomposition (#5682)
+6e2542243 Change collect_1q_runs return for performance (#5685)
+25eb58a29 Add unroll step to level2 passmanager optimization loop (#5671)
+"""
+        git_mock.iter_log.return_value = log_entries(fake_log)
+        res = release_process._generate_changelog(
+            repo, '0.17.0...0.16.0', config.default_changelog_categories)
+        # Only the commit missing from the index needs a label lookup
+        labels_mock.assert_called_once_with(repo, [5671])
+        expected = """# Changelog
+## Added
+-   Tune performance of optimize_1q_decomposition (#5682)
+
+## Fixed
+-   Add unroll step to level2 passmanager optimization loop (#5671)
 
-    def start(self):
-        self.target()
+"""
+        self.assertEqual(expected, res)
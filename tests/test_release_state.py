@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import os
+import unittest
+
+import fixtures
+
+from qiskit_bot import release_state
+
+from . import db_fixtures
+
+REPO = 'Qiskit/qiskit-terra'
+
+
+class TestReleaseStore(fixtures.TestWithFixtures, unittest.TestCase):
+
+    def setUp(self):
+        self.db = self.useFixture(db_fixtures.TempDB('releases.sqlite'))
+        self.store = release_state.ReleaseStore(self.db.path)
+
+    def test_step_lifecycle(self):
+        self.store.create(REPO, '0.12.0', ['changelog', 'publish'])
+        self.assertEqual({'changelog': ('pending', None),
+                          'publish': ('pending', None)},
+                         self.store.get(REPO, '0.12.0'))
+        self.assertTrue(self.store.claim(REPO, '0.12.0', 'changelog'))
+        self.assertFalse(self.store.claim(REPO, '0.12.0', 'changelog'))
+        self.store.complete(REPO, '0.12.0', 'changelog', '# Changelog\n')
+        self.assertTrue(self.store.claim(REPO, '0.12.0', 'publish'))
+        self.store.fail(REPO, '0.12.0', 'publish', 'boom')
+        self.assertEqual({'changelog': ('done', '# Changelog\n'),
+                          'publish': ('failed', None)},
+                         self.store.get(REPO, '0.12.0'))
+        self.assertEqual([(REPO, '0.12.0')], self.store.incomplete())
+
+    def test_create_again_keeps_progress(self):
+        self.store.create(REPO, '0.12.0', ['changelog', 'publish'])
+        self.store.claim(REPO, '0.12.0', 'changelog')
+        self.store.complete(REPO, '0.12.0', 'changelog', 'body')
+        self.store.claim(REPO, '0.12.0', 'publish')
+        self.store.fail(REPO, '0.12.0', 'publish', 'boom')
+        self.store.create(REPO, '0.12.0', ['changelog', 'publish'])
+        self.assertEqual({'changelog': ('done', 'body'),
+                          'publish': ('pending', None)},
+                         self.store.get(REPO, '0.12.0'))
+
+    @unittest.mock.patch('qiskit_bot.locks.pid_alive')
+    def test_recover(self, pid_alive_mock):
+        self.store.create(REPO, '0.12.0', ['changelog', 'meta'])
+        self.store.claim(REPO, '0.12.0', 'changelog')
+        self.store.claim(REPO, '0.12.0', 'meta')
+        self.store.complete(REPO, '0.12.0', 'meta')
+        # Steps owned by this pid are left over from an earlier process
+        pid_alive_mock.return_value = True
+        self.assertEqual(1, self.store.recover())
+        self.assertEqual({'changelog': ('pending', None),
+                          'meta': ('done', None)},
+                         self.store.get(REPO, '0.12.0'))
+
+    @unittest.mock.patch('qiskit_bot.locks.pid_alive', return_value=True)
+    @unittest.mock.patch('os.getpid', return_value=1)
+    def test_recover_skips_live_owner(self, getpid_mock, pid_alive_mock):
+        self.store.create(REPO, '0.12.0', ['changelog'])
+        self.store.claim(REPO, '0.12.0', 'changelog')
+        getpid_mock.return_value = 2
+        self.assertEqual(0, self.store.recover())
+        self.assertEqual('running',
+                         self.store.get(REPO, '0.12.0')['changelog'][0])
+
+    def test_get_store_cached(self):
+        store = release_state.get_store(self.db.directory)
+        self.assertIs(store, release_state.get_store(self.db.directory))
+        self.assertTrue(os.path.exists(
+            os.path.join(self.db.directory, 'releases.sqlite')))
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import unittest
+import unittest.mock
+
+from qiskit_bot import repos
+
+
+class TestGetLocalConfig(unittest.TestCase):
+
+    def setUp(self):
+        # Skip __init__, it clones the repo and talks to GitHub
+        self.repo = repos.Repo.__new__(repos.Repo)
+        self.repo.name = 'Terra'
+        self.repo.lock_dir = '/tmp/lock'
+        self.repo.repo_config = {'default_branch': 'main'}
+        self.manager = unittest.mock.MagicMock()
+        self.manager.git.resolve_ref.return_value = 'sha1'
+        self.manager.git.tracking_ref.return_value = 'refs/remotes/origin/main'
+        for patcher in [
+                unittest.mock.patch.object(repos, 'git', self.manager.git),
+                unittest.mock.patch.object(repos.locks, 'repo_lock',
+                                           self.manager.repo_lock),
+                unittest.mock.patch.object(
+                    repos.config, 'load_repo_config_from_git',
+                    self.manager.load)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_resolved_under_lock(self):
+        self.repo.get_local_config()
+        self.assertEqual([
+            unittest.mock.call.repo_lock('/tmp/lock', 'Terra'),
+            unittest.mock.call.repo_lock().__enter__(),
+            unittest.mock.call.git.tracking_ref('refs/heads/main'),
+            unittest.mock.call.git.resolve_ref(
+                self.repo, 'refs/remotes/origin/main'),
+            unittest.mock.call.repo_lock().__exit__(None, None, None),
+            unittest.mock.call.load(self.repo, 'sha1')],
+            self.manager.mock_calls)
+
+    def test_fetch_under_lock(self):
+        self.repo.get_local_config(fetch=True)
+        calls = self.manager.mock_calls
+        self.assertEqual(unittest.mock.call.git.fetch_default_branch(
+            self.repo), calls[2])
+        self.assertEqual(unittest.mock.call.load(self.repo, 'sha1'),
+                         calls[-1])
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2026
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+import unittest
+import unittest.mock
+
+from packaging.version import parse
+
+from qiskit_bot import api
+from qiskit_bot import release_process
+from qiskit_bot import tags
+
+TAGS = ['2.0.0rc1', '1.4.0', '1.4.0rc1', '1.3.2', '1.3.1', '1.3.0',
+        '1.2.2', '1.3.0rc1', '1.0.0', '1.0.0rc2', '1.0.0rc1', '0.46.2',
+        '0.46.0', '0.45.3', 'not-a-version']
+
+
+class TestTagIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = tags.TagIndex(TAGS)
+
+    def test_ignores_invalid(self):
+        self.assertEqual(len(TAGS) - 1, len(self.index))
+
+    def test_latest(self):
+        self.assertEqual('1.4.0', self.index.latest())
+        self.index.add('1.4.1')
+        self.assertEqual('1.4.1', self.index.latest())
+        self.assertIsNone(tags.TagIndex().latest())
+
+    def test_remove(self):
+        self.index.remove('1.4.0')
+        self.assertEqual('1.3.2', self.index.latest())
+        self.assertEqual(len(TAGS) - 2, len(self.index))
+        # Unknown and invalid tags are ignored
+        self.index.remove('1.4.0')
+        self.index.remove('not-a-version')
+        self.assertEqual(len(TAGS) - 2, len(self.index))
+
+    def test_previous_major(self):
+        self.assertEqual('1.4.0', self.index.previous_major(parse('2.0.0')))
+        self.assertEqual('0.46.2',
+                         self.index.previous_major(parse('1.0.0')))
+        self.assertIsNone(self.index.previous_major(parse('0.1.0')))
+
+    def test_previous_minor(self):
+        self.assertEqual('1.3.0', self.index.previous_minor(parse('1.4.0')))
+        self.assertEqual('1.3.0',
+                         self.index.previous_minor(parse('1.4.0rc1')))
+        self.assertIsNone(self.index.previous_minor(parse('1.2.0')))
+
+    def test_previous_prerelease(self):
+        self.assertEqual('1.0.0rc1',
+                         self.index.previous_prerelease(parse('1.0.0rc2')))
+        self.assertIsNone(self.index.previous_prerelease(parse('1.4.0rc1')))
+
+
+class TestTagRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(tags.clear)
+        self.repo = unittest.mock.MagicMock()
+        self.repo.repo_name = 'Qiskit/qiskit'
+
+    @unittest.mock.patch('qiskit_bot.git.get_tags',
+                         return_value='\n'.join(TAGS))
+    def test_log_string_from_index(self, get_tags_mock):
+        tags.load(self.repo)
+        get_tags_mock.reset_mock()
+        tags.add_tag(self.repo, '2.0.0')
+        self.assertEqual(
+            '2.0.0...1.4.0',
+            release_process._get_log_string(parse('2.0.0'), '2.0.0',
+                                            self.repo))
+        self.assertEqual(
+            '1.4.0...1.3.0',
+            release_process._get_log_string(parse('1.4.0'), '1.4.0',
+                                            self.repo))
+        get_tags_mock.assert_not_called()
+
+    @unittest.mock.patch('qiskit_bot.git.get_tags',
+                         return_value='\n'.join(TAGS))
+    def test_deleted_tag_push(self, get_tags_mock):
+        tags.load(self.repo)
+        self.repo.repo_config = {}
+        with unittest.mock.patch.object(api, 'REFRESHER'), \
+                unittest.mock.patch.dict(api.REPOS,
+                                         {self.repo.repo_name: self.repo}):
+            api.on_push({'repository': {'full_name': self.repo.repo_name},
+                         'ref': 'refs/tags/1.4.0', 'after': '0' * 40,
+                         'deleted': True})
+        self.assertEqual('1.3.2', tags.get_index(self.repo).latest())
+
+    def test_unloaded_repo(self):
+        self.assertIsNone(tags.get_index(self.repo))
+        # Adding to a repo without an index is a no-op
+        tags.add_tag(self.repo, '1.0.0')
+        self.assertIsNone(tags.get_index(self.repo))
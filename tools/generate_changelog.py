@@ -16,9 +16,12 @@
 import argparse
 import tempfile
 
-from github import Github
+import github
 
+from qiskit_bot import changelog
 from qiskit_bot import config
+from qiskit_bot import github_client
+from qiskit_bot import labels
 from qiskit_bot import repos
 from qiskit_bot import release_process
 
@@ -42,21 +45,38 @@ def main():
         help="the default branch to use for the repository. Defaults to "
              "'main'",
         default='main')
+    parser.add_argument(
+        '--max-in-flight', type=int, default=8,
+        help="the maximum number of concurrent REST requests used to look "
+             "up pull request labels. Defaults to 8")
+    parser.add_argument(
+        '--no-graphql', action='store_true',
+        help="only use the REST API to look up pull request labels, for "
+             "tokens which can't use the GraphQL API")
+    parser.add_argument(
+        '--format', '-f', choices=changelog.FORMATS, default='markdown',
+        help="the output format of the changelog. Defaults to 'markdown'")
     args = parser.parse_args()
+    # The label lookups share one client between threads
+    github_client.install()
+    labels.configure({'changelog': {'graphql': not args.no_graphql,
+                                    'max_in_flight': args.max_in_flight}})
 
     with tempfile.TemporaryDirectory() as tmpdir:
         token = args.token
         repo = repos.Repo(tmpdir, args.repo_name, token,
                           {'default_branch': args.default_branch})
         if not token and args.username and args.password:
-            session = Github(args.username, args.password)
+            session = github.Github(
+                auth=github.Auth.Login(args.username, args.password))
             gh_repo = session.get_repo(args.repo_name)
             repo.gh_repo = gh_repo
         categories = repo.get_local_config().get(
             'categories', config.default_changelog_categories)
 
         print(release_process._generate_changelog(
-            repo, '%s..' % args.tag, categories, show_missing=True))
+            repo, '%s..' % args.tag, categories, show_missing=True,
+            fmt=args.format))
 
 
 if __name__ == '__main__':